@@ -19,28 +19,47 @@ This is a MODULAR, EXPLAINABLE system designed for:
 PRIVACY FIRST: No call data persists. Processing is temporary.
 """
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Header, Request
+from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Header, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, FileResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+import hmac
+import json
 import logging
 import tempfile
 import os
+import shutil
 import asyncio
-from typing import Optional
+from typing import Callable, Optional
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Configure logging FIRST (before using logger)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
-logger = logging.getLogger(__name__)
+if __name__ == "__main__":
+    # `python app.py` serves the app the way `uvicorn app:app` does, with this
+    # file imported as the module "app". Spawned CPU workers re-import the
+    # parent's __main__ module; if that were this file, every worker would
+    # build all the services again. A `-c` launcher has nothing to re-import.
+    import sys
+
+    backend_dir = os.path.dirname(os.path.abspath(__file__))
+    launcher = (
+        f"import sys; sys.path.insert(0, {backend_dir!r}); import uvicorn; "
+        # log_config=None: uvicorn's loggers go through the same queue and redaction
+        "uvicorn.run('app:app', host='0.0.0.0', port=8000, log_level='info', log_config=None)"
+    )
+    os.execv(sys.executable, [sys.executable, "-c", launcher])
 
 # Load environment variables from .env file
 load_dotenv()
 
+from services.log_setup import RequestLogContextMiddleware, setup_logging_from_env
+
+# Configure logging FIRST (before using logger): records go through a queue to a
+# listener thread, so the request path never waits on log I/O. LOG_LEVEL,
+# LOG_FORMAT (text/json), LOG_LEVELS (per stage) and LOG_SAMPLE_RATE control it.
+log_queue_handler = setup_logging_from_env()
+logger = logging.getLogger(__name__)
+
 # Get API key from environment
 API_KEY = os.getenv("API_KEY")
 if not API_KEY:
@@ -53,15 +72,57 @@ DEMO_MODE = True  # ⚡ FAST: Returns instant demo response (<50ms) instead of r
 DEMO_MODE_MESSAGE = "🎬 DEMO MODE: Ultra-fast sample analysis" if DEMO_MODE else ""
 
 # Import service layers
-from services.audio_processor import AudioProcessor
+from services.audio_processor import AudioProcessor, DecodedAudio
+from services.metrics import metrics, StageTimingsMiddleware
+from services.profiling import ProfileStore, ProfilingMiddleware
+from services.ingestion import UploadSizeLimitMiddleware, UploadTooLargeError, spool_upload
 from services.speech_to_text import SpeechToTextService
+from services.model_pool import WhisperModelPool, PoolBusyError
+from services.executors import AnalysisExecutors, decode_with_voice
+from services.result_cache import ResultCache
+from services.transcript_store import TranscriptStore
+from services.live_session import LiveCallSession, LiveWindow
+from services.enrichment import EnrichmentStore
+from services.streaming import EventStream, STREAM_MEDIA_TYPES
+from services.batch_jobs import (
+    BatchJobStore,
+    BatchRunner,
+    extract_archive,
+    new_job_id,
+    resolve_manifest,
+)
+from services.pipeline import (
+    TextAnalysisPipeline,
+    apply_advanced_bonus,
+    build_response,
+    fallback_risk_assessment,
+    EMPTY_TRANSCRIPTION,
+    VOICE_FALLBACK,
+    EMOTIONAL_FALLBACK,
+    ENTITY_FALLBACK,
+    SCAM_DB_FALLBACK,
+)
 from services.pattern_analyzer import PatternAnalyzer
 from services.risk_scorer import RiskScorer
 from services.voice_analyzer import VoiceAnalyzer
 from services.emotional_analyzer import EmotionalToneAnalyzer
 from services.entity_extractor import EntityExtractor
 from services.scam_database import KnownScamDatabase
-from models.schemas import AnalysisResponse, RiskLevel, PatternMatch, HealthResponse
+from services.campaign_store import CampaignStore
+from services.lexicon import LexiconIndex
+from models.schemas import (
+    AnalysisResponse,
+    EnrichmentResponse,
+    RiskLevel,
+    PatternMatch,
+    HealthResponse,
+    RescoreRequest,
+    RescoreResponse,
+    RescoredCall,
+    BatchManifestRequest,
+    BatchJobStatus,
+    BatchResultsPage,
+)
 
 # Configure logging - MOVED TO TOP
 # logging.basicConfig(...)
@@ -84,6 +145,43 @@ if os.path.exists(frontend_path):
     app.mount("/static", StaticFiles(directory=frontend_path), name="static")
     logger.info("✅ Static files mounted")
 
+# Upload limit: oversized bodies get a 413 while still arriving, before
+# FastAPI buffers the multipart form (added before CORS so CORS wraps it)
+MAX_UPLOAD_MB = int(os.getenv("MAX_UPLOAD_MB", str(AudioProcessor.MAX_FILE_SIZE_MB)))
+MAX_UPLOAD_BYTES = MAX_UPLOAD_MB * 1024 * 1024
+UPLOAD_SPOOL_DIR = os.getenv("UPLOAD_SPOOL_DIR") or None
+app.add_middleware(UploadSizeLimitMiddleware, max_upload_bytes=MAX_UPLOAD_BYTES)
+# Batch archives hold many recordings, so they get their own (larger) limit
+BATCH_MAX_UPLOAD_MB = int(os.getenv("BATCH_MAX_UPLOAD_MB", "2048"))
+app.add_middleware(
+    UploadSizeLimitMiddleware,
+    max_upload_bytes=BATCH_MAX_UPLOAD_MB * 1024 * 1024,
+    paths=("/batch-jobs",),
+)
+
+# Opt-in cProfile capture of single /analyze-call requests (PROFILE_DIR): turned on by an
+# X-Profile-Token header matching PROFILE_TOKEN, or for a sampled fraction of traffic
+# (PROFILE_SAMPLE_RATE). Not installed at all when PROFILE_DIR is unset.
+PROFILE_DIR = os.getenv("PROFILE_DIR") or None
+profile_store: Optional[ProfileStore] = None
+if PROFILE_DIR:
+    profile_store = ProfileStore(
+        PROFILE_DIR,
+        max_profiles=int(os.getenv("PROFILE_MAX_FILES", "50")),
+        sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", "0")),
+        token=os.getenv("PROFILE_TOKEN") or None,
+    )
+    app.add_middleware(ProfilingMiddleware, store=profile_store)
+
+# Per-stage timings: X-Stage-Timings response header + request metrics for /metrics
+app.add_middleware(StageTimingsMiddleware, registry=metrics)
+
+# Request ID (X-Request-ID) on every log record; only a LOG_SAMPLE_RATE fraction
+# of requests keep their INFO chatter (warnings and errors are always logged)
+app.add_middleware(
+    RequestLogContextMiddleware, sample_rate=float(os.getenv("LOG_SAMPLE_RATE", "1.0"))
+)
+
 # Enable CORS for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -91,6 +189,7 @@ app.add_middleware(
     allow_credentials=False,  # FIXED: Cannot use credentials=True with wildcard origins
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Stage-Timings", "X-Profile-Id", "X-Request-ID"],
 )
 
 # Initialize service instances - NOW LAZY-LOADED
@@ -98,11 +197,43 @@ logger.info("🚀 Initializing services...")
 audio_processor = AudioProcessor()
 logger.info("✅ Audio Processor initialized")
 
-# ⚡ WHISPER IS NOW LAZY-LOADED - NOT LOADED HERE
-# Model only loads on first /analyze-call request
-speech_service = SpeechToTextService(model_size="base")
+# ⚡ WHISPER IS NOT LOADED HERE
+# The replica pool loads in the background after startup (WHISPER_WARMUP=background),
+# blocks startup until ready (eager), or waits for the first request (lazy)
+WHISPER_REPLICAS = int(os.getenv("WHISPER_REPLICAS", "1"))
+WHISPER_MAX_QUEUE = int(os.getenv("WHISPER_MAX_QUEUE", "8"))
+WHISPER_WARMUP = os.getenv("WHISPER_WARMUP", "background").lower()
+# A failed load is retried by the next request after this many seconds,
+# doubling per consecutive failure (up to 10 minutes)
+WHISPER_RETRY_SECONDS = float(os.getenv("WHISPER_RETRY_SECONDS", "30"))
+
+whisper_pool = WhisperModelPool(
+    model_size="base",
+    replicas=WHISPER_REPLICAS,
+    max_waiting=WHISPER_MAX_QUEUE,
+    retry_seconds=WHISPER_RETRY_SECONDS,
+)
+# Calls longer than this are transcribed in VAD-cut windows across replicas
+WHISPER_WINDOW_SECONDS = float(os.getenv("WHISPER_WINDOW_SECONDS", "30"))
+speech_service = SpeechToTextService(
+    model_size="base", pool=whisper_pool, window_seconds=WHISPER_WINDOW_SECONDS
+)
 logger.info("✅ Speech-to-Text Service initialized (lazy-loaded)")
 
+# Blocking stages run on sized pools, never on the event loop:
+# decode + voice features in processes (CPU_WORKERS), Whisper on one thread
+# per replica, text analyzers in threads (TEXT_WORKERS)
+executors = AnalysisExecutors.from_env(
+    whisper_workers=WHISPER_REPLICAS, whisper_queue=WHISPER_MAX_QUEUE
+)
+
+# Finished analyses keyed by audio hash + language + model (results only, never audio)
+result_cache = ResultCache(
+    max_entries=int(os.getenv("RESULT_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.getenv("RESULT_CACHE_TTL", "3600")),
+    disk_dir=os.getenv("RESULT_CACHE_DIR") or None,
+)
+
 pattern_analyzer = PatternAnalyzer()
 logger.info("✅ Pattern Analyzer initialized")
 
@@ -119,9 +250,60 @@ logger.info("✅ Emotional Tone Analyzer initialized")
 entity_extractor = EntityExtractor()
 logger.info("✅ Entity Extractor initialized")
 
-scam_database = KnownScamDatabase()
+# Campaign catalog file shared (read-only, page cache) by every worker
+scam_database = KnownScamDatabase(CampaignStore(os.getenv("SCAM_DB_PATH")))
 logger.info("✅ Known Scam Database initialized")
 
+# Opt-in persistent Whisper output, so scoring changes can be re-evaluated
+# with POST /rescore (or `python cli.py rescore`) without re-transcribing
+TRANSCRIPT_CACHE_DB = os.getenv("TRANSCRIPT_CACHE_DB")
+transcript_store = TranscriptStore(TRANSCRIPT_CACHE_DB) if TRANSCRIPT_CACHE_DB else None
+
+text_pipeline = TextAnalysisPipeline(
+    pattern_analyzer, risk_scorer, emotional_analyzer, entity_extractor, scam_database
+)
+
+# Fast verdict (/analyze-call?fast_verdict=true, or FAST_VERDICT=1 for every
+# request): a call whose score is already pinned at 100 is answered before the
+# enrichment analyses, which finish in the background for
+# GET /analyze-call/enrichment/{enrichment_id}
+FAST_VERDICT = os.getenv("FAST_VERDICT", "0").lower() in ("1", "true", "yes")
+enrichments = EnrichmentStore(
+    max_entries=int(os.getenv("ENRICHMENT_MAX_ENTRIES", "1000")),
+    ttl_seconds=float(os.getenv("ENRICHMENT_TTL", "600")),
+)
+
+# Live calls (WebSocket /ws/analyze-live): each session buffers at most one
+# window of audio; windows waiting for Whisper beyond LIVE_MAX_PENDING are
+# skipped so updates never fall further behind the call
+LIVE_MAX_SESSIONS = int(os.getenv("LIVE_MAX_SESSIONS", "200"))
+LIVE_WINDOW_SECONDS = float(os.getenv("LIVE_WINDOW_SECONDS", "8"))
+LIVE_MAX_PENDING = int(os.getenv("LIVE_MAX_PENDING", "2"))
+LIVE_MAX_FRAME_BYTES = 256 * 1024
+live_sessions = {"active": 0, "total": 0, "rejected": 0}
+
+# Opt-in batch jobs (POST /batch-jobs): job queue, extracted archives and
+# results live under BATCH_DIR, so jobs resume after a restart. Manifests
+# may only reference files under BATCH_INPUT_DIR.
+BATCH_DIR = os.getenv("BATCH_DIR")
+BATCH_INPUT_DIR = os.getenv("BATCH_INPUT_DIR")
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "10000"))
+# Total extracted size of one archive (compressed archives can expand a lot)
+BATCH_MAX_EXTRACT_MB = int(os.getenv("BATCH_MAX_EXTRACT_MB", "10240"))
+batch_store = BatchJobStore(Path(BATCH_DIR) / "batch_jobs.db") if BATCH_DIR else None
+batch_runner = None
+if batch_store:
+    batch_runner = BatchRunner(
+        batch_store,
+        executors,
+        speech_service,
+        text_pipeline,
+        batch_size=int(os.getenv("BATCH_SIZE", "8")),
+        result_cache=result_cache,
+        transcript_store=transcript_store,
+        max_attempts=int(os.getenv("BATCH_MAX_ATTEMPTS", "3")),
+    )
+
 logger.info("🎯 All services ready!")
 
 # =================
@@ -133,22 +315,22 @@ def verify_api_key(request: Request):
     Verify API key manually from request headers to avoid FastApi auto-conversion issues.
     """
     if not API_KEY:
-        logger.warning("⚠️ API_KEY not found in environment. API will be unsecured!")
+        # Already warned at startup; not repeated on every request
         return
     
-    # Check multiple possible header casing
-    x_api_key = request.headers.get("X-API-KEY") or request.headers.get("x-api-key")
-    
-    logger.info(f"🔑 Auth Check - Received: {x_api_key} | Expected: {API_KEY}")
+    # Header lookup is case-insensitive
+    x_api_key = request.headers.get("X-API-KEY")
 
-    if x_api_key != API_KEY:
-        logger.error(f"❌ Invalid API key attempt. Received: '{x_api_key}'")
+    # Keys are never logged, received or expected
+    if not x_api_key or not hmac.compare_digest(x_api_key.encode(), API_KEY.encode()):
+        client = request.client.host if request.client else "unknown"
+        logger.warning(f"❌ Invalid or missing API key from {client}")
         raise HTTPException(
             status_code=401,
             detail="Invalid or missing API key. Please provide a valid X-API-KEY header."
         )
     
-    logger.info("✅ API key verified successfully")
+    logger.debug("✅ API key verified")
 
 # =================
 # ROOT ENDPOINT - Serve Frontend
@@ -183,34 +365,105 @@ async def serve_js():
 # =================
 
 
+def whisper_status() -> dict:
+    """
+    Whisper pool status for /health and /metrics. queue_depth counts the
+    jobs waiting in the Whisper stage pool, which is where requests queue
+    (one thread per replica), plus any waiting inside the model pool.
+    """
+    pool_status = whisper_pool.status()
+    pool_status["queue_depth"] += executors.whisper.status()["waiting"]
+    return pool_status
+
+
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """
     Health check endpoint.
     Useful for monitoring and deployment verification.
     """
+    pool_status = whisper_status()
     return HealthResponse(
         status="healthy",
         version="1.0.0",
         services={
             "audio_processor": "ready",
-            "whisper": "ready",
+            "whisper": pool_status["state"],
             "pattern_analyzer": "ready",
             "risk_scorer": "ready",
         },
+        whisper_pool=pool_status,
+        executors=executors.status(),
+        result_cache=result_cache.stats(),
+        live_sessions={**live_sessions, "max": LIVE_MAX_SESSIONS},
+        batch_jobs=batch_runner.status() if batch_runner else None,
     )
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    """
+    Prometheus metrics: per-stage latency histograms, error counters and
+    in-flight gauges, request latency per route, and pool/cache gauges.
+    """
+    pool_status = whisper_status()
+    executor_status = executors.status()
+    cache_stats = result_cache.stats()
+    extra = {
+        "whisper_replicas": ("gauge", "Whisper replicas by state", {
+            (("state", "loaded"),): pool_status["loaded"],
+            (("state", "busy"),): pool_status["busy"],
+        }),
+        "whisper_queue_depth": ("gauge", "Requests waiting for a Whisper replica", {(): pool_status["queue_depth"]}),
+        "executor_jobs": ("gauge", "Stage pool jobs by pool and state", {
+            (("pool", name), ("state", state)): pool[state]
+            for name, pool in executor_status.items()
+            for state in ("running", "waiting")
+        }),
+        "executor_rejected_total": ("counter", "Jobs rejected because a stage pool was full", {
+            (("pool", name),): pool["rejected"] for name, pool in executor_status.items()
+        }),
+        "result_cache_lookups_total": ("counter", "Result cache lookups by outcome", {
+            (("outcome", "hit"),): cache_stats["hits"],
+            (("outcome", "miss"),): cache_stats["misses"],
+        }),
+        "live_sessions_active": ("gauge", "Open live-analysis WebSockets", {(): live_sessions["active"]}),
+        "enrichments_pending": ("gauge", "Fast-verdict enrichments still running", {
+            (): enrichments.stats()["pending"]
+        }),
+        "log_records_dropped_total": ("counter", "Log records dropped because the log queue was full", {
+            (): log_queue_handler.dropped if log_queue_handler else 0
+        }),
+    }
+    return PlainTextResponse(metrics.render(extra), media_type="text/plain; version=0.0.4")
+
+
 # =================
 # MAIN ANALYSIS ENDPOINT
 # =================
 
 
+def check_language(requested: str, detected: str):
+    """Reject a call whose spoken language differs from the user's choice"""
+    if detected != requested:
+        lang_names = speech_service.get_supported_languages()
+        actual_name = lang_names.get(detected, detected)
+        chosen_name = lang_names.get(requested, requested)
+        
+        logger.warning(f"❌ Language mismatch: User chose {chosen_name}, but detected {actual_name}")
+        raise HTTPException(
+            status_code=400,
+            detail=f"Language mismatch: Spoken language is {actual_name}, but you selected {chosen_name}. Please switch to {actual_name} or use Auto-Detect."
+        )
+
+
 @app.post("/analyze-call", response_model=AnalysisResponse)
 async def analyze_call(
     request: Request,
     audio: UploadFile = File(...),
     language: Optional[str] = None,
+    fast_verdict: bool = FAST_VERDICT,
+    stream: Optional[str] = None,
 ):
     """
     🎯 MAIN ENDPOINT: Analyze audio call for scam indicators
@@ -218,6 +471,12 @@ async def analyze_call(
     Args:
         audio: Audio file (WAV, MP3, OGG, FLAC, M4A, AAC, WMA, etc.)
         language: Optional ISO-639-1 language code
+        fast_verdict: On a critical verdict (score pinned at 100), respond
+                      before voice/emotion/entity/known-scam analysis;
+                      poll enrichment_id for the full analysis
+        stream: "ndjson" or "sse" to receive each stage result as soon as
+                it is ready (transcript, risk, timeline, each advanced
+                analysis), then the full result
     
     Returns:
         AnalysisResponse: Complete scam analysis
@@ -231,6 +490,12 @@ async def analyze_call(
     logger.info(f"  Content-Type: {audio.content_type}")
     logger.info(f"  Language: {language or 'auto-detect'}")
     
+    if stream is not None and stream not in STREAM_MEDIA_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported stream format: {stream} (use {' or '.join(STREAM_MEDIA_TYPES)})"
+        )
+    
     # DEMO MODE: Short-circuit and return sample analysis without processing
     if DEMO_MODE:
         logger.info("🎬 DEMO MODE ACTIVE - Returning sample analysis")
@@ -296,6 +561,57 @@ async def analyze_call(
             }
         )
     
+    if stream:
+        return stream_analysis(audio, language, stream)
+    return await run_analysis(audio, language, fast_verdict)
+
+
+def stream_analysis(audio: UploadFile, language: Optional[str], stream_format: str) -> StreamingResponse:
+    """
+    The analysis as a stream of events, each sent as soon as its stage is
+    done. Fast verdict does not apply: the risk event is the early verdict.
+    """
+    events = EventStream(stream_format)
+
+    async def work():
+        try:
+            response = await run_analysis(audio, language, False, events.emit)
+            events.emit("result", response.model_dump(mode="json"))
+        except HTTPException as e:
+            # Headers are long gone; errors travel as an event
+            events.emit("error", {"status_code": e.status_code, "detail": e.detail})
+
+    return StreamingResponse(
+        events.body(work),
+        media_type=events.media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _no_events(event: str, data: dict):
+    pass
+
+
+async def run_analysis(
+    audio: UploadFile,
+    language: Optional[str],
+    fast_verdict: bool,
+    emit: Callable[[str, dict], None] = _no_events,
+) -> AnalysisResponse:
+    """
+    The /analyze-call pipeline.
+
+    Args:
+        audio: Uploaded audio file
+        language: Optional ISO-639-1 language code
+        fast_verdict: Return early on a critical verdict (see analyze_call)
+        emit: Called with (event, data) as each stage result is ready;
+              data uses the AnalysisResponse field names
+
+    Raises:
+        HTTPException: Any failure, with the status to report
+    """
+    spooled = None
     try:
         # ==========================================
         # VALIDATION: File metadata
@@ -305,44 +621,64 @@ async def analyze_call(
             logger.error("❌ No filename provided")
             raise HTTPException(status_code=400, detail="No file selected")
         
-        # Log file info
-        file_size_mb = 0
-        file_bytes = await audio.read()
-        file_size_mb = len(file_bytes) / (1024 * 1024)
-        
-        logger.info(f"📁 [FILE RECEIVED] {audio.filename} ({file_size_mb:.2f}MB, {len(file_bytes)} bytes)")
+        # Read the upload in chunks: hashed and size-checked as it arrives,
+        # kept in memory when small, spooled to a private temp file otherwise
+        try:
+            with metrics.stage("ingest"):
+                spooled = await spool_upload(audio, MAX_UPLOAD_BYTES, spool_dir=UPLOAD_SPOOL_DIR)
+        except UploadTooLargeError as e:
+            logger.error(f"❌ File too large (max {MAX_UPLOAD_MB}MB)")
+            raise HTTPException(status_code=413, detail=str(e))
+        file_size_mb = spooled.size / (1024 * 1024)
         
-        # Reset file pointer to prevent exhaustion
-        await audio.seek(0)
+        logger.info(
+            f"📁 [FILE RECEIVED] {audio.filename} ({file_size_mb:.2f}MB, {spooled.size} bytes"
+            f"{', spooled to disk' if spooled.path else ''})"
+        )
         
         # ==========================================
         # VALIDATION: File content
         # ==========================================
         
-        # Add file size limit check
-        MAX_FILE_SIZE_MB = 50
-        if file_size_mb > MAX_FILE_SIZE_MB:
-            logger.error(f"❌ File too large: {file_size_mb:.2f}MB (max {MAX_FILE_SIZE_MB}MB)")
-            raise HTTPException(status_code=413, detail=f"File too large. Maximum {MAX_FILE_SIZE_MB}MB allowed.")
-        
-        if not file_bytes:
+        if spooled.size == 0:
             logger.error("❌ File bytes is empty!")
             raise HTTPException(status_code=400, detail="Empty audio file")
         
         logger.info("✅ File validation passed")
         
+        # ==========================================
+        # RESULT CACHE: same recording analyzed before?
+        # ==========================================
+        audio_hash = spooled.sha256
+        cache_key = None
+        if result_cache.enabled:
+            cache_key = ResultCache.make_key(audio_hash, language, speech_service.model_size)
+            # The disk tier reads files: off the event loop
+            cached = await asyncio.to_thread(result_cache.get, cache_key)
+            if cached is not None:
+                logger.info("⚡ Result cache hit - skipping decode and transcription")
+                return AnalysisResponse(**cached)
+        
         # ==========================================
         # STEP 1: Audio Processing
         # ==========================================
         logger.info("📥 Processing audio file...")
         
         # Validate and process audio (handles all formats)
-        audio_processor.validate_audio_file(file_bytes, audio.filename)
+        audio_source = spooled.source
+        audio_processor.validate_audio_file(audio_source, audio.filename)
         
-        # Process audio to optimal format
-        processed_audio, duration = audio_processor.process_audio(
-            file_bytes, audio.filename
-        )
+        # Decode once to 16kHz float32 and extract the voice features in the
+        # same CPU worker call, so the samples are pickled once (back here,
+        # for Whisper) and never sent out to a second worker
+        # Runs in the CPU process pool; rejected with 503 when it is full
+        with metrics.stage("decode"):
+            decoded_audio, duration, worker_voice_analysis = await executors.cpu.run(
+                decode_with_voice, audio_source, audio.filename, reject_when_full=True
+            )
+        # Measured inside the worker; already part of the decode time
+        metrics.observe("resample", decoded_audio.resample_seconds)
+        metrics.observe("voice", decoded_audio.voice_seconds)
         logger.info(f"✅ Audio processed: {duration:.2f}s duration")
         
         # ==========================================
@@ -350,39 +686,64 @@ async def analyze_call(
         # ==========================================
         logger.info("🗣️ Transcribing audio with Whisper...")
         
-        # Performance: Detect language first if user explicitly chose one
-        # to prevent invalid results in the wrong language
-        if language:
-            logger.info(f"🔍 Verifying audio language against user selection: {language}")
-            # We call transcribe with None to let it detect, but only on a short segment if possible
-            # Or just use the full call and check the metadata
-            transcription, detected_language, stt_confidence = speech_service.transcribe(
-                processed_audio, language=None  # Let it auto-detect first
+        # A user-chosen language is verified with a language-ID pass over
+        # the first ~30s before anything else runs; a mismatch is rejected
+        # right away, a match is reused so the transcription does not detect
+        # again. Transcripts are reused from the transcript store when this
+        # recording was transcribed before (SQLite, so in a thread).
+        cached_transcript = None
+        if transcript_store:
+            cached_transcript = await asyncio.to_thread(
+                transcript_store.get, audio_hash, speech_service.model_size
             )
-            
-            if detected_language != language:
-                lang_names = speech_service.get_supported_languages()
-                actual_name = lang_names.get(detected_language, detected_language)
-                chosen_name = lang_names.get(language, language)
-                
-                logger.warning(f"❌ Language mismatch: User chose {chosen_name}, but detected {actual_name}")
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Language mismatch: Spoken language is {actual_name}, but you selected {chosen_name}. Please switch to {actual_name} or use Auto-Detect."
-                )
+        if cached_transcript:
+            logger.info("⚡ Transcript cache hit - skipping Whisper")
+            transcript = cached_transcript.transcript
+            if language:
+                check_language(language, transcript.language)
         else:
-            # Standard auto-detect flow
-            transcription, detected_language, stt_confidence = speech_service.transcribe(
-                processed_audio, language=None
-            )
+            detected_language = None
+            if language:
+                logger.info(f"🔍 Verifying audio language against user selection: {language}")
+                with metrics.stage("language_id"):
+                    detected_language, probability = await executors.whisper.run(
+                        speech_service.detect_language, decoded_audio, reject_when_full=True
+                    )
+                logger.info(f"🌐 Language ID: {detected_language} (p={probability:.2f})")
+                check_language(language, detected_language)
+            # Rejected with 503 when the Whisper queue is full (unless the
+            # language-ID pass above was already admitted)
+            with metrics.stage("whisper"):
+                transcript = await executors.whisper.run(
+                    speech_service.transcribe_detailed, decoded_audio, detected_language,
+                    reject_when_full=not language,
+                )
+            if transcript_store:
+                await asyncio.to_thread(
+                    transcript_store.put, audio_hash, speech_service.model_size, transcript, duration
+                )
+        transcription, detected_language, stt_confidence = (
+            transcript.text, transcript.language, transcript.confidence
+        )
         
         logger.info(f"✅ Transcription complete: {len(transcription)} chars ({detected_language})")
-        logger.info(f"📝 Transcription preview: {transcription[:100] if transcription else '[Empty]'}...")
+        # Call content: only at DEBUG (LOG_LEVELS=app=DEBUG)
+        logger.debug(f"📝 Transcription preview: {transcription[:100] if transcription else '[Empty]'}...")
         
         # Allow analysis even with minimal transcription
         if not transcription:
             logger.warning("⚠️ Empty transcription - proceeding with placeholder")
-            transcription = "[Inaudible or no speech detected]"
+            transcription = EMPTY_TRANSCRIPTION
+        
+        emit("transcript", {
+            "transcription": transcription,
+            "language_detected": detected_language,
+            "call_duration_seconds": duration,
+        })
+        
+        # One tokenization + keyword pass shared by every text analyzer below
+        with metrics.stage("lexicon"):
+            lexicon_index = await executors.text.run(LexiconIndex, transcription)
         
         # ==========================================
         # STEP 3: Pattern Detection
@@ -391,7 +752,10 @@ async def analyze_call(
         logger.info("🔍 Step 3: Analyzing for scam patterns...")
         
         try:
-            pattern_matches = pattern_analyzer.analyze_text(transcription, detected_language)
+            with metrics.stage("pattern"):
+                pattern_matches = await executors.text.run(
+                    pattern_analyzer.analyze_text, transcription, detected_language, lexicon_index
+                )
             logger.info(f"✅ Pattern analysis successful: {len(pattern_matches)} patterns detected")
         except Exception as e:
             logger.error(f"❌ Pattern analysis failed: {str(e)}", exc_info=True)
@@ -411,24 +775,23 @@ async def analyze_call(
         logger.info("📊 Step 4: Calculating risk score with explanation...")
         
         try:
-            risk_assessment = risk_scorer.calculate_risk(
-                pattern_dicts, transcription, duration
-            )
+            with metrics.stage("risk"):
+                risk_assessment = await executors.text.run(
+                    risk_scorer.calculate_risk, pattern_dicts, transcription, duration, lexicon_index
+                )
             logger.info(f"✅ Risk score: {risk_assessment.risk_score}/100 ({risk_assessment.risk_level})")
             logger.info(f"Confidence: {risk_assessment.confidence:.1%}")
         except Exception as e:
             logger.error(f"❌ Risk scoring failed: {str(e)}", exc_info=True)
             # Create default risk assessment
-            risk_assessment = risk_scorer.RiskAssessment(
-                risk_score=50,
-                risk_level="MEDIUM_RISK",
-                confidence=0.5,
-                primary_threat="Unable to complete full analysis",
-                explanation="Risk assessment encountered an error but analysis is partial",
-                detected_threats=[],
-                safe_indicators_found=0,
-                pattern_synergy_bonus=0
-            )
+            risk_assessment = fallback_risk_assessment()
+        
+        # Core verdict, before the advanced bonus (the final result has it)
+        emit("risk", build_response(
+            transcription, detected_language, duration, pattern_dicts, risk_assessment, [], None, None, None, None
+        ).model_dump(mode="json", include={
+            "risk_score", "risk_level", "detected_patterns", "primary_threat", "explanation", "confidence"
+        }))
         
         # ==========================================
         # STEP 5: Generate Risk Timeline
@@ -436,125 +799,149 @@ async def analyze_call(
         logger.info("📈 Step 5: Building risk timeline...")
         
         try:
-            timeline = risk_scorer.build_risk_timeline(transcription, pattern_dicts)
+            with metrics.stage("timeline"):
+                timeline = await executors.text.run(
+                    risk_scorer.build_risk_timeline,
+                    transcription,
+                    transcript.segments,
+                    detected_language,
+                    duration,
+                    pattern_analyzer,
+                )
             logger.info(f"✅ Timeline generated: {len(timeline)} checkpoints")
         except Exception as e:
             logger.error(f"⚠️ Timeline generation failed: {str(e)}")
             timeline = []
+        emit("timeline", {"risk_timeline": timeline})
         
         # ==========================================
         # NEW FEATURES: Advanced Analysis (Parallel)
         # ==========================================
         logger.info("🔬 Advanced Analysis: Running Voice, Emotions, Entities, and DB matching in parallel...")
         
-        # Run synchronous analysis methods in threads to avoid blocking the event loop
-        loop = asyncio.get_event_loop()
-        
+        # Voice features came back with the decode (None if they failed);
+        # text analyzers run in the text thread pool
         async def run_voice():
-            try:
-                return await loop.run_in_executor(None, voice_analyzer.analyze_audio_features, processed_audio)
-            except Exception as e:
-                logger.error(f"⚠️ Voice analysis failed: {str(e)}")
-                return {"speaking_rate": 0, "voice_quality_score": 0, "stress_indicators": []}
+            if worker_voice_analysis is None:
+                return dict(VOICE_FALLBACK)
+            return worker_voice_analysis
 
         async def run_emotional():
             try:
-                return await loop.run_in_executor(None, emotional_analyzer.analyze_tone, transcription)
+                with metrics.stage("emotion"):
+                    return await executors.text.run(emotional_analyzer.analyze_tone, transcription, lexicon_index)
             except Exception as e:
                 logger.error(f"⚠️ Emotional analysis failed: {str(e)}")
-                return {"manipulation_risk": 0, "tactics_detected": []}
+                return dict(EMOTIONAL_FALLBACK)
 
         async def run_entity():
             try:
-                return await loop.run_in_executor(None, entity_extractor.extract_entities, transcription)
+                with metrics.stage("entity"):
+                    return await executors.text.run(entity_extractor.extract_entities, transcription, lexicon_index)
             except Exception as e:
                 logger.error(f"⚠️ Entity extraction failed: {str(e)}")
-                return {"total_sensitive_items": 0, "entities": [], "information_extraction_risk": 0}
+                return dict(ENTITY_FALLBACK)
 
         async def run_scam_db():
             try:
-                return await loop.run_in_executor(None, scam_database.compare_call_with_campaigns, transcription)
+                with metrics.stage("scam_db"):
+                    return await executors.text.run(
+                        scam_database.compare_call_with_campaigns, transcription, lexicon_index
+                    )
             except Exception as e:
                 logger.error(f"⚠️ Scam database comparison failed: {str(e)}")
-                return {"is_known_scam": False, "match_percentage": 0, "top_match": None, "all_matches": []}
-
-        # Execute all in parallel
-        voice_analysis, emotional_analysis, entity_analysis, scam_comparison = await asyncio.gather(
-            run_voice(), run_emotional(), run_entity(), run_scam_db()
-        )
+                return dict(SCAM_DB_FALLBACK)
+
+        async def emitted(field: str, analysis) -> dict:
+            """Await one advanced analysis and send it on as soon as it is done"""
+            result = await analysis
+            emit(field, {field: result})
+            return result
+
+        async def enrich_and_finish() -> AnalysisResponse:
+            """Enrichment analyses in parallel, then the final (cached) response"""
+            # Execute all in parallel
+            voice_analysis, emotional_analysis, entity_analysis, scam_comparison = await asyncio.gather(
+                emitted("voice_analysis", run_voice()),
+                emitted("emotional_analysis", run_emotional()),
+                emitted("entity_analysis", run_entity()),
+                emitted("known_scam_match", run_scam_db()),
+            )
         
-        # 5. Calculate Enhanced Risk Score
-        # Combine multiple data sources
-        advanced_risk_bonus = 0
-        if entity_analysis["information_extraction_risk"] > 50:
-            advanced_risk_bonus += 10
-        if emotional_analysis["manipulation_risk"] > 50:
-            advanced_risk_bonus += 10
-        if scam_comparison["is_known_scam"]:
-            advanced_risk_bonus += 15
-        if voice_analysis.get("speaking_rate", 0) > 0.7:
-            advanced_risk_bonus += 5
-        
-        # Apply bonus (cap total at 100)
-        enhanced_risk_score = min(
-            risk_assessment.risk_score + advanced_risk_bonus, 100
-        )
+            if transcript_store and not cached_transcript:
+                try:
+                    await asyncio.to_thread(
+                        transcript_store.set_voice_analysis,
+                        audio_hash, speech_service.model_size, voice_analysis,
+                    )
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"⚠️ Voice analysis not cached: {str(e)}")
         
-        if advanced_risk_bonus > 0:
-            risk_assessment.risk_score = enhanced_risk_score
-            # Update risk level if score crossed threshold
-            if enhanced_risk_score >= 85 and risk_assessment.risk_level != "CRITICAL_SCAM":
-                risk_assessment.risk_level = "CRITICAL_SCAM"
+            # 5. Calculate Enhanced Risk Score
+            # Combine multiple data sources
+            advanced_risk_bonus = apply_advanced_bonus(
+                risk_assessment, voice_analysis, emotional_analysis, entity_analysis, scam_comparison
+            )
         
-        logger.info(f"✅ Advanced analysis complete: bonus={advanced_risk_bonus}, final_score={enhanced_risk_score}")
+            logger.info(f"✅ Advanced analysis complete: bonus={advanced_risk_bonus}, final_score={risk_assessment.risk_score}")
         
-        # ==========================================
-        # STEP 6: Prepare Response
-        # ==========================================
-        logger.info("🎯 Step 6: Building final response...")
+            # ==========================================
+            # STEP 6: Prepare Response
+            # ==========================================
+            logger.info("🎯 Step 6: Building final response...")
         
-        # Convert risk level to enum (SAFE - cannot crash)
-        risk_level_enum = RiskLevel.__members__.get(
-            str(risk_assessment.risk_level).upper(),
-            RiskLevel.LIKELY_SAFE
-        )
+            response = build_response(
+                transcription,
+                detected_language,
+                duration,
+                pattern_dicts,
+                risk_assessment,
+                timeline,
+                voice_analysis,
+                emotional_analysis,
+                entity_analysis,
+                scam_comparison,
+            )
         
-        # Create response
-        response = AnalysisResponse(
-            success=True,
-            transcription=transcription,
-            risk_score=risk_assessment.risk_score,
-            risk_level=risk_level_enum,
-            detected_patterns=[
-                PatternMatch(
-                    pattern_name=p["pattern_name"],
-                    keywords=p["keywords"],
-                    confidence=p["confidence"],
-                    risk_contribution=p["risk_contribution"],
-                    explanation=p["explanation"],
-                )
-                for p in pattern_dicts
-            ],
-            primary_threat=risk_assessment.primary_threat,
-            explanation=risk_assessment.explanation,
-            risk_timeline=timeline,
-            call_duration_seconds=duration,
-            language_detected=detected_language,
-            confidence=risk_assessment.confidence,
-            # NEW: Include advanced analysis
-            voice_analysis=voice_analysis,
-            emotional_analysis=emotional_analysis,
-            entity_analysis=entity_analysis,
-            known_scam_match=scam_comparison,
-        )
+            logger.info("✅ Analysis complete!")
+            logger.info(f"Final recommendation: {risk_assessment.risk_level}")
         
-        logger.info("✅ Analysis complete!")
-        logger.info(f"Final recommendation: {risk_assessment.risk_level}")
+            if cache_key:
+                await asyncio.to_thread(result_cache.put, cache_key, response.model_dump(mode="json"))
         
-        return response
+            return response
+
+        # ==========================================
+        # FAST VERDICT: a critical pattern already pinned the score at 100,
+        # so no enrichment result can change the verdict. Answer now and
+        # let the enrichment finish in the background.
+        # ==========================================
+        if fast_verdict and risk_assessment.risk_score >= 100:
+            enrichment_id = enrichments.start(enrich_and_finish())
+            logger.info(f"⚡ Fast verdict: {risk_assessment.risk_level} - enrichment continues in the background")
+            response = build_response(
+                transcription,
+                detected_language,
+                duration,
+                pattern_dicts,
+                risk_assessment,
+                timeline,
+                None,
+                None,
+                None,
+                None,
+            )
+            response.enrichment_status = "pending"
+            response.enrichment_id = enrichment_id
+            return response
+
+        return await enrich_and_finish()
         
     except HTTPException:
         raise
+    except PoolBusyError as e:
+        logger.warning(f"⏳ Transcription pool busy: {str(e)}")
+        raise HTTPException(status_code=503, detail=f"Server busy, please retry shortly. {str(e)}")
     except ValueError as e:
         logger.error(f"❌ Validation error: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -569,6 +956,411 @@ async def analyze_call(
             status_code=500, 
             detail=f"Analysis error: {error_msg}"
         )
+    finally:
+        if spooled:
+            spooled.close()
+
+
+@app.get("/analyze-call/enrichment/{enrichment_id}", response_model=EnrichmentResponse)
+async def get_enrichment(request: Request, enrichment_id: str, wait: float = 0):
+    """
+    Full analysis behind a fast verdict (voice, emotions, entities, known
+    scams added). wait: seconds to hold the request while still pending
+    (long poll, max 30).
+    """
+    verify_api_key(request)
+
+    entry = await enrichments.wait(enrichment_id, min(max(wait, 0.0), 30.0))
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Enrichment not found or expired")
+    return EnrichmentResponse(
+        enrichment_id=enrichment_id,
+        status=entry.status,
+        analysis=entry.result,
+        error=entry.error,
+    )
+
+
+# =================
+# RE-SCORE ENDPOINT
+# =================
+
+
+@app.post("/rescore", response_model=RescoreResponse)
+async def rescore(request: Request, body: RescoreRequest):
+    """
+    Re-run the text analyzers (patterns, risk, emotions, entities, known
+    scams) on cached transcripts - no audio, no Whisper. Use after tuning
+    keyword lists or scoring weights. Requires TRANSCRIPT_CACHE_DB.
+    """
+    verify_api_key(request)
+
+    if not transcript_store:
+        raise HTTPException(
+            status_code=404, detail="Transcript cache is disabled (set TRANSCRIPT_CACHE_DB)"
+        )
+
+    def run() -> list:
+        return [
+            RescoredCall(
+                audio_hash=cached.audio_hash,
+                model_size=cached.model_size,
+                analysis=text_pipeline.rescore(
+                    cached.transcript.text,
+                    cached.transcript.language,
+                    cached.duration,
+                    cached.voice_analysis,
+                    cached.transcript.segments,
+                ),
+            )
+            for cached in transcript_store.iter_transcripts(body.audio_hashes, body.limit)
+        ]
+
+    with metrics.stage("rescore"):
+        results = await executors.text.run(run)
+    logger.info(f"🔁 Re-scored {len(results)} cached transcripts")
+    return RescoreResponse(success=True, count=len(results), results=results)
+
+
+# =================
+# BATCH JOBS
+# =================
+
+
+def _batch_store() -> BatchJobStore:
+    if not batch_store:
+        raise HTTPException(status_code=404, detail="Batch jobs are disabled (set BATCH_DIR)")
+    return batch_store
+
+
+@app.post("/batch-jobs", response_model=BatchJobStatus, status_code=202)
+async def create_batch_job(
+    request: Request,
+    archive: UploadFile = File(...),
+    language: Optional[str] = None,
+):
+    """
+    Queue a zip/tar of recordings for batch analysis.
+
+    Args:
+        archive: .zip or .tar(.gz) containing the recordings
+        language: Optional expected ISO-639-1 language (files in another
+                  language are reported as failed, as /analyze-call would)
+
+    Returns:
+        BatchJobStatus with the job ID to poll
+    """
+    verify_api_key(request)
+    store = _batch_store()
+
+    job_id = new_job_id()
+    work_dir = os.path.join(BATCH_DIR, "jobs", job_id)
+    spooled = None
+    try:
+        spooled = await spool_upload(
+            archive, BATCH_MAX_UPLOAD_MB * 1024 * 1024, spool_dir=UPLOAD_SPOOL_DIR
+        )
+        items = await asyncio.get_running_loop().run_in_executor(
+            None,
+            extract_archive,
+            spooled.source,
+            work_dir,
+            AudioProcessor.MAX_FILE_SIZE_MB * 1024 * 1024,
+            BATCH_MAX_FILES,
+            BATCH_MAX_EXTRACT_MB * 1024 * 1024,
+        )
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        await asyncio.to_thread(shutil.rmtree, work_dir, ignore_errors=True)
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        if spooled:
+            spooled.close()
+
+    # The job store is SQLite: every call goes through a thread, as in the runner
+    await asyncio.to_thread(store.create_job, job_id, items, language, "archive", work_dir)
+    batch_runner.notify()
+    logger.info(f"📦 Batch job {job_id} queued: {len(items)} recordings from {archive.filename}")
+    job = await asyncio.to_thread(store.get_job, job_id)
+    return BatchJobStatus(**job.progress())
+
+
+@app.post("/batch-jobs/manifest", response_model=BatchJobStatus, status_code=202)
+async def create_batch_job_from_manifest(request: Request, body: BatchManifestRequest):
+    """Queue recordings already on the server (paths under BATCH_INPUT_DIR)"""
+    verify_api_key(request)
+    store = _batch_store()
+    if not BATCH_INPUT_DIR:
+        raise HTTPException(status_code=404, detail="Manifest jobs are disabled (set BATCH_INPUT_DIR)")
+
+    try:
+        items = await asyncio.to_thread(resolve_manifest, body.files, BATCH_INPUT_DIR, BATCH_MAX_FILES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job_id = new_job_id()
+    await asyncio.to_thread(store.create_job, job_id, items, body.language, "manifest")
+    batch_runner.notify()
+    logger.info(f"📦 Batch job {job_id} queued: {len(items)} recordings from manifest")
+    job = await asyncio.to_thread(store.get_job, job_id)
+    return BatchJobStatus(**job.progress())
+
+
+@app.get("/batch-jobs")
+async def list_batch_jobs(request: Request, limit: int = 50):
+    """Most recent batch jobs with their progress"""
+    verify_api_key(request)
+    jobs = await asyncio.to_thread(_batch_store().list_jobs, min(max(limit, 1), 500))
+    return {"jobs": [job.progress() for job in jobs]}
+
+
+@app.get("/batch-jobs/{job_id}", response_model=BatchJobStatus)
+async def get_batch_job(request: Request, job_id: str):
+    """Progress, throughput (calls/hour) and ETA of a batch job"""
+    verify_api_key(request)
+    job = await asyncio.to_thread(_batch_store().get_job, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    return BatchJobStatus(**job.progress())
+
+
+@app.get("/batch-jobs/{job_id}/results", response_model=BatchResultsPage)
+async def get_batch_results(
+    request: Request,
+    job_id: str,
+    cursor: int = 0,
+    limit: int = 100,
+    status: Optional[str] = None,
+):
+    """
+    Per-file results of a batch job, in archive/manifest order.
+
+    Args:
+        cursor: next_cursor of the previous page (0 for the first)
+        limit: Files per page (max 500)
+        status: Only files that are done/failed/queued/running
+    """
+    verify_api_key(request)
+    store = _batch_store()
+    if not await asyncio.to_thread(store.get_job, job_id):
+        raise HTTPException(status_code=404, detail="Batch job not found")
+
+    results, next_cursor = await asyncio.to_thread(
+        store.results, job_id, max(cursor, 0), min(max(limit, 1), 500), status
+    )
+    return BatchResultsPage(job_id=job_id, results=results, next_cursor=next_cursor)
+
+
+@app.delete("/batch-jobs/{job_id}")
+async def delete_batch_job(request: Request, job_id: str):
+    """Cancel a batch job and delete its results and extracted recordings"""
+    verify_api_key(request)
+    existed, work_dir = await asyncio.to_thread(_batch_store().delete_job, job_id)
+    if not existed:
+        raise HTTPException(status_code=404, detail="Batch job not found")
+    if work_dir:
+        await asyncio.to_thread(shutil.rmtree, work_dir, ignore_errors=True)
+    logger.info(f"🗑️ Batch job {job_id} deleted")
+    return {"success": True, "job_id": job_id}
+
+
+# =================
+# PROFILES (ADMIN)
+# =================
+
+PROFILE_REPORT_SORTS = ("cumulative", "tottime", "calls")
+
+
+def _profile_store(request: Request) -> ProfileStore:
+    """Profile store for admin endpoints: API key, plus PROFILE_TOKEN when set"""
+    if not profile_store:
+        raise HTTPException(status_code=404, detail="Profiling is disabled (set PROFILE_DIR)")
+    verify_api_key(request)
+    if profile_store.token and not profile_store.check_token(request.headers.get("X-Profile-Token")):
+        raise HTTPException(status_code=403, detail="Invalid or missing X-Profile-Token header")
+    return profile_store
+
+
+@app.get("/admin/profiles")
+async def list_profiles(request: Request, limit: int = 50):
+    """Saved request profiles, newest first"""
+    store = _profile_store(request)
+    return {"profiles": store.list_profiles(max(1, min(limit, 500)))}
+
+
+@app.get("/admin/profiles/{profile_id}")
+async def get_profile(request: Request, profile_id: str):
+    """Summary of one profile: job timeline and the functions with the most own time"""
+    summary = _profile_store(request).get_summary(profile_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return summary
+
+
+@app.get("/admin/profiles/{profile_id}/download")
+async def download_profile(request: Request, profile_id: str):
+    """The merged cProfile stats (open with snakeviz or `python -m pstats`)"""
+    path = _profile_store(request).get_prof_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+
+
+@app.get("/admin/profiles/{profile_id}/report", response_class=PlainTextResponse)
+async def profile_report(request: Request, profile_id: str, sort: str = "cumulative", limit: int = 60):
+    """pstats text report of one profile"""
+    if sort not in PROFILE_REPORT_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of {', '.join(PROFILE_REPORT_SORTS)}")
+    report = _profile_store(request).render_text(profile_id, sort, max(1, min(limit, 500)))
+    if report is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return PlainTextResponse(report)
+
+
+# =================
+# LIVE CALL ENDPOINT
+# =================
+
+def _is_stop(text: str) -> bool:
+    try:
+        return json.loads(text).get("type") == "stop"
+    except (ValueError, AttributeError):
+        return False
+
+
+@app.websocket("/ws/analyze-live")
+async def analyze_live(websocket: WebSocket):
+    """
+    🎙️ Analyze a call while it is happening.
+
+    Query parameters:
+    - sample_rate: Rate of the PCM sent (default 16000)
+    - encoding: pcm_s16le (default) or pcm_f32le, mono
+    - language: ISO code; omitted = detected on the first utterance
+    - api_key: Alternative to the X-API-KEY header (browsers cannot set it)
+
+    Client -> server: binary frames of raw PCM (any size up to 256 KB);
+    the text message {"type": "stop"} ends the call.
+
+    Server -> client (JSON):
+    - {"type": "ready"}
+    - {"type": "update", segments, checkpoints, risk_score, risk_level,
+       patterns, latency_ms} after every utterance is transcribed
+    - {"type": "warning", message} when audio had to be skipped
+    - {"type": "final", risk_score, risk_level, timeline, ...} at the end
+    """
+    if API_KEY:
+        api_key = websocket.headers.get("x-api-key") or websocket.query_params.get("api_key")
+        if not api_key or not hmac.compare_digest(api_key.encode(), API_KEY.encode()):
+            logger.warning("❌ Invalid API key for live session")
+            await websocket.close(code=1008)  # Policy violation
+            return
+    if live_sessions["active"] >= LIVE_MAX_SESSIONS:
+        live_sessions["rejected"] += 1
+        logger.warning(f"⏳ Live session rejected: {live_sessions['active']} active")
+        await websocket.close(code=1013)  # Try again later
+        return
+
+    # Reserve the slot before the first await, so concurrent handshakes
+    # cannot all pass the check above
+    live_sessions["active"] += 1
+    try:
+        await run_live_session(websocket)
+    finally:
+        live_sessions["active"] -= 1
+
+
+async def run_live_session(websocket: WebSocket):
+    """One accepted live session (the slot is reserved by analyze_live)"""
+    await websocket.accept()
+    params = websocket.query_params
+    try:
+        session = LiveCallSession(
+            risk_scorer,
+            pattern_analyzer,
+            sample_rate=int(params.get("sample_rate", "16000")),
+            encoding=params.get("encoding", "pcm_s16le"),
+            language=params.get("language") or None,
+            max_window_seconds=LIVE_WINDOW_SECONDS,
+        )
+    except ValueError as e:
+        await websocket.send_json({"type": "error", "error": str(e)})
+        await websocket.close(code=1003)  # Unsupported data
+        return
+
+    live_sessions["total"] += 1
+    logger.info(f"🎙️ Live session started ({live_sessions['active']} active)")
+
+    windows: asyncio.Queue = asyncio.Queue(maxsize=LIVE_MAX_PENDING)
+
+    async def skip(window: LiveWindow, reason: str):
+        session.skip(window)
+        await websocket.send_json({
+            "type": "warning",
+            "message": f"{reason} - skipped {window.duration:.1f}s of audio at {window.offset:.1f}s",
+        })
+
+    async def enqueue(new_windows):
+        for window in new_windows:
+            if windows.full():
+                # Whisper is behind: drop the oldest window, keep latency bounded
+                await skip(windows.get_nowait(), "Falling behind")
+            windows.put_nowait(window)
+
+    async def transcribe_windows():
+        while True:
+            window = await windows.get()
+            if window is None:
+                return
+            try:
+                with metrics.stage("live_whisper"):
+                    transcript = await executors.whisper.run(
+                        speech_service.transcribe_detailed,
+                        DecodedAudio(window.samples, 16000, window.duration),
+                        session.language,
+                        reject_when_full=True,
+                    )
+                update = await executors.text.run(session.add_transcript, window, transcript)
+            except PoolBusyError:
+                await skip(window, "Server busy")
+                continue
+            except Exception as e:
+                # One bad window must not end the session: report it and
+                # keep consuming, so later windows and the final summary follow
+                logger.error(f"❌ Live window at {window.offset:.1f}s failed: {str(e)}", exc_info=True)
+                await skip(window, "Transcription failed")
+                continue
+            await websocket.send_json(update)
+
+    worker = asyncio.create_task(transcribe_windows())
+    try:
+        await websocket.send_json({"type": "ready"})
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            if message.get("bytes") is not None:
+                data = message["bytes"]
+                if len(data) > LIVE_MAX_FRAME_BYTES:
+                    await websocket.close(code=1009)  # Message too big
+                    break
+                await enqueue(session.push_pcm(data))
+            elif message.get("text") and _is_stop(message["text"]):
+                await enqueue(session.flush())
+                # Wait for the remaining windows, then report the whole call
+                await windows.put(None)
+                await worker
+                await websocket.send_json(session.summary())
+                await websocket.close()
+                break
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"❌ Live session failed: {str(e)}", exc_info=True)
+    finally:
+        worker.cancel()
+        logger.info(f"🎙️ Live session ended ({live_sessions['active'] - 1} active)")
 
 
 # =================
@@ -667,12 +1459,23 @@ async def http_exception_handler(request, exc):
 
 @app.on_event("startup")
 async def startup_event():
-    """Log startup - models will load lazily on first request"""
+    """Log startup and start warming the Whisper pool"""
+    if WHISPER_WARMUP == "eager":
+        # Block startup until every replica is loaded
+        await asyncio.get_event_loop().run_in_executor(None, whisper_pool.warm_up, False)
+    elif WHISPER_WARMUP == "background":
+        whisper_pool.warm_up(background=True)
+    if batch_runner:
+        batch_runner.start()
+
     logger.info("=" * 60)
     logger.info("🚀 🚀 🚀 APPLICATION STARTUP COMPLETE 🚀 🚀 🚀")
     logger.info("=" * 60)
     logger.info("✅ All services initialized (lazy-loaded)")
-    logger.info("⚡ Whisper model will load on FIRST /analyze-call request")
+    if WHISPER_WARMUP == "lazy":
+        logger.info("⚡ Whisper model will load on FIRST /analyze-call request")
+    else:
+        logger.info(f"⚡ Whisper pool ({WHISPER_REPLICAS} replica(s)): {whisper_pool.status()['state']}")
     logger.info(f"🎬 DEMO_MODE = {DEMO_MODE}")
     logger.info("API ready at: http://localhost:8000")
     logger.info("Docs ready at: http://localhost:8000/docs")
@@ -681,7 +1484,11 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Log shutdown"""
+    """Stop the batch runner, background enrichments and worker pools"""
+    if batch_runner:
+        await batch_runner.stop()
+    enrichments.cancel_all()
+    executors.shutdown()
     logger.info("🛑 Application shutdown")
 
 
@@ -699,7 +1506,14 @@ async def api_info():
         "description": "Detect financial fraud through voice analysis with explainable AI",
         "endpoints": {
             "health": "GET /health",
+            "metrics": "GET /metrics",
             "analyze": "POST /analyze-call",
+            "analyze_streamed": "POST /analyze-call?stream=ndjson (or stream=sse)",
+            "enrichment": "GET /analyze-call/enrichment/{enrichment_id}",
+            "rescore": "POST /rescore",
+            "analyze_live": "WS /ws/analyze-live",
+            "batch_jobs": "POST /batch-jobs, GET /batch-jobs/{job_id}, GET /batch-jobs/{job_id}/results",
+            "profiles": "GET /admin/profiles, GET /admin/profiles/{profile_id}/download",
             "languages": "GET /info/languages",
             "patterns": "GET /info/patterns",
             "known_scams": "GET /info/known-scams",
@@ -707,9 +1521,3 @@ async def api_info():
         },
         "docs": "http://localhost:8000/docs",
     }
-
-
-if __name__ == "__main__":
-    import uvicorn
-
-    uvicorn.run(app, host="0.0.0.0", port=8000, log_level="info")
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Scam Analyzer Command Line
+==========================
+Offline tools that use the same services as the API.
+
+    python cli.py rescore --db transcripts.db [--hash SHA256 ...] [--output results.jsonl]
+    python cli.py analyze recordings/ --output results.jsonl [--workers 4] [--language hi]
+
+analyze: runs the full /analyze-call pipeline (decode, language check,
+Whisper, voice features, text analyzers) over a directory or file list in
+a multiprocessing pool - no server needed. Each worker process loads its
+own Whisper model once. Results are appended to JSONL as they finish (or
+collected into Parquet), so an interrupted run picks up where it stopped.
+
+rescore: re-runs PatternAnalyzer, RiskScorer, EmotionalToneAnalyzer,
+EntityExtractor and KnownScamDatabase against transcripts cached by the API
+(TRANSCRIPT_CACHE_DB) - Whisper is not loaded. Run it after editing
+utils/constants.py or scoring weights to see the new scores in seconds.
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from dotenv import load_dotenv
+
+
+def _text_pipeline():
+    """The text analyzers, built the same way app.py builds them"""
+    from services.campaign_store import CampaignStore
+    from services.emotional_analyzer import EmotionalToneAnalyzer
+    from services.entity_extractor import EntityExtractor
+    from services.pattern_analyzer import PatternAnalyzer
+    from services.pipeline import TextAnalysisPipeline
+    from services.risk_scorer import RiskScorer
+    from services.scam_database import KnownScamDatabase
+
+    return TextAnalysisPipeline(
+        PatternAnalyzer(),
+        RiskScorer(),
+        EmotionalToneAnalyzer(),
+        EntityExtractor(),
+        KnownScamDatabase(CampaignStore(os.getenv("SCAM_DB_PATH"))),
+    )
+
+
+def cmd_rescore(args) -> int:
+    from services.transcript_store import TranscriptStore
+
+    if not Path(args.db).exists():
+        print(f"❌ Transcript cache not found: {args.db}")
+        return 1
+
+    store = TranscriptStore(args.db)
+    pipeline = _text_pipeline()
+    output = open(args.output, "w", encoding="utf-8") if args.output else None
+
+    print(f"\n🔁 Re-scoring cached transcripts from {args.db}\n")
+    print(f"{'audio hash':<14} {'lang':<5} {'score':>5}  {'risk level':<16} patterns")
+
+    levels = Counter()
+    count = 0
+    t0 = time.perf_counter()
+    try:
+        for cached in store.iter_transcripts(args.hash or None, args.limit):
+            analysis = pipeline.rescore(
+                cached.transcript.text,
+                cached.transcript.language,
+                cached.duration,
+                cached.voice_analysis,
+                cached.transcript.segments,
+            )
+            count += 1
+            levels[analysis.risk_level.value] += 1
+            patterns = ", ".join(p.pattern_name for p in analysis.detected_patterns) or "-"
+            print(
+                f"{cached.audio_hash[:12]:<14} {analysis.language_detected:<5} "
+                f"{analysis.risk_score:>5}  {analysis.risk_level.value:<16} {patterns}"
+            )
+            if output:
+                record = {
+                    "audio_hash": cached.audio_hash,
+                    "model_size": cached.model_size,
+                    "analysis": analysis.model_dump(mode="json"),
+                }
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        if output:
+            output.close()
+
+    elapsed = time.perf_counter() - t0
+    print(f"\n✅ {count} transcripts re-scored in {elapsed:.2f}s")
+    for level, n in levels.most_common():
+        print(f"   {level:<16} {n}")
+    if args.output:
+        print(f"📄 Results written to {args.output}")
+    return 0
+
+
+# ==================
+# ANALYZE
+# ==================
+
+# Services of one analyze worker process (built once by the initializer)
+_worker: Dict = {}
+
+
+def _init_analyze_worker(model_size: str, window_seconds: float, torch_threads: int, verbose: bool):
+    """
+    Build the services once per worker: Whisper is loaded here, not per file.
+    A failure is kept and reported by the first task - an exception here
+    would make the pool restart the worker forever.
+    """
+    logging.basicConfig(
+        level=logging.INFO if verbose else logging.ERROR,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    if torch_threads:
+        try:
+            import torch
+            # Workers share the cores instead of each grabbing all of them
+            torch.set_num_threads(torch_threads)
+        except ImportError:
+            pass
+
+    try:
+        from services.audio_processor import AudioProcessor
+        from services.model_pool import WhisperModelPool
+        from services.speech_to_text import SpeechToTextService
+        from services.voice_analyzer import VoiceAnalyzer
+
+        pool = WhisperModelPool(model_size)
+        pool.warm_up(background=False)
+        if not pool.is_ready:
+            raise RuntimeError(f"Whisper loading failed: {pool.status()['error']}")
+        _worker.update(
+            audio=AudioProcessor(),
+            speech=SpeechToTextService(model_size, pool, window_seconds),
+            voice=VoiceAnalyzer(),
+            text=_text_pipeline(),
+        )
+    except Exception as e:
+        _worker["error"] = f"{type(e).__name__}: {str(e)}"
+
+
+def _analyze_file(task: Tuple[str, Optional[str]]) -> Dict:
+    """
+    The /analyze-call pipeline for one file, inside a worker.
+
+    Returns:
+        Output record: path, status (done/failed), audio_hash, analysis
+        or error, elapsed_seconds
+    """
+    from services.pipeline import VOICE_FALLBACK
+
+    if "error" in _worker:
+        raise RuntimeError(f"Worker setup failed: {_worker['error']}")
+
+    path, language = task
+    t0 = time.perf_counter()
+    record = {"path": path, "status": "failed", "audio_hash": None, "analysis": None, "error": None}
+    try:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        record["audio_hash"] = digest.hexdigest()
+
+        decoded, duration = _worker["audio"].process_audio(path, os.path.basename(path))
+
+        speech = _worker["speech"]
+        detected = None
+        if language:
+            detected, _ = speech.detect_language(decoded)
+            if detected != language:
+                raise ValueError(f"Language mismatch: spoken language is {detected}, expected {language}")
+        transcript = speech.transcribe_detailed(decoded, detected)
+
+        try:
+            voice_analysis = _worker["voice"].analyze_audio_features(decoded)
+        except Exception as e:
+            logging.getLogger(__name__).error(f"⚠️ Voice analysis failed: {str(e)}")
+            voice_analysis = dict(VOICE_FALLBACK)
+
+        analysis = _worker["text"].rescore(
+            transcript.text, transcript.language, duration, voice_analysis, transcript.segments
+        )
+        record.update(status="done", analysis=analysis.model_dump(mode="json"))
+    except Exception as e:
+        record["error"] = str(e)
+    record["elapsed_seconds"] = round(time.perf_counter() - t0, 3)
+    return record
+
+
+def _find_recordings(paths: List[str], files_from: Optional[str]) -> List[str]:
+    """Audio files under the given directories/files, sorted, without duplicates"""
+    from services.audio_processor import AudioProcessor
+
+    candidates = list(paths)
+    if files_from:
+        with open(files_from, encoding="utf-8") as f:
+            candidates.extend(line.strip() for line in f if line.strip())
+
+    found = []
+    for candidate in candidates:
+        if os.path.isdir(candidate):
+            for root, dirs, files in os.walk(candidate):
+                dirs.sort()
+                found.extend(
+                    os.path.join(root, name) for name in sorted(files)
+                    if name.rsplit(".", 1)[-1].lower() in AudioProcessor.SUPPORTED_FORMATS
+                    and not name.startswith(".")
+                )
+        else:
+            found.append(candidate)
+    return list(dict.fromkeys(os.path.abspath(path) for path in found))
+
+
+def _read_journal(path: Path) -> Iterator[Dict]:
+    """Records of a JSONL output; a line cut off by a crash is dropped"""
+    if not path.exists():
+        return
+    with open(path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def _parquet_rows(records: List[Dict]) -> List[Dict]:
+    """Flat columns for analytics plus the full analysis as JSON"""
+    rows = []
+    for record in records:
+        analysis = record.get("analysis") or {}
+        rows.append({
+            "path": record["path"],
+            "status": record["status"],
+            "audio_hash": record.get("audio_hash"),
+            "risk_score": analysis.get("risk_score"),
+            "risk_level": analysis.get("risk_level"),
+            "language": analysis.get("language_detected"),
+            "duration_seconds": analysis.get("call_duration_seconds"),
+            "error": record.get("error"),
+            "elapsed_seconds": record.get("elapsed_seconds"),
+            "analysis": json.dumps(analysis, ensure_ascii=False) if analysis else None,
+        })
+    return rows
+
+
+class _Progress:
+    """One-line progress/throughput display on stderr"""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.audio_seconds = 0.0
+        self.t0 = time.perf_counter()
+        self.tty = sys.stderr.isatty()
+        self._last_print = 0.0
+
+    def update(self, record: Dict):
+        self.done += 1
+        if record["status"] != "done":
+            self.failed += 1
+        else:
+            self.audio_seconds += record["analysis"].get("call_duration_seconds") or 0.0
+        now = time.perf_counter()
+        if self.done == self.total or now - self._last_print >= (0.5 if self.tty else 30.0):
+            self._last_print = now
+            sys.stderr.write(("\r" if self.tty else "") + self.line() + ("" if self.tty else "\n"))
+            sys.stderr.flush()
+
+    def line(self) -> str:
+        elapsed = max(time.perf_counter() - self.t0, 1e-9)
+        rate = self.done / elapsed
+        eta = (self.total - self.done) / rate if rate else 0
+        return (
+            f"[{self.done:>{len(str(self.total))}}/{self.total}] {self.done / self.total:6.1%} | "
+            f"{rate * 3600:,.0f} calls/h | audio {self.audio_seconds / elapsed:.1f}x realtime | "
+            f"failed {self.failed} | ETA {int(eta // 60)}m{int(eta % 60):02d}s"
+        )
+
+
+def cmd_analyze(args) -> int:
+    output = Path(args.output)
+    parquet = args.format == "parquet" or (args.format is None and output.suffix == ".parquet")
+    if parquet:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("❌ Parquet output needs pyarrow (pip install pyarrow), or use a .jsonl output")
+            return 1
+
+    # Parquet cannot be appended to: results go to a JSONL journal first
+    # (seeded from an existing Parquet file when resuming)
+    journal = output.with_name(output.name + ".partial.jsonl") if parquet else output
+    if parquet and output.exists() and not journal.exists():
+        with open(journal, "w", encoding="utf-8") as f:
+            for row in pq.read_table(output).to_pylist():
+                row["analysis"] = json.loads(row["analysis"]) if row["analysis"] else None
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    # Resume: skip files already in the output (failed ones too, unless asked)
+    finished: Set[str] = {
+        record["path"] for record in _read_journal(journal)
+        if record.get("status") == "done" or not args.retry_failed
+    }
+    recordings = _find_recordings(args.paths, args.files_from)
+    todo = [path for path in recordings if path not in finished]
+
+    print(f"\n📂 {len(recordings)} recordings, {len(recordings) - len(todo)} already in {output.name}, "
+          f"{len(todo)} to analyze with {args.workers or 'no'} worker process(es)\n")
+
+    if todo:
+        progress = _Progress(len(todo))
+        tasks = [(path, args.language) for path in todo]
+        initargs = (args.model, args.window_seconds, args.torch_threads, args.verbose)
+        with open(journal, "a", encoding="utf-8") as out:
+            if args.workers:
+                pool = multiprocessing.get_context("spawn").Pool(
+                    args.workers, initializer=_init_analyze_worker, initargs=initargs
+                )
+                results = pool.imap_unordered(_analyze_file, tasks)
+            else:
+                pool = None
+                _init_analyze_worker(*initargs)
+                results = map(_analyze_file, tasks)
+            try:
+                for record in results:
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                    out.flush()
+                    progress.update(record)
+            except RuntimeError as e:
+                print(f"\n❌ {str(e)}")
+                return 1
+            finally:
+                if pool:
+                    pool.terminate()
+                    pool.join()
+        sys.stderr.write("\n")
+        print(f"\n✅ {progress.line()}")
+
+    if args.retry_failed:
+        # Keep only the latest record per file
+        latest = {record["path"]: record for record in _read_journal(journal)}
+        with open(journal, "w", encoding="utf-8") as out:
+            for record in latest.values():
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    if parquet:
+        records = list(_read_journal(journal))
+        pq.write_table(pa.Table.from_pylist(_parquet_rows(records)), output)
+        journal.unlink()
+    print(f"📄 Results written to {output}")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="AI-Powered Audio Call Scam Analyzer tools")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show service logs")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    rescore = subcommands.add_parser("rescore", help="Re-score cached transcripts (no Whisper)")
+    rescore.add_argument(
+        "--db",
+        default=os.getenv("TRANSCRIPT_CACHE_DB"),
+        required=not os.getenv("TRANSCRIPT_CACHE_DB"),
+        help="Transcript cache database (default: $TRANSCRIPT_CACHE_DB)",
+    )
+    rescore.add_argument("--hash", action="append", help="Only this recording (repeatable)")
+    rescore.add_argument("--limit", type=int, default=None, help="Maximum transcripts")
+    rescore.add_argument("--output", help="Write full analyses as JSON lines")
+    rescore.set_defaults(func=cmd_rescore)
+
+    default_workers = max(1, min((os.cpu_count() or 1) // 2, 8))
+    analyze = subcommands.add_parser("analyze", help="Analyze recordings offline (full pipeline)")
+    analyze.add_argument("paths", nargs="*", help="Recordings or directories (searched recursively)")
+    analyze.add_argument("--files-from", help="File with one recording path per line")
+    analyze.add_argument("--output", required=True, help="Results file (.jsonl or .parquet)")
+    analyze.add_argument("--format", choices=("jsonl", "parquet"), help="Default: from --output suffix")
+    analyze.add_argument(
+        "--workers", type=int, default=default_workers,
+        help=f"Worker processes, each with its own Whisper model (default: {default_workers}, 0 = inline)",
+    )
+    analyze.add_argument("--language", help="Expected ISO-639-1 language (others are reported as failed)")
+    analyze.add_argument("--model", default="base", help="Whisper model size (default: base)")
+    analyze.add_argument(
+        "--window-seconds", type=float, default=float(os.getenv("WHISPER_WINDOW_SECONDS", "30")),
+        help="Whisper window for long calls (default: $WHISPER_WINDOW_SECONDS or 30)",
+    )
+    analyze.add_argument(
+        "--torch-threads", type=int, default=None,
+        help="PyTorch threads per worker (default: cores / workers)",
+    )
+    analyze.add_argument("--retry-failed", action="store_true", help="Analyze failed files again")
+    analyze.set_defaults(func=cmd_analyze)
+    return parser
+
+
+def main(argv=None) -> int:
+    load_dotenv()
+    args = build_parser().parse_args(argv)
+    if args.command == "analyze":
+        if not args.paths and not args.files_from:
+            build_parser().error("analyze: give recordings/directories or --files-from")
+        if args.torch_threads is None:
+            args.torch_threads = max(1, (os.cpu_count() or 1) // max(args.workers, 1))
+    logging.basicConfig(
+        level=logging.INFO if args.verbose else logging.ERROR,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
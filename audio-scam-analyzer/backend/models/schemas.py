@@ -40,6 +40,7 @@ class RiskTimeline(BaseModel):
     timestamp: float = Field(..., description="Time in seconds from start")
     risk_score: int = Field(..., description="Risk score at this moment")
     reason: str = Field(..., description="What triggered the change")
+    patterns: List[str] = Field(default_factory=list, description="Patterns that fired at this checkpoint")
 
 
 class AnalysisResponse(BaseModel):
@@ -91,6 +92,90 @@ class AnalysisResponse(BaseModel):
         default=None, description="Match with known scam campaigns from database"
     )
 
+    # Fast verdict: the enrichment analyses above are still running
+    enrichment_status: Optional[str] = Field(
+        default=None, description="'pending' when returned early on a critical verdict"
+    )
+    enrichment_id: Optional[str] = Field(
+        default=None, description="Poll GET /analyze-call/enrichment/{enrichment_id} for the full analysis"
+    )
+
+
+class EnrichmentResponse(BaseModel):
+    """Outcome of the background enrichment of a fast verdict"""
+    enrichment_id: str
+    status: str = Field(..., description="pending, complete or failed")
+    analysis: Optional[AnalysisResponse] = Field(
+        default=None, description="Full analysis, as /analyze-call returns it without fast_verdict"
+    )
+    error: Optional[str] = None
+
+
+class RescoreRequest(BaseModel):
+    """Which cached transcripts to re-score"""
+    audio_hashes: Optional[List[str]] = Field(
+        default=None, description="SHA-256 of the recordings (omit for all)"
+    )
+    limit: int = Field(default=100, ge=1, le=10000, description="Maximum transcripts to re-score")
+
+
+class RescoredCall(BaseModel):
+    """Fresh analysis of one cached transcript"""
+    audio_hash: str
+    model_size: str
+    analysis: AnalysisResponse
+
+
+class RescoreResponse(BaseModel):
+    """Response model for re-scoring cached transcripts"""
+    success: bool
+    count: int
+    results: List[RescoredCall]
+
+
+class BatchManifestRequest(BaseModel):
+    """Batch job over recordings already on the server"""
+    files: List[str] = Field(..., description="Paths relative to BATCH_INPUT_DIR")
+    language: Optional[str] = Field(default=None, description="Expected ISO-639-1 language (omit to auto-detect)")
+
+
+class BatchJobStatus(BaseModel):
+    """Progress and throughput of one batch job"""
+    job_id: str
+    status: str = Field(..., description="queued, running or completed")
+    language: Optional[str] = None
+    source: str = Field(..., description="archive or manifest")
+    total: int
+    done: int
+    failed: int
+    pending: int
+    progress: float = Field(..., description="Share of files processed, 0-1")
+    processing_seconds: float = Field(..., description="Time spent processing (across restarts)")
+    audio_seconds: float = Field(..., description="Audio analyzed so far")
+    calls_per_hour: float = Field(..., description="Files processed per hour of processing time")
+    eta_seconds: Optional[float] = None
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+
+class BatchFileResult(BaseModel):
+    """Outcome for one file of a batch job"""
+    index: int
+    filename: str
+    status: str = Field(..., description="queued, running, done or failed")
+    audio_hash: Optional[str] = None
+    analysis: Optional[AnalysisResponse] = None
+    error: Optional[str] = None
+    elapsed_seconds: Optional[float] = None
+
+
+class BatchResultsPage(BaseModel):
+    """One page of batch results; pass next_cursor back as cursor for the next"""
+    job_id: str
+    results: List[BatchFileResult]
+    next_cursor: Optional[int] = None
+
 
 class HealthResponse(BaseModel):
     """Health check response"""
@@ -103,3 +188,19 @@ class HealthResponse(BaseModel):
             "risk_scorer": "ready",
         }
     )
+    whisper_pool: Optional[Dict] = Field(
+        default=None,
+        description="Whisper replica pool: state (cold/warming/ready/failed), loaded, busy, queue_depth",
+    )
+    executors: Optional[Dict] = Field(
+        default=None, description="Stage pools (cpu/whisper/text): workers, running, waiting, rejected"
+    )
+    result_cache: Optional[Dict] = Field(
+        default=None, description="Analysis result cache: hits, misses, hit_rate, entries"
+    )
+    live_sessions: Optional[Dict] = Field(
+        default=None, description="Live WebSocket sessions: active, total, rejected, max"
+    )
+    batch_jobs: Optional[Dict] = Field(
+        default=None, description="Batch runner: running, current_job, batch_size"
+    )
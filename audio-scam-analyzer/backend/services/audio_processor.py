@@ -4,19 +4,138 @@ Audio Processing Service
 Handles audio file ingestion, validation, and format conversion.
 This is the first layer of the system - ensures audio is ready for Whisper.
 
+Files are decoded block by block and resampled as a stream, so the
+full-rate waveform of a large file is never held in memory at once.
+
 PRIVACY POLICY: Audio files are processed in-memory only.
-No files are persisted to disk. Processing is temporary.
+No files are persisted to disk. Processing is temporary. (Large uploads
+are spooled to a private temp file that is deleted once the request ends -
+see ingestion.py.)
 """
 
 import os
+import struct
+import time
 import librosa
+import numpy as np
 import soundfile as sf
+import soxr
 from io import BytesIO
-from typing import Tuple, Optional
+from dataclasses import dataclass
+from typing import BinaryIO, Tuple, Optional, Union
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Raw upload bytes, or the path of a spooled upload
+AudioSource = Union[bytes, str, os.PathLike]
+
+# MP4 boxes that only contain other boxes (moov/trak/mdia/minf/stbl path)
+_MP4_CONTAINERS = {b"moov", b"trak", b"mdia", b"minf", b"stbl"}
+
+
+def _open_source(source: AudioSource) -> BinaryIO:
+    return BytesIO(source) if isinstance(source, (bytes, bytearray)) else open(source, "rb")
+
+
+def _probe_mp4(f: BinaryIO) -> Optional[dict]:
+    """
+    Read duration, sample rate and channels of an MP4/M4A file from its
+    moov box (mvhd, mdhd, hdlr, stsd). mdat is skipped with a seek, so
+    only a few KB are read wherever moov sits in the file.
+    """
+    f.seek(0, os.SEEK_END)
+    file_end = f.tell()
+
+    def boxes(start: int, end: int):
+        pos = start
+        while pos + 8 <= end:
+            f.seek(pos)
+            size, box_type = struct.unpack(">I4s", f.read(8))
+            header = 8
+            if size == 1:
+                size = struct.unpack(">Q", f.read(8))[0]
+                header = 16
+            elif size == 0:
+                size = end - pos
+            if size < header:
+                return
+            yield box_type, pos + header, min(pos + size, end)
+            pos += size
+
+    def read_header_times(payload: int) -> Tuple[int, int]:
+        # mvhd/mdhd: version(1) flags(3) then times sized by version
+        f.seek(payload)
+        version = f.read(1)[0]
+        if version == 1:
+            f.seek(payload + 20)
+            return struct.unpack(">IQ", f.read(12))
+        f.seek(payload + 12)
+        return struct.unpack(">II", f.read(8))
+
+    movie = None
+    audio = {}
+
+    def walk(start: int, end: int, track: dict):
+        nonlocal movie
+        for box_type, payload, box_end in boxes(start, end):
+            if box_type in _MP4_CONTAINERS:
+                child = {} if box_type == b"trak" else track
+                walk(payload, box_end, child)
+                if box_type == b"trak" and child.get("handler") == b"soun" and not audio:
+                    audio.update(child)
+            elif box_type == b"mvhd":
+                movie = read_header_times(payload)
+            elif box_type == b"mdhd":
+                track["timescale"], track["duration"] = read_header_times(payload)
+            elif box_type == b"hdlr":
+                f.seek(payload + 8)
+                track["handler"] = f.read(4)
+            elif box_type == b"stsd":
+                # First sample entry (e.g. mp4a): 8 byte box header, 6 reserved,
+                # 2 data ref index, 8 reserved, channels, sample size,
+                # 4 reserved, 16.16 sample rate
+                f.seek(payload + 8 + 8 + 8 + 8)
+                channels, _, _, rate = struct.unpack(">HHII", f.read(12))
+                track["channels"] = channels
+                track["sample_rate"] = rate >> 16
+
+    walk(0, file_end, {})
+    if audio.get("timescale"):
+        duration = audio["duration"] / audio["timescale"]
+    elif movie and movie[0]:
+        duration = movie[1] / movie[0]
+    else:
+        return None
+    return {
+        "duration_seconds": duration,
+        "sample_rate": audio.get("sample_rate") or audio.get("timescale", 0),
+        "channels": audio.get("channels", 0),
+        "format": "m4a",
+    }
+
+
+@dataclass
+class DecodedAudio:
+    """
+    Audio decoded once by AudioProcessor and shared by every later stage.
+
+    The samples are mono float32 at the Whisper sample rate. Downstream
+    services read the array directly; WAV bytes are only produced when a
+    caller explicitly asks for them via to_wav_bytes().
+    """
+    samples: np.ndarray  # mono float32
+    sample_rate: int  # Hz
+    duration: float  # seconds
+    resample_seconds: float = 0.0  # Part of the decode time spent resampling
+    voice_seconds: float = 0.0  # Voice features, when computed in the decode call
+
+    def to_wav_bytes(self) -> bytes:
+        """Encode the samples as an in-memory WAV file"""
+        output_buffer = BytesIO()
+        sf.write(output_buffer, self.samples, self.sample_rate, format="WAV")
+        return output_buffer.getvalue()
+
 
 class AudioProcessor:
     """
@@ -31,17 +150,24 @@ class AudioProcessor:
     MAX_DURATION_SECONDS = 600  # 10 minutes max
     MIN_DURATION_SECONDS = 1  # 1 second minimum
     TARGET_SAMPLE_RATE = 16000  # Whisper-optimized sample rate
+    MAX_FILE_SIZE_MB = 50
+    DECODE_BLOCK_FRAMES = 65536  # Frames decoded + resampled per step
 
     def __init__(self):
         """Initialize audio processor"""
         self.sample_rate = self.TARGET_SAMPLE_RATE
         logger.info("AudioProcessor initialized")
 
-    def validate_audio_file(self, file_bytes: bytes, filename: str) -> bool:
+    def validate_audio_file(self, source: AudioSource, filename: str) -> bool:
         """
         Validate audio file is not empty and has a supported format.
+
+        Args:
+            source: Raw audio bytes or path of a spooled upload
+            filename: Original filename
         """
-        if not file_bytes or len(file_bytes) == 0:
+        size = len(source) if isinstance(source, (bytes, bytearray)) else os.path.getsize(source)
+        if size == 0:
             raise ValueError("Empty audio file")
 
         # Check extension
@@ -51,52 +177,47 @@ class AudioProcessor:
             # We still try to process it as librosa might handle it, 
             # but we log the warning.
 
-        file_size_mb = len(file_bytes) / (1024 * 1024)
-        if file_size_mb > 50:
-            raise ValueError(f"File too large ({file_size_mb:.1f}MB). Max 50MB allowed.")
+        file_size_mb = size / (1024 * 1024)
+        if file_size_mb > self.MAX_FILE_SIZE_MB:
+            raise ValueError(
+                f"File too large ({file_size_mb:.1f}MB). Max {self.MAX_FILE_SIZE_MB}MB allowed."
+            )
 
         logger.info(
             f"Audio validation passed: {filename} ({file_size_mb:.2f}MB)"
         )
         return True
 
-    def process_audio(self, file_bytes: bytes, filename: str) -> Tuple[bytes, float]:
+    def process_audio(self, source: AudioSource, filename: str) -> Tuple[DecodedAudio, float]:
         """
         Convert audio to optimal format for Whisper.
         Handles format conversion, resampling, and normalization.
 
+        The file is decoded exactly once; the returned DecodedAudio is
+        passed by reference to transcription and voice analysis.
+
         Args:
-            file_bytes: Raw audio bytes
+            source: Raw audio bytes or path of a spooled upload
             filename: Original filename
 
         Returns:
-            Tuple of (processed_audio_bytes, duration_seconds)
+            Tuple of (decoded_audio, duration_seconds)
         """
         # Validate first
-        self.validate_audio_file(file_bytes, filename)
+        self.validate_audio_file(source, filename)
+
+        # Reject by duration from the container header, before decoding
+        metadata = self.get_audio_metadata(source)
+        if metadata:
+            self._check_duration(metadata["duration_seconds"])
 
         try:
-            # Load audio with automatic format detection
-            audio_buffer = BytesIO(file_bytes)
-            audio_data, sr = librosa.load(audio_buffer, sr=None, mono=True)
-
-            # Get duration
-            duration = librosa.get_duration(y=audio_data, sr=sr)
-            
-            if duration < self.MIN_DURATION_SECONDS:
-                raise ValueError(f"Audio too short ({duration:.2f}s). Minimum 1 second required.")
-            
-            if duration > self.MAX_DURATION_SECONDS:
-                raise ValueError(f"Audio too long ({duration:.2f}s). Maximum 10 minutes allowed.")
+            # Decode to mono and resample to 16kHz (Whisper-optimized)
+            audio_data, duration, sr, resample_seconds = self._decode(source)
+            self._check_duration(duration)
 
             logger.info(f"✅ Audio duration: {duration:.2f}s")
-            logger.info(f"Audio shape: {audio_data.shape}, sample rate: {sr} Hz")
-
-            # Resample to 16kHz (Whisper-optimized)
-            if sr != self.TARGET_SAMPLE_RATE:
-                audio_data = librosa.resample(
-                    audio_data, orig_sr=sr, target_sr=self.TARGET_SAMPLE_RATE
-                )
+            logger.info(f"Audio shape: {audio_data.shape}, source sample rate: {sr} Hz")
 
             # Normalize audio amplitude to prevent clipping
             # This helps with whisper's speech recognition
@@ -104,43 +225,117 @@ class AudioProcessor:
             if max_amplitude > 0:
                 audio_data = audio_data / max_amplitude * 0.95
 
-            # Convert to WAV format for consistent processing
-            output_buffer = BytesIO()
-            sf.write(output_buffer, audio_data, self.TARGET_SAMPLE_RATE, format="WAV")
-            output_buffer.seek(0)
-            processed_bytes = output_buffer.read()
+            decoded = DecodedAudio(
+                samples=np.ascontiguousarray(audio_data, dtype=np.float32),
+                sample_rate=self.TARGET_SAMPLE_RATE,
+                duration=duration,
+                resample_seconds=resample_seconds,
+            )
 
             logger.info(
-                f"Audio processed: {duration:.2f}s, {len(processed_bytes)} bytes"
+                f"Audio processed: {duration:.2f}s, {decoded.samples.size} samples"
             )
-            return processed_bytes, duration
+            return decoded, duration
 
+        except ValueError:
+            # Duration limits are client errors, not processing failures
+            raise
         except Exception as e:
             logger.error(f"Audio processing failed: {str(e)}")
             raise RuntimeError(f"Failed to process audio: {str(e)}")
 
+    def _check_duration(self, duration: float):
+        if duration < self.MIN_DURATION_SECONDS:
+            raise ValueError(f"Audio too short ({duration:.2f}s). Minimum 1 second required.")
+
+        if duration > self.MAX_DURATION_SECONDS:
+            raise ValueError(f"Audio too long ({duration:.2f}s). Maximum 10 minutes allowed.")
+
+    def _decode(self, source: AudioSource) -> Tuple[np.ndarray, float, int, float]:
+        """
+        Decode to mono float32 at TARGET_SAMPLE_RATE.
+
+        Returns:
+            Tuple of (samples, duration_seconds, source_sample_rate, resample_seconds)
+        """
+        try:
+            sound_file = sf.SoundFile(BytesIO(source) if isinstance(source, (bytes, bytearray)) else source)
+        except RuntimeError:
+            # Not readable by libsndfile (e.g. M4A/AAC): decode it whole
+            return self._decode_whole(source)
+
+        with sound_file:
+            sr = sound_file.samplerate
+            resampler = None
+            if sr != self.TARGET_SAMPLE_RATE:
+                resampler = soxr.ResampleStream(
+                    sr, self.TARGET_SAMPLE_RATE, 1, dtype="float32", quality="HQ"
+                )
+
+            # Only one block of source-rate audio is in memory at a time
+            parts = []
+            frames = 0
+            resample_seconds = 0.0
+            for block in sound_file.blocks(
+                blocksize=self.DECODE_BLOCK_FRAMES, dtype="float32", always_2d=True
+            ):
+                mono = block.mean(axis=1) if block.shape[1] > 1 else block[:, 0]
+                frames += mono.size
+                if resampler:
+                    t0 = time.perf_counter()
+                    mono = resampler.resample_chunk(mono)
+                    resample_seconds += time.perf_counter() - t0
+                parts.append(mono)
+            if resampler:
+                t0 = time.perf_counter()
+                parts.append(resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True))
+                resample_seconds += time.perf_counter() - t0
+
+        samples = np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+        return samples, frames / sr, sr, resample_seconds
+
+    def _decode_whole(self, source: AudioSource) -> Tuple[np.ndarray, float, int, float]:
+        """librosa fallback (audioread) for containers libsndfile cannot open"""
+        audio_buffer = BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+        audio_data, sr = librosa.load(audio_buffer, sr=None, mono=True)
+        duration = librosa.get_duration(y=audio_data, sr=sr)
+        t0 = time.perf_counter()
+        if sr != self.TARGET_SAMPLE_RATE:
+            audio_data = librosa.resample(
+                audio_data, orig_sr=sr, target_sr=self.TARGET_SAMPLE_RATE
+            )
+        return audio_data, duration, sr, time.perf_counter() - t0
+
     @staticmethod
-    def get_audio_metadata(file_bytes: bytes) -> dict:
+    def get_audio_metadata(source: AudioSource) -> dict:
         """
         Extract metadata from audio file without full processing.
-        Useful for quick validation.
+        Only container headers are read (libsndfile for WAV/FLAC/OGG/MP3,
+        the moov box for M4A), so this takes microseconds and is safe to
+        call before deciding whether to decode.
 
         Args:
-            file_bytes: Raw audio bytes
+            source: Raw audio bytes or path of a spooled upload
 
         Returns:
-            Dictionary with file info
+            Dictionary with file info (empty if the format is not recognised)
         """
         try:
-            audio_buffer = BytesIO(file_bytes)
-            audio_data, sr = librosa.load(audio_buffer, sr=None, mono=True)
-            duration = librosa.get_duration(y=audio_data, sr=sr)
+            with _open_source(source) as f:
+                try:
+                    info = sf.info(f)
+                except RuntimeError:
+                    f.seek(0)
+                    header = f.read(12)
+                    if header[4:8] != b"ftyp":
+                        return {}
+                    return _probe_mp4(f) or {}
 
             return {
-                "duration_seconds": duration,
-                "sample_rate": sr,
-                "channels": 1,  # We convert to mono
-                "format": "wav",
+                "duration_seconds": info.frames / info.samplerate,
+                "sample_rate": info.samplerate,
+                "channels": info.channels,
+                "format": "mp3" if info.format == "MPEG" else info.format.lower(),
             }
         except Exception as e:
             logger.error(f"Metadata extraction failed: {str(e)}")
@@ -0,0 +1,836 @@
+"""
+Batch Jobs
+==========
+Bulk analysis of call archives (POST /batch-jobs), for overnight sweeps
+of thousands of recordings without one HTTP round-trip per file.
+
+- A job is a zip/tar of recordings (extracted to BATCH_DIR) or a manifest
+  of files already on the server (under BATCH_INPUT_DIR)
+- BatchJobStore keeps jobs, per-file status and results in SQLite, so a
+  job survives a crash or restart: files that were in flight are queued
+  again, finished files are never analyzed twice
+- A batch that raises is put back in the queue. If Whisper could not be
+  loaded (or a pool is broken) the job backs off without counting an
+  attempt; any other error counts one against each of the batch's files,
+  which are then retried one at a time and marked failed after
+  max_attempts, so one bad recording cannot stall the queue
+- BatchRunner works through one job at a time, BATCH_SIZE files per step,
+  batching each stage: the files are decoded (with their voice features)
+  in parallel, their languages are identified in a single Whisper forward
+  pass, their windows share the Whisper replicas, then text analysis runs
+  in parallel
+- Progress and throughput (calls per hour of processing time) are
+  reported per job; results are read back page by page
+
+The runner uses the same stage pools as /analyze-call but leaves them
+room: it never holds more than half of the CPU pool's slots and only
+borrows extra Whisper replicas while no other request is waiting.
+
+PRIVACY: Extracted recordings are private files deleted when their job
+ends (or is deleted). Results contain transcripts and stay in the job
+database until the job is deleted.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tarfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import BrokenExecutor
+from dataclasses import dataclass
+from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+
+from services.audio_processor import AudioProcessor
+from services.executors import AnalysisExecutors, decode_file_with_voice
+from services.ingestion import CHUNK_SIZE
+from services.model_pool import ModelLoadError, PoolBusyError
+from services.pipeline import VOICE_FALLBACK, TextAnalysisPipeline
+from services.result_cache import ResultCache
+from services.speech_to_text import SpeechToTextService
+from services.transcript_store import TranscriptStore
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,            -- queued, running, completed
+    language TEXT,                   -- Requested language, NULL = auto-detect
+    source TEXT NOT NULL,            -- archive or manifest
+    work_dir TEXT,                   -- Extracted archive (deleted when the job ends)
+    total INTEGER NOT NULL,
+    active_seconds REAL NOT NULL DEFAULT 0,  -- Processing time, summed across restarts
+    audio_seconds REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE TABLE IF NOT EXISTS items (
+    job_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    filename TEXT NOT NULL,
+    path TEXT NOT NULL,
+    status TEXT NOT NULL,            -- queued, running, done, failed
+    audio_hash TEXT,
+    result TEXT,                     -- JSON AnalysisResponse
+    error TEXT,
+    elapsed REAL,                    -- Seconds from batch start to this result
+    attempts INTEGER NOT NULL DEFAULT 0,  -- Times claimed by a batch
+    PRIMARY KEY (job_id, idx)
+);
+CREATE INDEX IF NOT EXISTS items_by_status ON items (job_id, status, idx);
+"""
+
+# Archive members that are OS metadata, not recordings
+_SKIPPED_PREFIXES = ("__MACOSX/", "._", ".")
+
+
+@dataclass
+class BatchItem:
+    """One recording of a job"""
+    index: int
+    filename: str
+    path: str
+
+
+@dataclass
+class BatchJob:
+    """A job row plus its per-status file counts"""
+    job_id: str
+    status: str
+    language: Optional[str]
+    source: str
+    work_dir: Optional[str]
+    total: int
+    active_seconds: float
+    audio_seconds: float
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+    counts: Dict[str, int]
+
+    def progress(self) -> Dict:
+        """Status, counts, throughput and ETA for the API"""
+        done = self.counts.get("done", 0)
+        failed = self.counts.get("failed", 0)
+        processed = done + failed
+        remaining = self.total - processed
+        rate = processed / self.active_seconds if self.active_seconds > 0 else 0.0
+        return {
+            "job_id": self.job_id,
+            "status": self.status,
+            "language": self.language,
+            "source": self.source,
+            "total": self.total,
+            "done": done,
+            "failed": failed,
+            "pending": remaining,
+            "progress": round(processed / self.total, 4) if self.total else 1.0,
+            "processing_seconds": round(self.active_seconds, 2),
+            "audio_seconds": round(self.audio_seconds, 2),
+            "calls_per_hour": round(rate * 3600, 1),
+            "eta_seconds": round(remaining / rate, 1) if rate and remaining else None,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class BatchJobStore:
+    """
+    SQLite-backed job queue and result store.
+
+    Args:
+        db_path: Database file (created if missing)
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=10.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = [row[1] for row in self._conn.execute("PRAGMA table_info(items)")]
+        if "attempts" not in columns:
+            # Databases created before attempts were counted
+            with self._conn:
+                self._conn.execute("ALTER TABLE items ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        logger.info(f"📦 Batch job store ready: {self.db_path}")
+
+    def create_job(
+        self,
+        job_id: str,
+        items: List[Tuple[str, str, Optional[str]]],
+        language: Optional[str],
+        source: str,
+        work_dir: Optional[str] = None,
+    ):
+        """
+        Queue a job.
+
+        Args:
+            items: (filename, path, error) per file; files with an error
+                   (e.g. too large to extract) are recorded as failed
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, status, language, source, work_dir, total, created_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?, ?)",
+                (job_id, language, source, work_dir, len(items), time.time()),
+            )
+            self._conn.executemany(
+                "INSERT INTO items (job_id, idx, filename, path, status, error) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (job_id, index, filename, path, "failed" if error else "queued", error)
+                    for index, (filename, path, error) in enumerate(items)
+                ),
+            )
+
+    def get_job(self, job_id: str) -> Optional[BatchJob]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            if not row:
+                return None
+            counts = dict(self._conn.execute(
+                "SELECT status, COUNT(*) FROM items WHERE job_id = ? GROUP BY status", (job_id,)
+            ).fetchall())
+        return BatchJob(*row, counts=counts)
+
+    def list_jobs(self, limit: int = 50) -> List[BatchJob]:
+        """Most recent jobs first"""
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT job_id FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+            )]
+        return [job for job in map(self.get_job, ids) if job]
+
+    def next_job(self) -> Optional[BatchJob]:
+        """Oldest job that still has work"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT job_id FROM jobs WHERE status IN ('queued', 'running') "
+                "ORDER BY created_at LIMIT 1"
+            ).fetchone()
+        return self.get_job(row[0]) if row else None
+
+    def claim_items(self, job_id: str, count: int) -> List[BatchItem]:
+        """
+        Mark the next count queued files as running and return them.
+
+        A file that was already claimed by a batch that failed is claimed
+        on its own, so the error is pinned on the file that causes it.
+        """
+        with self._lock, self._conn:
+            # Write lock before the SELECT: another process sharing the
+            # database cannot claim the same files in between
+            self._conn.execute("BEGIN IMMEDIATE")
+            rows = self._conn.execute(
+                "SELECT idx, filename, path, attempts FROM items WHERE job_id = ? AND status = 'queued' "
+                "ORDER BY idx LIMIT ?",
+                (job_id, count),
+            ).fetchall()
+            if rows and rows[0][3] > 0:
+                rows = rows[:1]
+            else:
+                rows = list(itertools.takewhile(lambda row: row[3] == 0, rows))
+            if rows:
+                self._conn.executemany(
+                    "UPDATE items SET status = 'running', attempts = attempts + 1 "
+                    "WHERE job_id = ? AND idx = ?",
+                    ((job_id, row[0]) for row in rows),
+                )
+                self._conn.execute(
+                    "UPDATE jobs SET status = 'running', started_at = COALESCE(started_at, ?) "
+                    "WHERE job_id = ?",
+                    (time.time(), job_id),
+                )
+        return [BatchItem(*row[:3]) for row in rows]
+
+    def complete_item(self, job_id: str, index: int, audio_hash: str, result: Dict, elapsed: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE items SET status = 'done', audio_hash = ?, result = ?, error = NULL, elapsed = ? "
+                "WHERE job_id = ? AND idx = ?",
+                (audio_hash, json.dumps(result, ensure_ascii=False), elapsed, job_id, index),
+            )
+
+    def fail_item(
+        self, job_id: str, index: int, error: str, elapsed: float, audio_hash: Optional[str] = None
+    ):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE items SET status = 'failed', audio_hash = ?, error = ?, elapsed = ? "
+                "WHERE job_id = ? AND idx = ?",
+                (audio_hash, error, elapsed, job_id, index),
+            )
+
+    def add_progress(self, job_id: str, active_seconds: float, audio_seconds: float):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET active_seconds = active_seconds + ?, audio_seconds = audio_seconds + ? "
+                "WHERE job_id = ?",
+                (active_seconds, audio_seconds, job_id),
+            )
+
+    def finish_job(self, job_id: str) -> Optional[str]:
+        """Mark a job completed; returns its work directory for cleanup"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT work_dir FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            self._conn.execute(
+                "UPDATE jobs SET status = 'completed', finished_at = ? WHERE job_id = ?",
+                (time.time(), job_id),
+            )
+        return row[0] if row else None
+
+    def delete_job(self, job_id: str) -> Tuple[bool, Optional[str]]:
+        """Remove a job and its results; returns (existed, work_dir)"""
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT work_dir FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+            self._conn.execute("DELETE FROM items WHERE job_id = ?", (job_id,))
+            self._conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+        return (True, row[0]) if row else (False, None)
+
+    def release_items(
+        self, job_id: str, indexes: List[int], error: str, max_attempts: Optional[int] = None
+    ) -> Tuple[int, int]:
+        """
+        Put the unfinished files of an interrupted batch back in the queue.
+
+        Args:
+            indexes: The batch's files (ones already done or failed are kept)
+            error: Why the batch stopped, recorded on files that give up
+            max_attempts: Files claimed this many times are marked failed;
+                          None = the batch never got to run (e.g. Whisper
+                          not loaded) and the attempt is not counted
+
+        Returns:
+            Tuple of (requeued, failed)
+        """
+        in_batch = f"job_id = ? AND status = 'running' AND idx IN ({','.join('?' * len(indexes))})"
+        with self._lock, self._conn:
+            failed = 0
+            if max_attempts is None:
+                requeued = self._conn.execute(
+                    f"UPDATE items SET status = 'queued', attempts = MAX(attempts - 1, 0) WHERE {in_batch}",
+                    (job_id, *indexes),
+                ).rowcount
+            else:
+                failed = self._conn.execute(
+                    f"UPDATE items SET status = 'failed', error = ? WHERE {in_batch} AND attempts >= ?",
+                    (f"Gave up after {max_attempts} attempts: {error}", job_id, *indexes, max_attempts),
+                ).rowcount
+                requeued = self._conn.execute(
+                    f"UPDATE items SET status = 'queued' WHERE {in_batch}", (job_id, *indexes)
+                ).rowcount
+        return requeued, failed
+
+    def recover(self) -> int:
+        """
+        At startup, after a crash or restart: files that were in flight (in
+        any job) are queued again. Use release_items() while running.
+        """
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE items SET status = 'queued' WHERE status = 'running'"
+            ).rowcount
+
+    def results(
+        self, job_id: str, cursor: int = 0, limit: int = 100, status: Optional[str] = None
+    ) -> Tuple[List[Dict], Optional[int]]:
+        """
+        One page of per-file results in file order.
+
+        Args:
+            cursor: First file index to return (from the previous page)
+            status: Only files with this status (done/failed/queued/running)
+
+        Returns:
+            Tuple of (results, next_cursor or None on the last page)
+        """
+        query = "SELECT idx, filename, status, audio_hash, result, error, elapsed FROM items " \
+                "WHERE job_id = ? AND idx >= ?"
+        params: List = [job_id, cursor]
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        query += " ORDER BY idx LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        next_cursor = rows[limit][0] if len(rows) > limit else None
+        return [
+            {
+                "index": index,
+                "filename": filename,
+                "status": item_status,
+                "audio_hash": audio_hash,
+                "analysis": json.loads(result) if result else None,
+                "error": error,
+                "elapsed_seconds": round(elapsed, 2) if elapsed is not None else None,
+            }
+            for index, filename, item_status, audio_hash, result, error, elapsed in rows[:limit]
+        ], next_cursor
+
+
+# ==================
+# JOB INPUT
+# ==================
+
+
+def new_job_id() -> str:
+    return uuid.uuid4().hex
+
+
+def extract_archive(
+    source: Union[bytes, str],
+    dest_dir: str,
+    max_member_bytes: int,
+    max_files: int,
+    max_total_bytes: int,
+) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    Extract the recordings of a zip or tar(.gz/.bz2/.xz) archive.
+
+    Members are written under generated names (never the archive's own
+    paths), one chunk at a time, as owner-only files. Members that are
+    not audio are skipped; members over max_member_bytes are recorded as
+    failed instead of being extracted. The whole extraction stops once
+    max_total_bytes have been written (compression bombs).
+
+    Returns:
+        (filename, path, error) per recording, in archive order
+
+    Raises:
+        ValueError: Not a zip/tar archive, no recordings, too many files
+                    or too much extracted data
+    """
+    os.makedirs(dest_dir, mode=0o700, exist_ok=True)
+    items: List[Tuple[str, str, Optional[str]]] = []
+    extracted = {"bytes": 0}
+
+    def add(name: str, size: int, open_member):
+        base = name.rsplit("/", 1)[-1]
+        if not base or name.startswith(_SKIPPED_PREFIXES) or base.startswith(_SKIPPED_PREFIXES):
+            return
+        ext = base.rsplit(".", 1)[-1].lower() if "." in base else ""
+        if ext not in AudioProcessor.SUPPORTED_FORMATS:
+            return
+        if len(items) >= max_files:
+            raise ValueError(f"Too many recordings in archive (max {max_files})")
+        path = os.path.join(dest_dir, f"{len(items):06d}.{ext}")
+        error = None
+        if size > max_member_bytes:
+            error = f"File too large. Maximum {max_member_bytes // (1024 * 1024)}MB allowed."
+        else:
+            # Declared sizes can lie; _copy_limited counts the real bytes
+            budget = max_total_bytes - extracted["bytes"]
+            if size <= budget:
+                with open_member() as member:
+                    error, written = _copy_limited(member, path, max_member_bytes, budget)
+                extracted["bytes"] += written
+            if size > budget or extracted["bytes"] > max_total_bytes:
+                raise ValueError(
+                    f"Archive expands to more than {max_total_bytes // (1024 * 1024)}MB of recordings"
+                )
+        items.append((name, path, error))
+
+    try:
+        _extract(source, add)
+    except (zipfile.BadZipFile, tarfile.TarError, EOFError) as e:
+        raise ValueError(f"Corrupt archive: {str(e)}")
+
+    if not items:
+        raise ValueError("No recordings found in archive")
+    return items
+
+
+def _extract(source: Union[bytes, str], add):
+    """Call add(name, size, open_member) for every regular file of the archive"""
+    with _open(source) as f:
+        if zipfile.is_zipfile(f):
+            f.seek(0)
+            with zipfile.ZipFile(f) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        add(info.filename, info.file_size, lambda info=info: archive.open(info))
+        else:
+            f.seek(0)
+            try:
+                archive = tarfile.open(fileobj=f, mode="r:*")
+            except tarfile.TarError:
+                raise ValueError("Unsupported archive. Upload a .zip or .tar(.gz) of recordings.")
+            with archive:
+                for info in archive:
+                    if info.isfile():
+                        add(info.name, info.size, lambda info=info: archive.extractfile(info))
+
+
+def _open(source: Union[bytes, str]) -> BinaryIO:
+    return BytesIO(source) if isinstance(source, (bytes, bytearray)) else open(source, "rb")
+
+
+def _copy_limited(member: BinaryIO, path: str, limit: int, budget: int) -> Tuple[Optional[str], int]:
+    """
+    Copy one member to a private file.
+
+    Args:
+        limit: Largest accepted member
+        budget: Bytes the whole extraction may still write
+
+    Returns:
+        Tuple of (error message if the member outgrew limit, bytes
+        written). Past the budget, copying stops and the count is
+        budget + 1 so the caller can tell.
+    """
+    written = 0
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as out:
+        for chunk in iter(lambda: member.read(CHUNK_SIZE), b""):
+            written += len(chunk)
+            if written > limit or written > budget:
+                break
+            out.write(chunk)
+    if written > budget:
+        os.unlink(path)
+        return None, budget + 1
+    if written > limit:
+        os.unlink(path)
+        return f"File too large. Maximum {limit // (1024 * 1024)}MB allowed.", 0
+    return None, written
+
+
+def resolve_manifest(
+    files: List[str], input_dir: str, max_files: int
+) -> List[Tuple[str, str, Optional[str]]]:
+    """
+    Map manifest entries to files under input_dir.
+
+    Raises:
+        ValueError: Too many files, or an entry points outside input_dir
+    """
+    if not files:
+        raise ValueError("Manifest lists no files")
+    if len(files) > max_files:
+        raise ValueError(f"Too many files in manifest (max {max_files})")
+
+    root = os.path.realpath(input_dir)
+    items = []
+    for name in files:
+        path = os.path.realpath(os.path.join(root, name))
+        if os.path.commonpath([root, path]) != root:
+            raise ValueError(f"Manifest entry outside the batch input directory: {name}")
+        items.append((name, path, None))
+    return items
+
+
+# ==================
+# RUNNER
+# ==================
+
+
+def _is_load_error(error: BaseException) -> bool:
+    """
+    True if the model or a stage pool could not take work at all (Whisper
+    not loaded, a broken or busy pool): no file is to blame, so the batch
+    is retried after a back-off without counting an attempt.
+    """
+    return isinstance(error, (ModelLoadError, BrokenExecutor, PoolBusyError))
+
+
+def _is_decode_error(error: BaseException) -> bool:
+    """
+    True if decoding failed because of the recording itself (the file is
+    marked failed). Anything else (a broken or busy pool, cancellation)
+    interrupts the batch and leaves its files queued.
+    """
+    if _is_load_error(error):
+        return False
+    return isinstance(error, (ValueError, RuntimeError, OSError))
+
+
+class BatchRunner:
+    """
+    Background worker that processes queued jobs in batches.
+
+    Args:
+        store: Job queue and result store
+        executors: The app's stage pools
+        speech_service: Whisper service (batched language ID + transcription)
+        text_pipeline: Text analyzers, run exactly as for re-scoring
+        batch_size: Files processed together per step
+        result_cache: Reused for recordings analyzed before (optional)
+        transcript_store: Reused and filled like /analyze-call (optional)
+        max_attempts: Batches a file may be part of before it is marked
+                      failed (load errors do not count)
+        retry_seconds: Back-off after a load error
+    """
+
+    def __init__(
+        self,
+        store: BatchJobStore,
+        executors: AnalysisExecutors,
+        speech_service: SpeechToTextService,
+        text_pipeline: TextAnalysisPipeline,
+        batch_size: int = 8,
+        result_cache: Optional[ResultCache] = None,
+        transcript_store: Optional[TranscriptStore] = None,
+        max_attempts: int = 3,
+        retry_seconds: float = 30.0,
+    ):
+        self.store = store
+        self.executors = executors
+        self.speech_service = speech_service
+        self.text_pipeline = text_pipeline
+        self.batch_size = max(1, batch_size)
+        self.result_cache = result_cache
+        self.transcript_store = transcript_store
+        self.max_attempts = max(1, max_attempts)
+        self.retry_seconds = retry_seconds
+        self.current_job: Optional[str] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._cpu_slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Resume interrupted jobs and start the worker (call on the event loop)"""
+        recovered = self.store.recover()
+        if recovered:
+            logger.info(f"📦 Re-queued {recovered} batch file(s) interrupted by a restart")
+        self._wake = asyncio.Event()
+        # At most half of the CPU pool's slots, so interactive requests still get in
+        self._cpu_slots = asyncio.Semaphore(max(1, self.executors.cpu.max_pending // 2))
+        self._task = asyncio.create_task(self._run())
+
+    def notify(self):
+        """A job was queued"""
+        if self._wake:
+            self._wake.set()
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> Dict:
+        return {"running": self._task is not None and not self._task.done(),
+                "current_job": self.current_job, "batch_size": self.batch_size}
+
+    async def _run(self):
+        while True:
+            self._wake.clear()
+            job = await asyncio.to_thread(self.store.next_job)
+            if job is None:
+                await self._wake.wait()
+                continue
+            try:
+                await self._run_job(job)
+            except Exception as e:
+                # The batch's files are back in the queue (see _run_job)
+                logger.error(f"❌ Batch job {job.job_id} interrupted: {str(e)}", exc_info=True)
+                if _is_load_error(e):
+                    # e.g. Whisper failed to load: leave the job queued and retry later
+                    await asyncio.sleep(self.retry_seconds)
+            finally:
+                self.current_job = None
+
+    async def _run_job(self, job: BatchJob):
+        self.current_job = job.job_id
+        logger.info(f"📦 Batch job {job.job_id}: {job.total} files ({job.counts})")
+        while True:
+            items = await asyncio.to_thread(self.store.claim_items, job.job_id, self.batch_size)
+            if not items:
+                break
+            started = time.perf_counter()
+            try:
+                audio_seconds = await self._run_batch(job, items, started)
+            except Exception as e:
+                requeued, failed = await asyncio.to_thread(
+                    self.store.release_items,
+                    job.job_id,
+                    [item.index for item in items],
+                    str(e),
+                    None if _is_load_error(e) else self.max_attempts,
+                )
+                if failed:
+                    logger.warning(
+                        f"⚠️ Batch job {job.job_id}: {failed} file(s) failed after "
+                        f"{self.max_attempts} attempts, {requeued} re-queued"
+                    )
+                raise
+            await asyncio.to_thread(
+                self.store.add_progress, job.job_id, time.perf_counter() - started, audio_seconds
+            )
+
+        work_dir = await asyncio.to_thread(self.store.finish_job, job.job_id)
+        if work_dir:
+            await asyncio.to_thread(shutil.rmtree, work_dir, ignore_errors=True)
+        finished = await asyncio.to_thread(self.store.get_job, job.job_id)
+        if finished:
+            progress = finished.progress()
+            logger.info(
+                f"✅ Batch job {job.job_id} complete: {progress['done']} done, "
+                f"{progress['failed']} failed, {progress['calls_per_hour']} calls/hour"
+            )
+
+    async def _cpu(self, func, *args):
+        async with self._cpu_slots:
+            return await self.executors.cpu.run(func, *args)
+
+    async def _run_batch(self, job: BatchJob, items: List[BatchItem], started: float) -> float:
+        """
+        Analyze one batch of files; returns the seconds of audio processed.
+
+        Files fail only for errors of their own (undecodable, wrong
+        language). Anything else (Whisper not loaded, broken pool, a
+        transcription error) is raised, so _run_job() puts the batch's
+        files back in the queue.
+        SQLite and cache I/O runs in threads, off the event loop.
+        """
+
+        def elapsed() -> float:
+            return time.perf_counter() - started
+
+        async def fail(item: BatchItem, error: Exception, audio_hash: Optional[str] = None):
+            logger.warning(f"⚠️ Batch file {item.filename} failed: {str(error)}")
+            await asyncio.to_thread(
+                self.store.fail_item, job.job_id, item.index, str(error), elapsed(), audio_hash
+            )
+
+        async def complete(item: BatchItem, audio_hash: str, result: Dict):
+            await asyncio.to_thread(
+                self.store.complete_item, job.job_id, item.index, audio_hash, result, elapsed()
+            )
+
+        # 1. Decode every file in parallel (CPU pool), with its voice
+        #    features in the same worker call so the samples are pickled once
+        decoded = await asyncio.gather(
+            *(self._cpu(decode_file_with_voice, item.path, item.filename) for item in items),
+            return_exceptions=True,
+        )
+
+        model_size = self.speech_service.model_size
+        pending = []  # (item, audio_hash, audio, duration, cached transcript)
+        voice_results = {}  # item index -> voice features (None if they failed)
+        audio_seconds = 0.0
+        for outcome in decoded:
+            if isinstance(outcome, BaseException) and not _is_decode_error(outcome):
+                raise outcome
+        for item, outcome in zip(items, decoded):
+            if isinstance(outcome, BaseException):
+                await fail(item, outcome)
+                continue
+            audio_hash, audio, duration, voice_analysis = outcome
+            voice_results[item.index] = voice_analysis
+            audio_seconds += duration
+            if self.result_cache and self.result_cache.enabled:
+                cached = await asyncio.to_thread(
+                    self.result_cache.get, ResultCache.make_key(audio_hash, job.language, model_size)
+                )
+                if cached is not None:
+                    await complete(item, audio_hash, cached)
+                    continue
+            cached_transcript = None
+            if self.transcript_store:
+                cached_transcript = await asyncio.to_thread(
+                    self.transcript_store.get, audio_hash, model_size
+                )
+            pending.append((item, audio_hash, audio, duration, cached_transcript))
+
+        # 2. Language ID for every file in one forward pass, then the
+        #    windows of all files share the Whisper replicas
+        to_transcribe = [entry for entry in pending if entry[4] is None]
+        transcripts = {}
+        if to_transcribe:
+            # Only validation errors (ValueError) fail the files; anything
+            # else is the model's problem and is raised (see above)
+            try:
+                languages = await self.executors.whisper.run(
+                    self.speech_service.detect_languages, [entry[2] for entry in to_transcribe]
+                )
+            except ValueError as e:
+                for entry in to_transcribe:
+                    await fail(entry[0], e, entry[1])
+                to_transcribe, languages = [], []
+            accepted = []
+            for entry, (language, _) in zip(to_transcribe, languages):
+                if job.language and language != job.language:
+                    await fail(entry[0], ValueError(
+                        f"Language mismatch: spoken language is {language}, job language is {job.language}"
+                    ), entry[1])
+                else:
+                    accepted.append((entry, language))
+            if accepted:
+                try:
+                    results = await self.executors.whisper.run(
+                        self.speech_service.transcribe_batch,
+                        [entry[2] for entry, _ in accepted],
+                        [language for _, language in accepted],
+                    )
+                except ValueError as e:
+                    for entry, _ in accepted:
+                        await fail(entry[0], e, entry[1])
+                    results = []
+                    accepted = []
+                for (entry, _), transcript in zip(accepted, results):
+                    transcripts[entry[0].index] = transcript
+                    if self.transcript_store:
+                        await asyncio.to_thread(
+                            self.transcript_store.put, entry[1], model_size, transcript, entry[3]
+                        )
+
+        for item, audio_hash, _, _, cached_transcript in pending:
+            if cached_transcript:
+                if job.language and cached_transcript.transcript.language != job.language:
+                    await fail(item, ValueError(
+                        f"Language mismatch: spoken language is {cached_transcript.transcript.language}, "
+                        f"job language is {job.language}"
+                    ), audio_hash)
+                else:
+                    transcripts[item.index] = cached_transcript.transcript
+
+        # 3. Text analysis (text pool) in parallel; voice features came
+        #    back with the decode
+        async def analyze(item: BatchItem, audio_hash: str, duration: float):
+            transcript = transcripts[item.index]
+            voice_analysis = voice_results[item.index]
+            if voice_analysis is None:
+                voice_analysis = dict(VOICE_FALLBACK)
+            elif self.transcript_store:
+                await asyncio.to_thread(
+                    self.transcript_store.set_voice_analysis, audio_hash, model_size, voice_analysis
+                )
+            try:
+                analysis = await self.executors.text.run(
+                    self.text_pipeline.rescore,
+                    transcript.text, transcript.language, duration, voice_analysis, transcript.segments,
+                )
+            except Exception as e:
+                await fail(item, e, audio_hash)
+                return
+            result = analysis.model_dump(mode="json")
+            await complete(item, audio_hash, result)
+            if self.result_cache and self.result_cache.enabled:
+                await asyncio.to_thread(
+                    self.result_cache.put, ResultCache.make_key(audio_hash, job.language, model_size), result
+                )
+
+        await asyncio.gather(*(
+            analyze(item, audio_hash, duration)
+            for item, audio_hash, _, duration, _ in pending
+            if item.index in transcripts
+        ))
+        return audio_seconds
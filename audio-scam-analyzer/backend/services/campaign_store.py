@@ -0,0 +1,247 @@
+"""
+Campaign Store
+==============
+File-backed catalog of known scam campaigns, shared by every worker.
+
+The catalog lives in a single SQLite file that each worker process opens
+READ-ONLY with memory-mapped I/O, so campaign records are served from the
+OS page cache instead of being copied into every process. Workers only keep
+the term -> campaign inverted index in memory (see KnownScamDatabase).
+
+- Built from a JSON seed (data/scam_campaigns.json) on first start
+- add_campaign() writes through a short-lived read-write connection
+- Rebuilding the file (python -m services.campaign_store build) swaps it
+  atomically; running workers pick the new catalog up without a restart
+
+Usage (from the backend directory):
+    python -m services.campaign_store build [--seed catalog.json] [--db path]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+DEFAULT_DB_PATH = DATA_DIR / "scam_campaigns.db"
+DEFAULT_SEED_PATH = DATA_DIR / "scam_campaigns.json"
+
+MMAP_SIZE = 256 * 1024 * 1024  # Upper bound; only touched pages are mapped
+_QUERY_CHUNK = 500  # Stay well under SQLite's bound-parameter limit
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS campaigns (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,  -- Catalog order, never reused
+    id TEXT NOT NULL UNIQUE,
+    severity TEXT NOT NULL,
+    record TEXT NOT NULL                    -- Full campaign as JSON
+);
+CREATE INDEX IF NOT EXISTS idx_campaigns_severity ON campaigns (severity);
+"""
+
+
+def load_seed(seed_path: Path) -> List[Dict]:
+    """Read a JSON catalog: a list of campaigns, each with an "id" field"""
+    with open(seed_path, "r", encoding="utf-8") as f:
+        campaigns = json.load(f)
+    if not isinstance(campaigns, list):
+        raise ValueError(f"Campaign seed must be a JSON list: {seed_path}")
+    return campaigns
+
+
+def _insert(conn: sqlite3.Connection, campaign: Dict) -> bool:
+    cursor = conn.execute(
+        "INSERT OR IGNORE INTO campaigns (id, severity, record) VALUES (?, ?, ?)",
+        (
+            campaign["id"],
+            campaign.get("severity", ""),
+            json.dumps(campaign, ensure_ascii=False),
+        ),
+    )
+    return cursor.rowcount == 1
+
+
+class CampaignStore:
+    """
+    Read-mostly SQLite campaign catalog.
+
+    Args:
+        db_path: Catalog file (built from seed_path if it does not exist)
+        seed_path: JSON catalog used to create a missing database
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        seed_path: Optional[Path] = None,
+    ):
+        self.db_path = Path(db_path or DEFAULT_DB_PATH)
+        self.seed_path = Path(seed_path or DEFAULT_SEED_PATH)
+
+        if not self.db_path.exists():
+            self.build(self.db_path, load_seed(self.seed_path))
+
+        # One read connection per process; sqlite3 objects are not
+        # thread-safe, so queries are serialized (they are all tiny)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._file_id: Optional[Tuple[int, int]] = None
+        self._open()
+
+    # ==================
+    # BUILDING
+    # ==================
+
+    @staticmethod
+    def build(db_path: Path, campaigns: Iterable[Dict]) -> int:
+        """
+        Write a fresh catalog file and atomically swap it into place.
+        Readers holding the old file keep a consistent view until they reload.
+
+        Returns:
+            Number of campaigns written
+        """
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = db_path.with_name(f"{db_path.name}.{os.getpid()}.tmp")
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+        conn = sqlite3.connect(str(tmp_path))
+        try:
+            conn.executescript(_SCHEMA)
+            with conn:
+                count = sum(_insert(conn, campaign) for campaign in campaigns)
+        finally:
+            conn.close()
+
+        os.replace(tmp_path, db_path)
+        logger.info(f"📚 Campaign store built: {count} campaigns -> {db_path}")
+        return count
+
+    # ==================
+    # CONNECTION
+    # ==================
+
+    def _open(self):
+        """(Re)open the current catalog file read-only"""
+        if self._conn is not None:
+            self._conn.close()
+        uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+        self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        self._file_id = self._stat_file_id()
+
+    def _stat_file_id(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.db_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def version(self) -> Tuple:
+        """
+        Cheap change token: differs whenever the file is replaced or another
+        connection (in any process) commits to it.
+        """
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        return (self._file_id, data_version)
+
+    def reopen_if_replaced(self) -> bool:
+        """Switch to a rebuilt catalog file. Returns True if it was replaced."""
+        file_id = self._stat_file_id()
+        if file_id is None or file_id == self._file_id:
+            return False
+        with self._lock:
+            self._open()
+        logger.info(f"🔄 Campaign store file replaced, reopened {self.db_path}")
+        return True
+
+    # ==================
+    # QUERIES
+    # ==================
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM campaigns").fetchone()[0]
+
+    def iter_campaigns(self, after_seq: int = 0) -> Iterator[Tuple[int, Dict]]:
+        """
+        Yield (seq, campaign) in catalog order for campaigns added after
+        after_seq. Used to build and extend the in-memory term index.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, record FROM campaigns WHERE seq > ? ORDER BY seq",
+                (after_seq,),
+            ).fetchall()
+        for seq, record in rows:
+            yield seq, json.loads(record)
+
+    def get_many(self, seqs: Iterable[int]) -> Dict[int, Dict]:
+        """Fetch full campaign records by sequence number"""
+        seqs = list(seqs)
+        found: Dict[int, Dict] = {}
+        with self._lock:
+            for i in range(0, len(seqs), _QUERY_CHUNK):
+                chunk = seqs[i:i + _QUERY_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                for seq, record in self._conn.execute(
+                    f"SELECT seq, record FROM campaigns WHERE seq IN ({placeholders})",
+                    chunk,
+                ):
+                    found[seq] = json.loads(record)
+        return found
+
+    def ids(self) -> List[str]:
+        """Campaign IDs in catalog order"""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT id FROM campaigns ORDER BY seq")]
+
+    def count_by_severity(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(
+                self._conn.execute("SELECT severity, COUNT(*) FROM campaigns GROUP BY severity")
+            )
+
+    # ==================
+    # WRITES
+    # ==================
+
+    def add(self, campaign: Dict) -> bool:
+        """
+        Persist a new campaign. Returns False if the ID already exists.
+        Every worker sees the addition on its next reload check.
+        """
+        conn = sqlite3.connect(str(self.db_path), timeout=10.0)
+        try:
+            with conn:
+                return _insert(conn, campaign)
+        finally:
+            conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage the scam campaign store")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    build = subcommands.add_parser("build", help="Rebuild the store from a JSON catalog")
+    build.add_argument("--seed", type=Path, default=DEFAULT_SEED_PATH)
+    build.add_argument("--db", type=Path, default=Path(os.getenv("SCAM_DB_PATH") or DEFAULT_DB_PATH))
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        count = CampaignStore.build(args.db, load_seed(args.seed))
+        print(f"✅ {count} campaigns written to {args.db}")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
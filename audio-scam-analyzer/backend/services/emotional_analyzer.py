@@ -9,10 +9,11 @@ Scammers exhibit patterns like:
 - False authority tone
 """
 
-import re
 import logging
-from typing import Dict, List, Tuple
-from collections import Counter
+from typing import Dict, List, Tuple, Optional
+
+from services.lexicon import LexiconIndex
+from utils.constants import EMOTION_KEYWORDS, TACTIC_KEYWORDS
 
 logger = logging.getLogger(__name__)
 
@@ -23,60 +24,35 @@ class EmotionalToneAnalyzer:
     def __init__(self):
         """Initialize emotional tone analyzer"""
         logger.info("EmotionalToneAnalyzer initialized")
-        self.emotion_keywords = {
-            "urgency": [
-                "immediately", "right now", "urgent", "emergency", "asap",
-                "quickly", "fast", "rush", "hurry", "now", "quickly",
-                "don't delay", "without delay", "instantly", "immediately"
-            ],
-            "fear": [
-                "danger", "risk", "threat", "problem", "issue", "worry",
-                "concerned", "afraid", "scared", "terrible", "horrible",
-                "disastrous", "blocked", "frozen", "account suspended",
-                "fraud alert", "unauthorized", "compromised", "hacked"
-            ],
-            "authority": [
-                "police", "fbi", "tax", "government", "official",
-                "representative", "authority", "director", "manager",
-                "agent", "officer", "department", "agency", "investigation"
-            ],
-            "flattery": [
-                "trust", "friend", "help", "support", "care", "protect",
-                "ensure", "secure", "safe", "verified", "legitimate",
-                "professional", "experienced", "reliable"
-            ],
-            "urgency_phrases": [
-                "act now", "limited time", "deadline", "time sensitive",
-                "expires", "expiring", "valid until", "before",
-                "hurry", "last chance", "final notice"
-            ]
-        }
+        self.emotion_keywords = EMOTION_KEYWORDS
 
-    def analyze_tone(self, text: str) -> Dict:
+    def analyze_tone(self, text: str, index: Optional[LexiconIndex] = None) -> Dict:
         """
         Analyze emotional tone and psychological tactics.
         
         Args:
             text: Transcribed call text
+            index: Shared LexiconIndex for this transcript (built if omitted)
             
         Returns:
             Dict with emotional tone analysis
         """
-        text_lower = text.lower()
+        index = index or LexiconIndex(text)
+        word_count = index.word_count
         
         # Detect emotions
         emotions = {}
-        for emotion_type, keywords in self.emotion_keywords.items():
-            emotion_matches = self._detect_emotion_keywords(text_lower, keywords)
+        for emotion_type in self.emotion_keywords:
+            emotion_matches = self._detect_emotion_keywords(index, emotion_type)
             emotions[emotion_type] = {
                 "detected": len(emotion_matches) > 0,
                 "count": len(emotion_matches),
                 "keywords": emotion_matches[:5],  # Top 5
-                "intensity": self._calculate_emotion_intensity(len(emotion_matches), text),
+                "intensity": self._calculate_emotion_intensity(len(emotion_matches), word_count),
             }
         
         # Psychological tactics score
-        tactics_score = self._analyze_psychological_tactics(text_lower)
+        tactics_score = self._analyze_psychological_tactics(index)
         
         # Overall emotional tone assessment
         tone_assessment = self._assess_overall_tone(emotions, tactics_score)
@@ -92,19 +68,12 @@ class EmotionalToneAnalyzer:
         logger.info(f"Tone analysis completed: manipulation_risk={analysis['manipulation_risk']}")
         return analysis
 
-    def _detect_emotion_keywords(self, text: str, keywords: List[str]) -> List[str]:
-        """Detect emotion keywords in text"""
-        detected = []
-        for keyword in keywords:
-            # Use word boundary matching
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            matches = re.findall(pattern, text)
-            detected.extend(matches)
-        return list(set(detected))  # Remove duplicates
-
-    def _calculate_emotion_intensity(self, match_count: int, text: str) -> float:
+    def _detect_emotion_keywords(self, index: LexiconIndex, emotion_type: str) -> List[str]:
+        """Detect emotion keywords in text (whole-word matches, unique)"""
+        return index.words(f"emotion_{emotion_type}")
+
+    def _calculate_emotion_intensity(self, match_count: int, word_count: int) -> float:
         """Calculate intensity of emotion (0-1)"""
-        word_count = len(text.split())
         if word_count == 0:
             return 0.0
         
@@ -112,24 +81,27 @@ class EmotionalToneAnalyzer:
         intensity = min((match_count / word_count) * 100, 1.0)
         return float(intensity)
 
-    def _analyze_psychological_tactics(self, text: str) -> Dict:
+    def _analyze_psychological_tactics(self, index: LexiconIndex) -> Dict:
         """Analyze psychological manipulation tactics"""
         tactics = {
-            "authority_appeal": self._detect_authority_appeal(text),
-            "fear_appeal": self._detect_fear_appeal(text),
-            "scarcity_appeal": self._detect_scarcity_appeal(text),
-            "social_proof": self._detect_social_proof(text),
-            "false_urgency": self._detect_false_urgency(text),
-            "reciprocity_appeal": self._detect_reciprocity_appeal(text),
+            "authority_appeal": self._detect_authority_appeal(index),
+            "fear_appeal": self._detect_fear_appeal(index),
+            "scarcity_appeal": self._detect_scarcity_appeal(index),
+            "social_proof": self._detect_social_proof(index),
+            "false_urgency": self._detect_false_urgency(index),
+            "reciprocity_appeal": self._detect_reciprocity_appeal(index),
         }
         
         return tactics
 
-    def _detect_authority_appeal(self, text: str) -> Dict:
+    @staticmethod
+    def _count_tactic_cues(index: LexiconIndex, tactic: str) -> int:
+        """Number of cue words for a tactic present anywhere in the text"""
+        return sum(1 for cue in TACTIC_KEYWORDS[tactic] if index.contains(cue))
+
+    def _detect_authority_appeal(self, index: LexiconIndex) -> Dict:
         """Detect appeal to authority tactic"""
-        authority_keywords = ["said", "told me", "reported", "confirmed", "verified",
-                            "official", "department", "government"]
-        count = sum(1 for keyword in authority_keywords if keyword in text)
+        count = self._count_tactic_cues(index, "authority_appeal")
         
         return {
             "detected": count > 2,
@@ -137,11 +109,9 @@ class EmotionalToneAnalyzer:
             "risk_level": "HIGH" if count > 4 else "MEDIUM" if count > 2 else "LOW"
         }
 
-    def _detect_fear_appeal(self, text: str) -> Dict:
+    def _detect_fear_appeal(self, index: LexiconIndex) -> Dict:
         """Detect fear-based appeal"""
-        fear_words = ["danger", "risk", "threat", "problem", "fraud", "blocked",
-                     "suspended", "frozen", "unauthorized", "hacked"]
-        count = sum(1 for word in fear_words if word in text)
+        count = self._count_tactic_cues(index, "fear_appeal")
         
         return {
             "detected": count > 2,
@@ -149,11 +119,9 @@ class EmotionalToneAnalyzer:
             "risk_level": "CRITICAL" if count > 5 else "HIGH" if count > 2 else "LOW"
         }
 
-    def _detect_scarcity_appeal(self, text: str) -> Dict:
+    def _detect_scarcity_appeal(self, index: LexiconIndex) -> Dict:
         """Detect scarcity/urgency appeal"""
-        scarcity_words = ["limited", "only", "last", "expires", "deadline",
-                         "hurry", "immediately", "now", "don't wait"]
-        count = sum(1 for word in scarcity_words if word in text)
+        count = self._count_tactic_cues(index, "scarcity_appeal")
         
         return {
             "detected": count > 1,
@@ -161,11 +129,9 @@ class EmotionalToneAnalyzer:
             "risk_level": "HIGH" if count > 3 else "MEDIUM" if count > 1 else "LOW"
         }
 
-    def _detect_social_proof(self, text: str) -> Dict:
+    def _detect_social_proof(self, index: LexiconIndex) -> Dict:
         """Detect false social proof tactic"""
-        proof_words = ["everyone", "many", "others", "others are", "like you",
-                      "similar situation", "most people"]
-        count = sum(1 for word in proof_words if word in text)
+        count = self._count_tactic_cues(index, "social_proof")
         
         return {
             "detected": count > 1,
@@ -173,13 +139,9 @@ class EmotionalToneAnalyzer:
             "risk_level": "MEDIUM" if count > 2 else "LOW"
         }
 
-    def _detect_false_urgency(self, text: str) -> Dict:
+    def _detect_false_urgency(self, index: LexiconIndex) -> Dict:
         """Detect false urgency tactic"""
-        urgency_phrases = [
-            "immediately", "right now", "urgently", "asap",
-            "don't delay", "act now", "time-sensitive"
-        ]
-        count = sum(1 for phrase in urgency_phrases if phrase in text)
+        count = self._count_tactic_cues(index, "false_urgency")
         
         return {
             "detected": count > 0,
@@ -187,11 +149,9 @@ class EmotionalToneAnalyzer:
             "risk_level": "HIGH" if count > 2 else "MEDIUM" if count > 0 else "LOW"
         }
 
-    def _detect_reciprocity_appeal(self, text: str) -> Dict:
+    def _detect_reciprocity_appeal(self, index: LexiconIndex) -> Dict:
         """Detect reciprocity/obligation appeal"""
-        reciprocity_words = ["help", "favor", "need", "assist", "support",
-                            "protect", "ensure", "secure"]
-        count = sum(1 for word in reciprocity_words if word in text)
+        count = self._count_tactic_cues(index, "reciprocity_appeal")
         
         return {
             "detected": count > 2,
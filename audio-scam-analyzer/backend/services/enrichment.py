@@ -0,0 +1,141 @@
+"""
+Deferred Enrichment
+===================
+Fast-verdict support for /analyze-call: when a critical pattern has already
+pinned the risk score at 100, the verdict cannot change, so it is returned
+right away and the enrichment analyses (voice, emotions, entities, known
+scams) finish in the background.
+
+EnrichmentStore runs those background tasks and keeps their outcome for
+GET /analyze-call/enrichment/{enrichment_id}, which can long-poll until
+the full analysis is ready.
+
+- In memory only, bounded by entry count (oldest finished entries go
+  first) and by a TTL after completion
+- IDs are random tokens, so one caller cannot guess another's results
+
+PRIVACY: Entries hold the derived analysis only, never audio, and expire.
+"""
+
+import asyncio
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Awaitable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+COMPLETE = "complete"
+FAILED = "failed"
+
+
+@dataclass
+class Enrichment:
+    """One background enrichment"""
+    enrichment_id: str
+    status: str = PENDING
+    result: Optional[Dict] = None  # Full AnalysisResponse, JSON-ready
+    error: Optional[str] = None
+    finished_at: Optional[float] = None
+    done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+
+class EnrichmentStore:
+    """
+    Background enrichment tasks and their results.
+
+    Args:
+        max_entries: Entries kept; the oldest finished ones are dropped first
+        ttl_seconds: How long a finished result stays available
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 600.0):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Enrichment]" = OrderedDict()
+        self._tasks: set = set()
+        self._stats = {"started": 0, "completed": 0, "failed": 0, "expired": 0}
+
+    def start(self, work: Awaitable) -> str:
+        """
+        Run work (a coroutine producing the full AnalysisResponse) in the
+        background.
+
+        Returns:
+            enrichment_id for get()/wait()
+        """
+        self._evict()
+        entry = Enrichment(secrets.token_urlsafe(16))
+        self._entries[entry.enrichment_id] = entry
+        self._stats["started"] += 1
+
+        task = asyncio.get_running_loop().create_task(self._run(entry, work))
+        self._tasks.add(task)  # Keep a reference until it finishes
+        task.add_done_callback(self._tasks.discard)
+        return entry.enrichment_id
+
+    async def _run(self, entry: Enrichment, work: Awaitable):
+        try:
+            response = await work
+            entry.result = response.model_dump(mode="json")
+            entry.status = COMPLETE
+            self._stats["completed"] += 1
+        except asyncio.CancelledError:
+            entry.status, entry.error = FAILED, "Server shutting down"
+            self._stats["failed"] += 1
+            raise
+        except Exception as e:
+            logger.error(f"❌ Enrichment {entry.enrichment_id[:8]} failed: {str(e)}", exc_info=True)
+            entry.status, entry.error = FAILED, str(e)[:200]
+            self._stats["failed"] += 1
+        finally:
+            entry.finished_at = time.monotonic()
+            entry.done.set()
+
+    def get(self, enrichment_id: str) -> Optional[Enrichment]:
+        entry = self._entries.get(enrichment_id)
+        if entry and self._expired(entry, time.monotonic()):
+            del self._entries[enrichment_id]
+            self._stats["expired"] += 1
+            return None
+        return entry
+
+    async def wait(self, enrichment_id: str, timeout: float) -> Optional[Enrichment]:
+        """get(), but waits up to timeout seconds for a pending entry to finish"""
+        entry = self.get(enrichment_id)
+        if entry and entry.status == PENDING and timeout > 0:
+            try:
+                await asyncio.wait_for(entry.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return entry
+
+    def cancel_all(self):
+        """Stop pending enrichments (shutdown)"""
+        for task in list(self._tasks):
+            task.cancel()
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "pending": sum(1 for e in self._entries.values() if e.status == PENDING),
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+        }
+
+    def _expired(self, entry: Enrichment, now: float) -> bool:
+        return entry.finished_at is not None and now - entry.finished_at > self.ttl_seconds
+
+    def _evict(self):
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if self._expired(e, now)]:
+            del self._entries[key]
+            self._stats["expired"] += 1
+        # Still full: drop the oldest finished entries (pending ones are
+        # only dropped if nothing else is left, their task still completes)
+        while len(self._entries) >= self.max_entries:
+            oldest = next((k for k, e in self._entries.items() if e.status != PENDING), None)
+            self._entries.pop(oldest if oldest else next(iter(self._entries)))
@@ -9,9 +9,12 @@ This is crucial for understanding what information scammers are targeting.
 
 import re
 import logging
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Optional
 from dataclasses import dataclass
 
+from services.lexicon import LexiconIndex
+from utils.constants import ACCOUNT_TYPES, ENTITY_TRIGGERS
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,23 +35,25 @@ class EntityExtractor:
         """Initialize entity extractor"""
         logger.info("EntityExtractor initialized")
 
-    def extract_entities(self, text: str) -> Dict:
+    def extract_entities(self, text: str, index: Optional[LexiconIndex] = None) -> Dict:
         """
         Extract entities and sensitive information.
         
         Args:
             text: Transcribed call text
+            index: Shared LexiconIndex for this transcript (built if omitted)
             
         Returns:
             Dict with extracted entities
         """
+        index = index or LexiconIndex(text)
         
         # Extract various entity types
         phone_numbers = self._extract_phone_numbers(text)
         account_numbers = self._extract_account_numbers(text)
         names = self._extract_names(text)
-        financial_info = self._extract_financial_info(text)
-        commands = self._extract_suspicious_commands(text)
+        financial_info = self._extract_financial_info(text, index)
+        commands = self._extract_suspicious_commands(text, index)
         
         # Calculate risk from extracted information
         extraction_risk = self._calculate_extraction_risk(
@@ -161,13 +166,23 @@ class EntityExtractor:
         
         return names[:10]  # Limit to top 10
 
-    def _extract_financial_info(self, text: str) -> List[Dict]:
+    @staticmethod
+    def _may_match(index: LexiconIndex, trigger: str) -> bool:
+        """
+        Cheap prefilter from the lexicon index: a regex can only match if
+        each of its literal word groups occurs somewhere in the text.
+        """
+        return all(index.contains_any(group) for group in ENTITY_TRIGGERS[trigger])
+
+    def _extract_financial_info(self, text: str, index: LexiconIndex) -> List[Dict]:
         """Extract financial information (amounts, account types, etc)"""
         financial_info = []
         
         # Amount patterns (rupees, dollars, etc)
         amount_pattern = r'(?:rs|₹|\$|rupees|dollars)\s*(?:\.)?(\d+(?:,\d{3})*(?:\.\d{2})?)'
-        matches = re.finditer(amount_pattern, text, re.IGNORECASE)
+        matches = ()
+        if self._may_match(index, "amount"):
+            matches = re.finditer(amount_pattern, text, re.IGNORECASE)
         for match in matches:
             amount = match.group(1)
             context = text[max(0, match.start()-50):min(len(text), match.end()+50)]
@@ -180,12 +195,13 @@ class EntityExtractor:
                 "confidence": 0.9,
             })
         
-        # Account type patterns
-        account_types = ["savings", "current", "checking", "credit", "debit", "loan"]
-        for acc_type in account_types:
+        # Account type patterns (only for types the index saw as whole words)
+        for acc_type in ACCOUNT_TYPES:
+            if not index.has_word(acc_type):
+                continue
             pattern = r'\b' + acc_type + r'\s+(?:account|acc|a/c)?\b'
-            if re.search(pattern, text, re.IGNORECASE):
-                context_match = re.search(pattern, text, re.IGNORECASE)
+            context_match = re.search(pattern, text, re.IGNORECASE)
+            if context_match:
                 context = text[max(0, context_match.start()-50):min(len(text), context_match.end()+50)]
                 
                 financial_info.append({
@@ -198,7 +214,7 @@ class EntityExtractor:
         
         return financial_info
 
-    def _extract_suspicious_commands(self, text: str) -> List[Dict]:
+    def _extract_suspicious_commands(self, text: str, index: LexiconIndex) -> List[Dict]:
         """Extract suspicious commands (asking user to do something harmful)"""
         suspicious_commands = {
             "share_otp": r'(?:give|share|tell|read|provide).*\botp\b',
@@ -211,6 +227,8 @@ class EntityExtractor:
         
         commands = []
         for cmd_type, pattern in suspicious_commands.items():
+            if not self._may_match(index, cmd_type):
+                continue
             matches = re.finditer(pattern, text, re.IGNORECASE)
             for match in matches:
                 context = text[max(0, match.start()-50):min(len(text), match.end()+50)]
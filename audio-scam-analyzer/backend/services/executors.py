@@ -0,0 +1,306 @@
+"""
+Executor Layer
+==============
+Runs the blocking stages of /analyze-call off the event loop, on pools
+sized for the kind of work they do:
+
+- CPU pool (processes): audio decode and voice features. librosa/NumPy
+  code holds the GIL for long stretches, so separate processes are what
+  lets concurrent calls use every core. Each worker process builds its own
+  AudioProcessor / VoiceAnalyzer once and reuses them. Decode and voice
+  features run in one call (decode_with_voice), so the samples cross the
+  process boundary once, back to the parent for Whisper.
+- Whisper pool (threads): one thread per model replica in the
+  WhisperModelPool. PyTorch releases the GIL during inference, so replicas
+  in this process already run in parallel without copying the model into
+  every worker process. Its admission bound (replicas + whisper_queue) is
+  the Whisper queue: a decoded call waits here, not in the model pool.
+- Text pool (threads): pattern analysis, risk scoring and the other light
+  text analyzers.
+
+Backpressure: every pool admits a bounded number of pending jobs. New
+requests over the CPU pool bound are rejected with PoolBusyError (HTTP 503)
+instead of queueing without limit; later stages of an admitted request wait
+for a slot so no finished work is thrown away.
+
+CPU_WORKERS=0 runs the CPU stages in threads (useful on small machines or
+when debugging).
+"""
+
+import asyncio
+import contextvars
+import hashlib
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from services import profiling
+from services.audio_processor import AudioSource, DecodedAudio
+from services.model_pool import PoolBusyError
+
+logger = logging.getLogger(__name__)
+
+
+# ==================
+# WORKER-PROCESS SIDE
+# ==================
+
+# Service singletons, one set per worker process (built on first use)
+_worker_services: Dict[str, Any] = {}
+
+
+def _init_worker():
+    """Process-pool initializer: pay the heavy imports before the first job"""
+    from services.log_setup import setup_logging_from_env
+    # Same format, levels and redaction as the server; written directly,
+    # since worker logs never block the event loop
+    setup_logging_from_env(use_queue=False)
+    import librosa  # noqa: F401
+
+
+def _get_service(name: str) -> Any:
+    service = _worker_services.get(name)
+    if service is None:
+        if name == "audio_processor":
+            from services.audio_processor import AudioProcessor
+            service = AudioProcessor()
+        elif name == "voice_analyzer":
+            from services.voice_analyzer import VoiceAnalyzer
+            service = VoiceAnalyzer()
+        else:
+            raise KeyError(name)
+        _worker_services[name] = service
+    return service
+
+
+def decode_audio(source: AudioSource, filename: str) -> Tuple[DecodedAudio, float]:
+    """
+    AudioProcessor.process_audio inside a worker. Spooled uploads are
+    passed as a path, so large files are never pickled to the worker.
+    """
+    return _get_service("audio_processor").process_audio(source, filename)
+
+
+def decode_audio_file(path: str, filename: str) -> Tuple[str, DecodedAudio, float]:
+    """
+    decode_audio for a file on disk (batch jobs), plus the SHA-256 that
+    keys the result and transcript caches.
+
+    Returns:
+        Tuple of (audio_hash, decoded_audio, duration_seconds)
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    decoded, duration = decode_audio(path, filename)
+    return digest.hexdigest(), decoded, duration
+
+
+def analyze_voice(audio: DecodedAudio) -> Dict:
+    """VoiceAnalyzer.analyze_audio_features inside a worker"""
+    return _get_service("voice_analyzer").analyze_audio_features(audio)
+
+
+def _voice_or_none(audio: DecodedAudio) -> Optional[Dict]:
+    # A voice failure must not cost the transcript: reported as None and
+    # replaced by the fallback features in the parent
+    started = time.perf_counter()
+    try:
+        return analyze_voice(audio)
+    except Exception as e:
+        logger.error(f"⚠️ Voice analysis failed: {str(e)}")
+        return None
+    finally:
+        audio.voice_seconds = time.perf_counter() - started
+
+
+def decode_with_voice(source: AudioSource, filename: str) -> Tuple[DecodedAudio, float, Optional[Dict]]:
+    """
+    decode_audio plus voice features in the same worker call, so the
+    decoded samples are not pickled out to a second worker.
+
+    Returns:
+        Tuple of (decoded_audio, duration_seconds, voice_analysis or None
+        if voice analysis failed)
+    """
+    decoded, duration = decode_audio(source, filename)
+    return decoded, duration, _voice_or_none(decoded)
+
+
+def decode_file_with_voice(path: str, filename: str) -> Tuple[str, DecodedAudio, float, Optional[Dict]]:
+    """
+    decode_audio_file plus voice features in the same worker call (batch jobs)
+
+    Returns:
+        Tuple of (audio_hash, decoded_audio, duration_seconds, voice_analysis or None)
+    """
+    audio_hash, decoded, duration = decode_audio_file(path, filename)
+    return audio_hash, decoded, duration, _voice_or_none(decoded)
+
+
+# ==================
+# EVENT-LOOP SIDE
+# ==================
+
+
+class StagePool:
+    """
+    An executor plus an admission limit.
+
+    Args:
+        name: Label for logs and status
+        executor: Where the work runs
+        workers: Executor size (reported in status)
+        max_pending: Jobs allowed running or waiting at once
+    """
+
+    def __init__(self, name: str, executor: Executor, workers: int, max_pending: int):
+        self.name = name
+        self.executor = executor
+        self.workers = workers
+        self.max_pending = max(1, max_pending)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+
+    async def run(self, func: Callable, *args, reject_when_full: bool = False) -> Any:
+        """
+        Run func(*args) on the pool.
+
+        Args:
+            reject_when_full: Raise PoolBusyError instead of waiting when
+                              max_pending jobs are already admitted
+
+        Raises:
+            PoolBusyError: Pool full and reject_when_full is set
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+
+        if reject_when_full and self._pending >= self.max_pending:
+            self._rejected += 1
+            raise PoolBusyError(
+                f"{self.name} pool full ({self._pending}/{self.max_pending} jobs pending)"
+            )
+
+        self._pending += 1
+        try:
+            async with self._semaphore:
+                self._running += 1
+                try:
+                    loop = asyncio.get_running_loop()
+                    profile = profiling.current()
+                    if profile is None:
+                        return await self._submit(loop, func, *args)
+                    started = profile.elapsed()
+                    result, stats = await self._submit(loop, profiling.profiled_call, func, *args)
+                    profile.add_job(self.name, func, started, stats)
+                    return result
+                finally:
+                    self._running -= 1
+        finally:
+            self._pending -= 1
+
+    def _submit(self, loop: asyncio.AbstractEventLoop, func: Callable, *args) -> "asyncio.Future":
+        if isinstance(self.executor, ThreadPoolExecutor):
+            # Thread jobs run in the request's context, so their log records
+            # carry its request ID and follow its sampling decision
+            return loop.run_in_executor(self.executor, contextvars.copy_context().run, func, *args)
+        return loop.run_in_executor(self.executor, func, *args)
+
+    def status(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "running": self._running,
+            "waiting": self._pending - self._running,
+            "max_pending": self.max_pending,
+            "rejected": self._rejected,
+            "kind": "process" if isinstance(self.executor, ProcessPoolExecutor) else "thread",
+        }
+
+
+class AnalysisExecutors:
+    """
+    The three stage pools used by the analysis pipeline.
+
+    Args:
+        cpu_workers: Processes for decode/voice features (0 = use threads)
+        text_workers: Threads for text analyzers
+        whisper_workers: Threads feeding Whisper (match the replica count)
+        cpu_queue: Max pending CPU jobs before new requests get 503
+        whisper_queue: Jobs that may wait for a Whisper thread before new
+                       requests get 503 (WHISPER_MAX_QUEUE)
+    """
+
+    def __init__(
+        self,
+        cpu_workers: int,
+        text_workers: int = 4,
+        whisper_workers: int = 1,
+        cpu_queue: Optional[int] = None,
+        whisper_queue: int = 8,
+    ):
+        if cpu_workers > 0:
+            # spawn: workers must not inherit the parent's threads (Whisper
+            # warm-up, executors) mid-flight, which fork does not guarantee
+            cpu_executor: Executor = ProcessPoolExecutor(
+                max_workers=cpu_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        else:
+            cpu_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cpu")
+        cpu_size = cpu_workers or 4
+
+        self.cpu = StagePool(
+            "cpu", cpu_executor, cpu_size, cpu_queue if cpu_queue is not None else 2 * cpu_size
+        )
+        self.whisper = StagePool(
+            "whisper",
+            ThreadPoolExecutor(max_workers=whisper_workers, thread_name_prefix="whisper"),
+            whisper_workers,
+            # One thread per replica, so this is where Whisper jobs queue: the
+            # bound keeps decoded audio from piling up in front of the model
+            max_pending=whisper_workers + max(0, whisper_queue),
+        )
+        self.text = StagePool(
+            "text",
+            ThreadPoolExecutor(max_workers=text_workers, thread_name_prefix="text"),
+            text_workers,
+            max_pending=4 * text_workers,
+        )
+        logger.info(
+            f"⚙️ Executors ready: cpu={cpu_size} ({self.cpu.status()['kind']}), "
+            f"whisper={whisper_workers}, text={text_workers}"
+        )
+
+    @classmethod
+    def from_env(cls, whisper_workers: int = 1, whisper_queue: int = 8) -> "AnalysisExecutors":
+        """
+        Sizes from CPU_WORKERS, TEXT_WORKERS and CPU_QUEUE
+        (default: one process per core, capped at 8)
+        """
+        cpu_queue = os.getenv("CPU_QUEUE")
+        return cls(
+            cpu_workers=int(os.getenv("CPU_WORKERS", str(min(os.cpu_count() or 1, 8)))),
+            text_workers=int(os.getenv("TEXT_WORKERS", "4")),
+            whisper_workers=whisper_workers,
+            cpu_queue=int(cpu_queue) if cpu_queue else None,
+            whisper_queue=whisper_queue,
+        )
+
+    def status(self) -> Dict:
+        return {
+            "cpu": self.cpu.status(),
+            "whisper": self.whisper.status(),
+            "text": self.text.status(),
+        }
+
+    def shutdown(self):
+        for pool in (self.cpu, self.whisper, self.text):
+            pool.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,232 @@
+"""
+Upload Ingestion
+================
+Streams uploads in fixed-size chunks instead of buffering whole files, so
+memory per request is bounded by the chunk size rather than the file size.
+
+- UploadSizeLimitMiddleware rejects oversized request bodies with HTTP 413
+  while they are still arriving (Content-Length checked up front, body
+  bytes counted as they stream in), before anything is buffered
+- spool_upload() copies the upload chunk by chunk, hashing and enforcing
+  the size limit as it goes, in a worker thread. Small files stay in
+  memory; larger ones go to a private temporary file that AudioProcessor
+  decodes block by block (in another process, so it needs a path: the
+  parser's own temporary file has none)
+
+PRIVACY: Spooled files are created with owner-only permissions and deleted
+as soon as the request finishes (SpooledUpload.close()).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import BinaryIO, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024  # Bytes read from the upload per step
+MEMORY_LIMIT = 4 * 1024 * 1024  # Uploads up to this size never touch disk
+MULTIPART_OVERHEAD = 64 * 1024  # Boundaries, part headers and form fields
+
+
+class UploadTooLargeError(ValueError):
+    """Upload exceeds the configured size limit"""
+
+
+class SpooledUpload:
+    """
+    An upload read into a bounded buffer.
+
+    Attributes:
+        filename: Original filename
+        size: Bytes received
+        sha256: Hex digest of the content (computed while reading)
+    """
+
+    def __init__(self, filename: str, memory_limit: int = MEMORY_LIMIT, spool_dir: Optional[str] = None):
+        self.filename = filename
+        self.size = 0
+        self.memory_limit = memory_limit
+        self.spool_dir = spool_dir
+        self._hash = hashlib.sha256()
+        self._buffer: Optional[bytearray] = bytearray()
+        self._file = None
+        self.path: Optional[str] = None
+
+    @property
+    def sha256(self) -> str:
+        return self._hash.hexdigest()
+
+    def write(self, chunk: bytes):
+        self._hash.update(chunk)
+        self.size += len(chunk)
+        if self._buffer is not None and self.size > self.memory_limit:
+            self._roll_over()
+        if self._buffer is not None:
+            self._buffer.extend(chunk)
+        else:
+            self._file.write(chunk)
+
+    def _roll_over(self):
+        """Move the in-memory part to a private temp file"""
+        suffix = os.path.splitext(self.filename)[1]
+        fd, self.path = tempfile.mkstemp(prefix="upload-", suffix=suffix, dir=self.spool_dir)
+        self._file = os.fdopen(fd, "wb")  # mkstemp: mode 0600
+        self._file.write(self._buffer)
+        self._buffer = None
+
+    def finish(self):
+        """Flush the temp file so another process can decode it"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """What AudioProcessor.process_audio accepts: bytes or a file path"""
+        return bytes(self._buffer) if self._buffer is not None else self.path
+
+    def close(self):
+        """Discard the upload (deletes any temp file)"""
+        self.finish()
+        if self.path:
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+        self._buffer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+async def spool_upload(
+    upload,
+    max_bytes: int,
+    chunk_size: int = CHUNK_SIZE,
+    memory_limit: int = MEMORY_LIMIT,
+    spool_dir: Optional[str] = None,
+) -> SpooledUpload:
+    """
+    Read a FastAPI UploadFile chunk by chunk into a SpooledUpload.
+
+    The form is fully parsed by the time the endpoint runs, so the copy
+    reads upload.file directly; reads, hashing and writes all run in a
+    thread, off the event loop.
+
+    Raises:
+        UploadTooLargeError: As soon as more than max_bytes have been read
+    """
+    return await asyncio.to_thread(
+        _spool_file, upload.file, upload.filename or "", max_bytes, chunk_size, memory_limit, spool_dir
+    )
+
+
+def _spool_file(
+    source: BinaryIO,
+    filename: str,
+    max_bytes: int,
+    chunk_size: int,
+    memory_limit: int,
+    spool_dir: Optional[str],
+) -> SpooledUpload:
+    spooled = SpooledUpload(filename, memory_limit, spool_dir)
+    try:
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            if spooled.size + len(chunk) > max_bytes:
+                raise UploadTooLargeError(
+                    f"File too large. Maximum {max_bytes // (1024 * 1024)}MB allowed."
+                )
+            spooled.write(chunk)
+        spooled.finish()
+        return spooled
+    except BaseException:
+        spooled.close()
+        raise
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware that caps request body size for upload endpoints.
+
+    Args:
+        app: Wrapped ASGI app
+        max_upload_bytes: Largest accepted audio file
+        paths: Request paths the limit applies to
+    """
+
+    def __init__(self, app, max_upload_bytes: int, paths: Iterable[str] = ("/analyze-call",)):
+        self.app = app
+        self.max_body_bytes = max_upload_bytes + MULTIPART_OVERHEAD
+        self.max_upload_bytes = max_upload_bytes
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        content_length = headers.get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_bytes:
+            logger.error(f"❌ Upload rejected before reading: Content-Length {int(content_length)} bytes")
+            await self._reject(send)
+            return
+
+        state = {"received": 0, "exceeded": False, "replied": False}
+
+        async def limited_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                state["received"] += len(message.get("body", b""))
+                if state["received"] > self.max_body_bytes:
+                    state["exceeded"] = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            # Once the limit is hit, whatever error the app produces from
+            # the aborted body is replaced by a single 413
+            if state["exceeded"]:
+                if not state["replied"]:
+                    state["replied"] = True
+                    await self._reject(send)
+                return
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # The app may wrap _BodyTooLarge in its own error; either way
+            # the client gets the 413 below
+            if not state["exceeded"]:
+                raise
+        if state["exceeded"] and not state["replied"]:
+            state["replied"] = True
+            await self._reject(send)
+
+    async def _reject(self, send):
+        body = json.dumps({
+            "success": False,
+            "error": f"File too large. Maximum {self.max_upload_bytes // (1024 * 1024)}MB allowed.",
+        }).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
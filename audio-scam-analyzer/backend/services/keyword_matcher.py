@@ -0,0 +1,205 @@
+"""
+Multi-Keyword Matcher
+=====================
+Compiles whole keyword lists into ONE regex so a transcript is scanned
+once for every keyword of every category, instead of once per keyword.
+
+How it works:
+- All keywords are folded into a character trie and emitted as a single
+  nested regex (e.g. "verif(?:y|ication(?: code)?)"), so at each position
+  the regex engine walks the trie and captures the LONGEST keyword there
+- The pattern is wrapped in a lookahead, so overlapping keywords that
+  start at different positions are all reported
+- Shorter keywords that are prefixes of the captured one ("verification"
+  inside "verification code") are expanded from a precomputed table
+
+Word-boundary semantics are identical to r"\\b" + re.escape(keyword) + r"\\b".
+
+IncrementalKeywordMatcher is the alternative for very large vocabularies
+that change at runtime: hash lookups instead of one compiled regex.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, NamedTuple
+
+_WORD_CHAR = re.compile(r"\w")
+
+
+def _is_word_char(text: str, index: int) -> bool:
+    return 0 <= index < len(text) and _WORD_CHAR.match(text, index) is not None
+
+
+def is_word_boundary(text: str, index: int) -> bool:
+    """True where the regex \\b assertion would hold in text at index"""
+    return _is_word_char(text, index - 1) != _is_word_char(text, index)
+
+
+def _trie_regex(node: Dict) -> str:
+    """Emit a regex for a character trie, preferring the longest match"""
+    branches = [
+        re.escape(char) + _trie_regex(child)
+        for char, child in sorted(node.items())
+        if char != ""
+    ]
+    if not branches:
+        return ""
+
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if "" in node:
+        # A keyword ends here but longer ones continue: greedy optional
+        body = "(?:" + body + ")?"
+    return body
+
+
+class KeywordHit(NamedTuple):
+    """A keyword occurrence in scanned text"""
+    start: int
+    end: int
+    keyword: str
+    bounded: bool  # Word boundaries on both sides
+
+
+class KeywordMatcher:
+    """
+    Precompiled matcher for several named keyword lists.
+
+    Args:
+        lexicons: Mapping of category name -> keywords
+        word_boundary: Only report whole-word matches (like r"\\b...\\b").
+                       When False, plain substring hits are reported too.
+    """
+
+    def __init__(self, lexicons: Dict[str, Iterable[str]], word_boundary: bool = True):
+        self.word_boundary = word_boundary
+
+        # keyword -> categories it belongs to (a keyword can be in several)
+        self.categories: Dict[str, List[str]] = {}
+        for category, keywords in lexicons.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if not keyword:
+                    continue
+                owners = self.categories.setdefault(keyword, [])
+                if category not in owners:
+                    owners.append(category)
+        self.category_names = list(lexicons.keys())
+
+        trie: Dict = {}
+        for keyword in self.categories:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}
+
+        # Shorter keywords that are prefixes of a longer one, longest first.
+        # Walking each keyword down the trie visits every prefix that ends
+        # a keyword, so this stays linear in the total keyword length.
+        self._prefixes: Dict[str, List[str]] = {}
+        for keyword in self.categories:
+            node, prefixes = trie, []
+            for length, char in enumerate(keyword[:-1], start=1):
+                node = node[char]
+                if "" in node:
+                    prefixes.append(keyword[:length])
+            self._prefixes[keyword] = prefixes[::-1]
+
+        body = _trie_regex(trie) if trie else "(?!)"
+        prefix = r"\b" if word_boundary else ""
+        self._pattern = re.compile(prefix + "(?=(" + body + "))", re.IGNORECASE)
+
+    def __len__(self) -> int:
+        return len(self.categories)
+
+    def scan(self, text: str) -> Iterator[KeywordHit]:
+        """
+        Yield every keyword occurrence in text, in order of position.
+        In word-boundary mode only whole-word hits are yielded.
+        """
+        for match in self._pattern.finditer(text):
+            start = match.start()
+            longest = match.group(1).lower()
+            if longest not in self.categories:
+                continue
+
+            start_bounded = is_word_boundary(text, start)
+            for keyword in [longest] + self._prefixes[longest]:
+                end = start + len(keyword)
+                bounded = start_bounded and is_word_boundary(text, end)
+                if bounded or not self.word_boundary:
+                    yield KeywordHit(start, end, keyword, bounded)
+
+    def find_all(self, text: str) -> Dict[str, List[str]]:
+        """
+        Scan text once and return, per category, the unique keywords found
+        (lowercase, in order of first appearance).
+        """
+        found: Dict[str, List[str]] = {name: [] for name in self.category_names}
+        seen = set()
+        for hit in self.scan(text):
+            if hit.keyword in seen:
+                continue
+            seen.add(hit.keyword)
+            for category in self.categories[hit.keyword]:
+                found[category].append(hit.keyword)
+        return found
+
+
+class IncrementalKeywordMatcher:
+    """
+    Substring matcher for large vocabularies that grow at runtime (e.g. the
+    scam campaign catalog). Keywords are held in a plain set and can be added
+    without recompiling anything, so memory stays linear in the vocabulary.
+
+    Every text position is probed with the keyword lengths that occur for
+    the two characters starting there, so cost depends on the text length
+    and the number of distinct keyword lengths, not on the vocabulary size.
+
+    Text passed to scan() must already be lowercase.
+    """
+
+    def __init__(self, keywords: Iterable[str] = ()):
+        self._keywords = set()
+        # first one/two characters -> lengths of keywords starting with them
+        self._lengths: Dict[str, List[int]] = {}
+        for keyword in keywords:
+            self.add(keyword)
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword in self._keywords
+
+    def copy(self) -> "IncrementalKeywordMatcher":
+        """
+        Independent copy, for copy-on-write updates: extend the copy while
+        other threads keep scanning the original, then swap it in.
+        """
+        clone = IncrementalKeywordMatcher()
+        clone._keywords = set(self._keywords)
+        clone._lengths = {key: list(lengths) for key, lengths in self._lengths.items()}
+        return clone
+
+    def add(self, keyword: str):
+        keyword = keyword.lower()
+        if not keyword or keyword in self._keywords:
+            return
+        self._keywords.add(keyword)
+        lengths = self._lengths.setdefault(keyword[:2], [])
+        if len(keyword) not in lengths:
+            lengths.append(len(keyword))
+            lengths.sort()
+
+    def scan(self, text: str) -> Iterator[KeywordHit]:
+        """Yield every keyword occurrence in text, in order of position"""
+        keywords, table = self._keywords, self._lengths
+        last = len(text) - 1
+        for start in range(len(text)):
+            keys = (text[start],) if start == last else (text[start], text[start:start + 2])
+            for key in keys:
+                for length in table.get(key, ()):
+                    keyword = text[start:start + length]
+                    if len(keyword) == length and keyword in keywords:
+                        end = start + length
+                        bounded = is_word_boundary(text, start) and is_word_boundary(text, end)
+                        yield KeywordHit(start, end, keyword, bounded)
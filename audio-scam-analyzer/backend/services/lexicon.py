@@ -0,0 +1,164 @@
+"""
+Shared Lexicon Index
+====================
+Tokenizes a transcript and finds every keyword/phrase list in the project
+in ONE pass. All text analyzers (PatternAnalyzer, EmotionalToneAnalyzer,
+EntityExtractor, KnownScamDatabase, RiskScorer) read from the same index
+instead of lowercasing and rescanning the transcript with their own loops.
+
+Both matching styles used by the analyzers are answered from the same hits:
+- Whole-word matches (r"\\b" + keyword + r"\\b")    -> has_word() / words()
+- Plain substring matches (keyword in text_lower) -> contains() / substrings()
+
+PRIVACY: The index lives only for the duration of one analysis.
+"""
+
+import re
+from functools import cached_property
+from typing import Dict, Iterable, List, Set, Tuple, Union
+
+from services.keyword_matcher import IncrementalKeywordMatcher, KeywordHit, KeywordMatcher
+from utils.constants import (
+    URGENCY_KEYWORDS,
+    BANKING_KEYWORDS,
+    AUTHORITY_KEYWORDS,
+    FEAR_KEYWORDS,
+    OTP_KEYWORDS,
+    SAFE_INDICATORS,
+    HINDI_INDICATORS,
+    TAMIL_INDICATORS,
+    REQUEST_INDICATORS,
+    EMOTION_KEYWORDS,
+    TACTIC_KEYWORDS,
+    ACCOUNT_TYPES,
+    ENTITY_TRIGGERS,
+)
+
+# Every static keyword list in the project, by category name
+PROJECT_LEXICON: Dict[str, List[str]] = {
+    "urgency": URGENCY_KEYWORDS,
+    "banking": BANKING_KEYWORDS,
+    "authority": AUTHORITY_KEYWORDS,
+    "fear": FEAR_KEYWORDS,
+    "otp": OTP_KEYWORDS,
+    **{f"hindi_{name}": words for name, words in HINDI_INDICATORS.items()},
+    **{f"tamil_{name}": words for name, words in TAMIL_INDICATORS.items()},
+    "request_indicators": REQUEST_INDICATORS,
+    "safe_indicators": SAFE_INDICATORS,
+    **{f"emotion_{name}": words for name, words in EMOTION_KEYWORDS.items()},
+    **{f"tactic_{name}": words for name, words in TACTIC_KEYWORDS.items()},
+    "account_types": ACCOUNT_TYPES,
+    **{
+        f"entity_{name}": [term for group in groups for term in group]
+        for name, groups in ENTITY_TRIGGERS.items()
+    },
+}
+
+# Compiled once per process. Substring mode: every hit also carries
+# whether it sits on word boundaries, so one scan serves both styles.
+PROJECT_MATCHER = KeywordMatcher(PROJECT_LEXICON, word_boundary=False)
+
+_TOKEN_PATTERN = re.compile(r"\S+")
+
+AnyMatcher = Union[KeywordMatcher, IncrementalKeywordMatcher]
+
+
+class LexiconIndex:
+    """
+    One-pass keyword index over a single transcript.
+
+    Args:
+        text: Transcribed call text (original casing)
+        known_prefix: Length of a leading part of text that was indexed
+                      before (PatternStream's carried tail); hits that end
+                      inside it are left out, hits that cross into the new
+                      text are kept
+    """
+
+    def __init__(self, text: str, known_prefix: int = 0):
+        self.text = text
+        self.text_lower = text.lower()
+
+        # keyword -> [(start, end, bounded), ...] in text_lower
+        self.positions: Dict[str, List[Tuple[int, int, bool]]] = {}
+        for hit in PROJECT_MATCHER.scan(self.text_lower):
+            if hit.end <= known_prefix:
+                continue
+            self.positions.setdefault(hit.keyword, []).append(
+                (hit.start, hit.end, hit.bounded)
+            )
+
+        self._extra_scans: Dict[int, Tuple[AnyMatcher, List[KeywordHit]]] = {}
+
+    @cached_property
+    def tokens(self) -> List[Tuple[int, int]]:
+        """(start, end) offsets of whitespace-separated tokens"""
+        return [match.span() for match in _TOKEN_PATTERN.finditer(self.text)]
+
+    @property
+    def word_count(self) -> int:
+        """Same as len(text.split())"""
+        return len(self.tokens)
+
+    # ==================
+    # LOOKUPS
+    # ==================
+
+    def contains(self, term: str) -> bool:
+        """Substring test, equivalent to term.lower() in text_lower"""
+        term = term.lower()
+        if term in PROJECT_MATCHER.categories:
+            return term in self.positions
+        # Not part of the shared lexicon - fall back to a direct check
+        return term in self.text_lower
+
+    def has_word(self, term: str) -> bool:
+        """Whole-word test, equivalent to re.search(r"\\b" + term + r"\\b")"""
+        term = term.lower()
+        if term in PROJECT_MATCHER.categories:
+            return any(bounded for _, _, bounded in self.positions.get(term, ()))
+        return re.search(r"\b" + re.escape(term) + r"\b", self.text_lower) is not None
+
+    def contains_any(self, terms: Iterable[str]) -> bool:
+        return any(self.contains(term) for term in terms)
+
+    def words(self, category: str) -> List[str]:
+        """Keywords of a category found as whole words (first-appearance order)"""
+        return self._found(category, whole_word=True)
+
+    def substrings(self, category: str) -> List[str]:
+        """Keywords of a category found anywhere (first-appearance order)"""
+        return self._found(category, whole_word=False)
+
+    def _found(self, category: str, whole_word: bool) -> List[str]:
+        found = []
+        for keyword in dict.fromkeys(k.lower() for k in PROJECT_LEXICON[category]):
+            hits = self.positions.get(keyword)
+            if not hits:
+                continue
+            if whole_word:
+                hits = [hit for hit in hits if hit[2]]
+                if not hits:
+                    continue
+            found.append((hits[0][0], keyword))
+        return [keyword for _, keyword in sorted(found)]
+
+    # ==================
+    # EXTRA VOCABULARIES
+    # ==================
+
+    def scan(self, matcher: AnyMatcher) -> List[KeywordHit]:
+        """
+        Hits for a vocabulary outside the shared lexicon (e.g. the scam
+        campaign catalog). Memoized per matcher, so every consumer of this
+        index shares the same single scan.
+        """
+        cached = self._extra_scans.get(id(matcher))
+        if cached is None or cached[0] is not matcher:
+            cached = (matcher, list(matcher.scan(self.text_lower)))
+            self._extra_scans[id(matcher)] = cached
+        return cached[1]
+
+    def scan_terms(self, matcher: AnyMatcher) -> Set[str]:
+        """Set of distinct terms from matcher that occur in the text"""
+        return {hit.keyword for hit in self.scan(matcher)}
@@ -0,0 +1,306 @@
+"""
+Live Call Session
+=================
+State of one call being analyzed while it is still happening
+(WebSocket /ws/analyze-live).
+
+Audio arrives as raw PCM frames. The session:
+1. Converts them to 16kHz float32 (soxr streaming resampler when needed)
+2. Runs an incremental energy VAD over the not-yet-transcribed audio and
+   cuts a window as soon as an utterance ends in a pause, or when the
+   window reaches max_window_seconds
+3. Feeds each transcribed window's segments to a RiskTimelineBuilder,
+   which scans only the new text (PatternStream), and reports the
+   cumulative risk
+
+Memory per session is bounded: at most one window of audio is buffered,
+and the pattern state only grows with the (fixed) keyword lexicon, not
+with call length. Transcripts are sent to the client, not kept.
+
+PRIVACY: Audio and text live only for the duration of the connection.
+"""
+
+import logging
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import soxr
+
+from services.pattern_analyzer import PatternAnalyzer
+from services.risk_scorer import RiskScorer, RiskTimelineBuilder
+from services.speech_to_text import Transcript
+from services.voice_analyzer import speech_segments
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+# Non-overlapping 32ms VAD frames, so energies of new audio are appended
+# without touching frames already measured
+FRAME = 512
+# Frames more than 40 dB below the loudest frame so far count as silence,
+# and so does anything below an absolute floor (about -60 dBFS)
+SILENCE_DB = -40.0
+ENERGY_FLOOR = 1e-6 * FRAME
+
+ENCODINGS = {"pcm_s16le": np.int16, "pcm_f32le": np.float32}
+
+
+class LiveWindow:
+    """A stretch of call audio ready for transcription"""
+
+    def __init__(self, offset: float, samples: np.ndarray):
+        self.offset = offset  # Seconds from call start
+        self.samples = samples  # mono float32, 16kHz
+        self.created_at = time.perf_counter()  # When the audio was complete
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / SAMPLE_RATE
+
+
+class LiveCallSession:
+    """
+    Incremental analysis state of one live call.
+
+    Args:
+        scorer: RiskScorer providing the scoring rules
+        analyzer: PatternAnalyzer whose detectors are used
+        sample_rate: Sample rate of the incoming PCM
+        encoding: "pcm_s16le" (default) or "pcm_f32le", mono
+        language: ISO-639-1 code, or None to detect on the first window
+        max_window_seconds: Longest window before a cut is forced
+        min_pause_seconds: Silence that ends an utterance
+        min_speech_seconds: Shorter utterances (clicks, breaths) are dropped
+        edge_seconds: Audio kept around speech at each cut
+    """
+
+    def __init__(
+        self,
+        scorer: RiskScorer,
+        analyzer: Optional[PatternAnalyzer] = None,
+        sample_rate: int = SAMPLE_RATE,
+        encoding: str = "pcm_s16le",
+        language: Optional[str] = None,
+        max_window_seconds: float = 8.0,
+        min_pause_seconds: float = 0.4,
+        min_speech_seconds: float = 0.25,
+        edge_seconds: float = 0.2,
+    ):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unsupported encoding '{encoding}'. Use one of: {', '.join(ENCODINGS)}")
+        if not 8000 <= sample_rate <= 48000:
+            raise ValueError("sample_rate must be between 8000 and 48000")
+
+        self.scorer = scorer
+        self.analyzer = analyzer or PatternAnalyzer()
+        self.sample_rate = sample_rate
+        self.dtype = ENCODINGS[encoding]
+        self.language = language
+        # Window limits in VAD frames
+        self.max_window = int(max_window_seconds * SAMPLE_RATE / FRAME)
+        self.min_pause_seconds = min_pause_seconds
+        self.min_speech = int(min_speech_seconds * SAMPLE_RATE / FRAME)
+        self.edge = int(edge_seconds * SAMPLE_RATE / FRAME)
+
+        self._resampler = None
+        if sample_rate != SAMPLE_RATE:
+            self._resampler = soxr.ResampleStream(sample_rate, SAMPLE_RATE, 1, dtype="float32")
+        self._remainder = b""  # Partial sample left over from the last frame
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._energy = np.zeros(0, dtype=np.float64)  # One per full frame of _buffer
+        self._offset = 0.0  # Call time of _buffer[0], seconds
+        self._peak = 0.0
+
+        self.timeline: Optional[RiskTimelineBuilder] = None
+        if language:
+            self.timeline = RiskTimelineBuilder(scorer, language, self.analyzer)
+        self.received_seconds = 0.0
+        self.transcribed_seconds = 0.0
+        self.skipped_seconds = 0.0
+        self.segment_count = 0
+
+    # ==================
+    # AUDIO IN
+    # ==================
+
+    def push_pcm(self, data: bytes) -> List[LiveWindow]:
+        """
+        Add a frame of raw PCM.
+
+        Returns:
+            Windows that are complete and ready for transcription
+        """
+        data = self._remainder + data
+        width = np.dtype(self.dtype).itemsize
+        usable = len(data) - len(data) % width
+        self._remainder = data[usable:]
+
+        samples = np.frombuffer(data[:usable], dtype=self.dtype)
+        if self.dtype == np.int16:
+            samples = samples.astype(np.float32) / 32768.0
+        else:
+            samples = samples.astype(np.float32, copy=False)
+        self.received_seconds += len(samples) / self.sample_rate
+
+        if self._resampler is not None:
+            samples = self._resampler.resample_chunk(samples)
+        self._buffer = np.concatenate((self._buffer, samples))
+        self._measure()
+        return self._cut_windows()
+
+    def flush(self) -> List[LiveWindow]:
+        """End of call: whatever speech is still buffered becomes a window"""
+        if self._resampler is not None:
+            tail = self._resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+            self._buffer = np.concatenate((self._buffer, tail))
+            self._measure()
+        windows = self._cut_windows(final=True)
+        self._buffer = np.zeros(0, dtype=np.float32)
+        self._energy = np.zeros(0, dtype=np.float64)
+        return windows
+
+    def _measure(self):
+        """Energy of the frames completed since the last call"""
+        done = len(self._energy) * FRAME
+        complete = len(self._buffer) // FRAME * FRAME
+        if complete > done:
+            frames = self._buffer[done:complete].reshape(-1, FRAME)
+            energy = np.square(frames, dtype=np.float64).sum(axis=1)
+            self._peak = max(self._peak, float(energy.max()))
+            self._energy = np.concatenate((self._energy, energy))
+
+    def _cut_windows(self, final: bool = False) -> List[LiveWindow]:
+        windows = []
+        while len(self._energy):
+            window = self._next_window(final)
+            if window is None:
+                break
+            windows.append(window)
+        return windows
+
+    def _next_window(self, final: bool) -> Optional[LiveWindow]:
+        """Cut one window off the front of the buffer, if one is complete"""
+        energy = self._energy
+        frames = len(energy)
+        threshold = max(self._peak * 10.0 ** (SILENCE_DB / 10.0), ENERGY_FLOOR)
+        regions = [
+            (round(start * SAMPLE_RATE / FRAME), round(end * SAMPLE_RATE / FRAME))
+            for start, end in speech_segments(
+                energy > threshold, SAMPLE_RATE, hop_length=FRAME,
+                min_pause_seconds=self.min_pause_seconds,
+            )
+        ]
+
+        if not regions:
+            # Silence: keep only a short lead-in for the next utterance
+            self._advance(max(0, frames - self.edge))
+            return None
+
+        first_start, last_end = regions[0][0], regions[-1][1]
+        start = max(0, first_start - self.edge)
+        pause = (frames - last_end) * FRAME / SAMPLE_RATE
+
+        if final or pause >= self.min_pause_seconds:
+            # The utterance ended in a pause
+            cut = min(last_end + self.edge, frames)
+            if last_end - first_start < self.min_speech:
+                self._advance(cut)
+                return self._next_window(final) if len(self._energy) else None
+        elif frames - start >= self.max_window:
+            if len(regions) > 1:
+                # Cut in the last pause inside the window
+                cut = (regions[-2][1] + regions[-1][0]) // 2
+            else:
+                # Unbroken speech: cut at the quietest frame of the last 2s
+                low = max(start + 1, frames - 2 * SAMPLE_RATE // FRAME)
+                cut = low + int(np.argmin(energy[low:]))
+        else:
+            # Utterance still going
+            if start > 0:
+                self._advance(start)
+            return None
+
+        window = LiveWindow(
+            self._offset + start * FRAME / SAMPLE_RATE,
+            self._buffer[start * FRAME:cut * FRAME].copy(),
+        )
+        self._advance(cut)
+        return window
+
+    def _advance(self, frames: int):
+        """Drop frames from the front of the buffer"""
+        self._buffer = self._buffer[frames * FRAME:]
+        self._energy = self._energy[frames:]
+        self._offset += frames * FRAME / SAMPLE_RATE
+
+    # ==================
+    # TRANSCRIPTS IN, RISK OUT
+    # ==================
+
+    def add_transcript(self, window: LiveWindow, transcript: Transcript) -> Dict:
+        """
+        Feed a transcribed window and build the update for the client.
+
+        Args:
+            window: The window that was transcribed
+            transcript: Its Whisper transcript (segment times window-relative)
+
+        Returns:
+            "update" message with the new segments and the cumulative risk
+        """
+        if self.timeline is None:
+            # The first window fixes the language for the rest of the call
+            self.language = transcript.language
+            self.timeline = RiskTimelineBuilder(self.scorer, self.language, self.analyzer)
+
+        segments = transcript.segments or (
+            [{"start": 0.0, "end": window.duration, "text": transcript.text}] if transcript.text else []
+        )
+        new_segments = []
+        checkpoints = []
+        for segment in segments:
+            start = round(window.offset + segment["start"], 2)
+            end = round(window.offset + segment["end"], 2)
+            new_segments.append({"start": start, "end": end, "text": segment["text"]})
+            checkpoint = self.timeline.add_segment(end, segment["text"])
+            if checkpoint:
+                checkpoints.append(checkpoint)
+
+        self.segment_count += len(new_segments)
+        self.transcribed_seconds += window.duration
+        return {
+            "type": "update",
+            "segments": new_segments,
+            "checkpoints": checkpoints,
+            **self._risk(),
+            "latency_ms": round((time.perf_counter() - window.created_at) * 1000),
+        }
+
+    def skip(self, window: LiveWindow):
+        """Record a window that could not be transcribed (server busy)"""
+        self.skipped_seconds += window.duration
+
+    def _risk(self) -> Dict:
+        score = self.timeline.risk_score if self.timeline else 0
+        risk_level, _ = self.scorer._get_risk_level(score)
+        patterns = self.timeline.stream.patterns if self.timeline else []
+        return {
+            "risk_score": score,
+            "risk_level": risk_level,
+            "patterns": [pattern.pattern_name for pattern in patterns],
+        }
+
+    def summary(self) -> Dict:
+        """Final message once the call has ended"""
+        timeline = self.timeline.finish(self.received_seconds) if self.timeline else []
+        return {
+            "type": "final",
+            **self._risk(),
+            "language": self.language,
+            "timeline": timeline,
+            "segments": self.segment_count,
+            "received_seconds": round(self.received_seconds, 2),
+            "transcribed_seconds": round(self.transcribed_seconds, 2),
+            "skipped_seconds": round(self.skipped_seconds, 2),
+        }
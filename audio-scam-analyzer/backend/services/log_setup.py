@@ -0,0 +1,290 @@
+"""
+Logging Setup
+=============
+Keeps logging off the request hot path.
+
+- Queue-based: loggers only put records on a bounded queue; a
+  QueueListener thread formats and writes them. When the queue is full,
+  records are dropped and counted instead of blocking the request.
+- Structured: LOG_FORMAT=json writes one JSON object per line, with
+  request_id and any `extra={...}` fields. The default text format is unchanged.
+- Per-stage levels: LOG_LEVELS="whisper=WARNING,decode=DEBUG" sets levels
+  by pipeline stage (see STAGE_LOGGERS) or by logger name.
+- Sampling: RequestLogContextMiddleware gives every request an ID and
+  decides once whether its INFO/DEBUG chatter is kept
+  (LOG_SAMPLE_RATE). Warnings and errors are always kept.
+- Redaction: configured secrets (API_KEY, PROFILE_TOKEN) and anything that
+  looks like key=value credentials are masked before a record is written.
+
+Filtering that needs the request context runs in the calling thread (so
+dropped records are never queued); formatting, redaction and I/O run on
+the listener thread.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import secrets
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+QUEUE_SIZE = 10000  # Records buffered before new ones are dropped
+REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")  # Accepted client-supplied X-Request-ID
+
+# Pipeline stage -> logger(s) that carry its chatter
+STAGE_LOGGERS: Dict[str, tuple] = {
+    "app": ("app", "__main__"),
+    "ingest": ("services.ingestion",),
+    "decode": ("services.audio_processor",),
+    "whisper": ("services.speech_to_text", "services.model_pool"),
+    "voice": ("services.voice_analyzer",),
+    "pattern": ("services.pattern_analyzer", "services.keyword_matcher", "services.lexicon"),
+    "risk": ("services.risk_scorer",),
+    "emotion": ("services.emotional_analyzer",),
+    "entity": ("services.entity_extractor",),
+    "scam_db": ("services.scam_database", "services.campaign_store"),
+    "cache": ("services.result_cache", "services.transcript_store"),
+    "executors": ("services.executors",),
+    "live": ("services.live_session",),
+    "batch": ("services.batch_jobs",),
+}
+
+# Standard LogRecord attributes; anything else came in through extra={...}
+_RECORD_FIELDS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+
+# {"request_id": ..., "sampled": bool} of the request being handled
+_log_context: ContextVar[Optional[Dict]] = ContextVar("log_context", default=None)
+
+
+# ==================
+# CALLING-THREAD SIDE
+# ==================
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Stamps request_id on records and drops the INFO/DEBUG chatter of
+    requests that were not sampled.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        if context is None:
+            record.request_id = None
+            return True
+        record.request_id = context["request_id"]
+        return context["sampled"] or record.levelno >= logging.WARNING
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: a full queue drops the record"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge args into the message, but leave formatting to the
+        # listener (the base class formats the whole line here)
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+# ==================
+# LISTENER-THREAD SIDE
+# ==================
+
+
+class RedactingFilter(logging.Filter):
+    """
+    Masks secrets in the final message.
+
+    Args:
+        secret_values: Exact strings to mask (API keys, tokens)
+    """
+
+    CREDENTIAL_RE = re.compile(
+        r"(?i)\b(api[_-]?key|x-api-key|token|password|passwd|secret|authorization)"
+        r"(\s*[:=]\s*|'\s*:\s*'|\"\s*:\s*\")(bearer\s+)?([^\s,;'\"&}]+)"
+    )
+
+    def __init__(self, secret_values: Iterable[str] = ()):
+        super().__init__()
+        # Longest first, so a secret containing another is masked whole
+        self.secret_values = sorted({s for s in secret_values if s and len(s) >= 4}, key=len, reverse=True)
+
+    def redact(self, text: str) -> str:
+        for value in self.secret_values:
+            if value in text:
+                text = text.replace(value, "[REDACTED]")
+        return self.CREDENTIAL_RE.sub(lambda m: f"{m.group(1)}{m.group(2)}{m.group(3) or ''}[REDACTED]", text)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.msg = self.redact(record.getMessage())
+        record.args = None
+        if record.exc_text:
+            record.exc_text = self.redact(record.exc_text)
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+# ==================
+# SETUP
+# ==================
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """
+    "whisper=WARNING,services.lexicon=DEBUG" -> {logger name: level}.
+    Stage names expand to their loggers; unknown names are logger names.
+
+    Raises:
+        ValueError: Malformed entry or unknown level
+    """
+    levels: Dict[str, int] = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, sep, level_name = item.partition("=")
+        level = logging.getLevelName(level_name.strip().upper())
+        if not sep or not isinstance(level, int):
+            raise ValueError(f"Invalid LOG_LEVELS entry: {item!r}")
+        for logger_name in STAGE_LOGGERS.get(name.strip(), (name.strip(),)):
+            levels[logger_name] = level
+    return levels
+
+
+def setup_logging(
+    level: str = "INFO",
+    json_format: bool = False,
+    levels: Optional[Dict[str, int]] = None,
+    secret_values: Iterable[str] = (),
+    use_queue: bool = True,
+) -> Optional[DroppingQueueHandler]:
+    """
+    Configure the root logger.
+
+    Args:
+        level: Root level
+        json_format: JSON lines instead of the text format
+        levels: Per-logger levels (see parse_levels)
+        secret_values: Strings that must never reach the output
+        use_queue: Write through a QueueListener thread (False = write
+                   directly, e.g. in pool worker processes)
+
+    Returns:
+        The queue handler (for its dropped counter), or None without a queue
+    """
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+    output.addFilter(RedactingFilter(secret_values))
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.setLevel(level.upper())
+    for name, logger_level in (levels or {}).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    if not use_queue:
+        output.addFilter(RequestContextFilter())
+        root.addHandler(output)
+        return None
+
+    handler = DroppingQueueHandler(queue.Queue(maxsize=QUEUE_SIZE))
+    handler.addFilter(RequestContextFilter())
+    listener = logging.handlers.QueueListener(handler.queue, output, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    root.addHandler(handler)
+    return handler
+
+
+def setup_logging_from_env(use_queue: bool = True) -> Optional[DroppingQueueHandler]:
+    """setup_logging() configured by LOG_LEVEL, LOG_FORMAT, LOG_LEVELS and the secrets in the env"""
+    return setup_logging(
+        level=os.getenv("LOG_LEVEL", "INFO"),
+        json_format=os.getenv("LOG_FORMAT", "text").lower() == "json",
+        levels=parse_levels(os.getenv("LOG_LEVELS", "")),
+        secret_values=[os.getenv("API_KEY", ""), os.getenv("PROFILE_TOKEN", "")],
+        use_queue=use_queue,
+    )
+
+
+class RequestLogContextMiddleware:
+    """
+    ASGI middleware: a request ID (X-Request-ID, echoed back) and the
+    sampling decision for the request's log chatter.
+
+    Args:
+        app: Wrapped ASGI app
+        sample_rate: Fraction of requests whose INFO/DEBUG records are kept
+    """
+
+    HEADER = b"x-request-id"
+
+    def __init__(self, app, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope.get("headers") or []).get(self.HEADER, b"").decode("latin-1")
+        request_id = incoming if REQUEST_ID_RE.match(incoming) else secrets.token_hex(8)
+        sampled = self.sample_rate >= 1.0 or random.random() < self.sample_rate
+        token = _log_context.set({"request_id": request_id, "sampled": sampled})
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (self.HEADER, request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            _log_context.reset(token)
@@ -0,0 +1,287 @@
+"""
+Metrics
+=======
+Per-stage latency instrumentation for the analysis pipeline.
+
+- metrics.stage("decode") times one stage, as a context manager (also
+  around awaits) or as a decorator. Every stage gets a latency histogram,
+  an error counter and an in-flight gauge.
+- StageTimingsMiddleware gives every request its own timing record and
+  returns it in an X-Stage-Timings header (Server-Timing syntax, in ms),
+  e.g. "ingest;dur=3.1, decode;dur=41.7, whisper;dur=812.4". It also
+  counts requests and their latency per route.
+- render() writes everything in the Prometheus text format for /metrics.
+
+Stage times measured on the event loop include waiting for a pool slot,
+which is exactly what a latency budget has to account for.
+
+No third-party client library: the histograms are a few counters each.
+"""
+
+import asyncio
+import functools
+import math
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Seconds; covers everything from text analyzers (ms) to long Whisper runs
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Stage times of the request being handled ({stage: seconds})
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)"""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last one is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        total = 0
+        rows = []
+        for bound, count in zip(self.buckets + (math.inf,), self.counts):
+            total += count
+            rows.append(("+Inf" if bound == math.inf else repr(bound), total))
+        return rows
+
+
+class _StageTimer:
+    """Context manager / decorator produced by MetricsRegistry.stage()"""
+
+    def __init__(self, registry: "MetricsRegistry", name: str):
+        self.registry = registry
+        self.name = name
+        self._t0 = 0.0
+
+    def __enter__(self):
+        self.registry._enter(self.name)
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.registry._exit(self.name, time.perf_counter() - self._t0, error=exc_type is not None)
+        return False
+
+    def __call__(self, func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with _StageTimer(self.registry, self.name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _StageTimer(self.registry, self.name):
+                return func(*args, **kwargs)
+        return wrapper
+
+
+class MetricsRegistry:
+    """
+    Stage and request metrics of one process.
+
+    Args:
+        namespace: Prefix of every metric name
+        buckets: Histogram bucket bounds in seconds
+    """
+
+    def __init__(self, namespace: str = "scam_analyzer", buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._stage_seconds: Dict[str, Histogram] = {}
+        self._stage_errors: Dict[str, int] = {}
+        self._stage_in_flight: Dict[str, int] = {}
+        self._request_seconds: Dict[str, Histogram] = {}
+        self._requests: Dict[Tuple[str, str, int], int] = {}
+        self._requests_in_flight = 0
+
+    # ==================
+    # STAGES
+    # ==================
+
+    def stage(self, name: str) -> _StageTimer:
+        """Time a stage: `with metrics.stage("decode"):` or `@metrics.stage("decode")`"""
+        return _StageTimer(self, name)
+
+    def observe(self, name: str, seconds: float, error: bool = False):
+        """Record a stage duration measured elsewhere (e.g. inside a worker)"""
+        with self._lock:
+            self._record(name, seconds, error)
+        self._add_to_request(name, seconds)
+
+    def _enter(self, name: str):
+        with self._lock:
+            self._stage_in_flight[name] = self._stage_in_flight.get(name, 0) + 1
+
+    def _exit(self, name: str, seconds: float, error: bool):
+        with self._lock:
+            self._stage_in_flight[name] -= 1
+            self._record(name, seconds, error)
+        self._add_to_request(name, seconds)
+
+    def _record(self, name: str, seconds: float, error: bool):
+        histogram = self._stage_seconds.get(name)
+        if histogram is None:
+            histogram = self._stage_seconds[name] = Histogram(self.buckets)
+            self._stage_errors.setdefault(name, 0)
+            self._stage_in_flight.setdefault(name, 0)
+        histogram.observe(seconds)
+        if error:
+            self._stage_errors[name] += 1
+
+    @staticmethod
+    def _add_to_request(name: str, seconds: float):
+        timings = _request_timings.get()
+        if timings is not None:
+            # A stage that runs twice in one request (e.g. retries) adds up
+            timings[name] = timings.get(name, 0.0) + seconds
+
+    # ==================
+    # REQUESTS
+    # ==================
+
+    def _request_started(self):
+        with self._lock:
+            self._requests_in_flight += 1
+
+    def _request_finished(self, route: str, method: str, status: int, seconds: float):
+        with self._lock:
+            self._requests_in_flight -= 1
+            key = (route, method, status)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            histogram = self._request_seconds.get(route)
+            if histogram is None:
+                histogram = self._request_seconds[route] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    # ==================
+    # EXPOSITION
+    # ==================
+
+    def render(self, extra: Optional[Dict[str, Tuple[str, str, Dict[Tuple[Tuple[str, str], ...], float]]]] = None) -> str:
+        """
+        Prometheus text exposition format.
+
+        Args:
+            extra: Values owned by other components (pools, caches),
+                   {name: (type, help, {labels: value})} where type is
+                   "gauge" or "counter" and labels is a tuple of (label, value) pairs
+        """
+        ns = self.namespace
+        lines: List[str] = []
+
+        def header(name: str, kind: str, help_text: str):
+            lines.append(f"# HELP {ns}_{name} {help_text}")
+            lines.append(f"# TYPE {ns}_{name} {kind}")
+
+        def histogram(name: str, label: str, histograms: Dict[str, Histogram]):
+            for key, hist in sorted(histograms.items()):
+                for bound, count in hist.cumulative():
+                    lines.append(f'{ns}_{name}_bucket{{{label}="{key}",le="{bound}"}} {count}')
+                lines.append(f'{ns}_{name}_sum{{{label}="{key}"}} {hist.sum:.6f}')
+                lines.append(f'{ns}_{name}_count{{{label}="{key}"}} {hist.count}')
+
+        with self._lock:
+            header("stage_seconds", "histogram", "Latency of each analysis stage, including pool waits")
+            histogram("stage_seconds", "stage", self._stage_seconds)
+
+            header("stage_errors_total", "counter", "Stage runs that raised")
+            lines.extend(f'{ns}_stage_errors_total{{stage="{k}"}} {v}' for k, v in sorted(self._stage_errors.items()))
+
+            header("stage_in_flight", "gauge", "Stage runs currently in progress")
+            lines.extend(f'{ns}_stage_in_flight{{stage="{k}"}} {v}' for k, v in sorted(self._stage_in_flight.items()))
+
+            header("request_seconds", "histogram", "HTTP request latency per route")
+            histogram("request_seconds", "route", self._request_seconds)
+
+            header("requests_total", "counter", "HTTP requests per route, method and status")
+            lines.extend(
+                f'{ns}_requests_total{{route="{route}",method="{method}",status="{status}"}} {count}'
+                for (route, method, status), count in sorted(self._requests.items())
+            )
+
+            header("requests_in_flight", "gauge", "HTTP requests currently being handled")
+            lines.append(f"{ns}_requests_in_flight {self._requests_in_flight}")
+
+        for name, (kind, help_text, values) in (extra or {}).items():
+            header(name, kind, help_text)
+            for labels, value in values.items():
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{ns}_{name}{{{label_text}}} {value}" if label_text else f"{ns}_{name} {value}")
+
+        return "\n".join(lines) + "\n"
+
+
+def format_stage_timings(timings: Dict[str, float]) -> str:
+    """{stage: seconds} as a Server-Timing style header value in ms"""
+    return ", ".join(f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings.items())
+
+
+class StageTimingsMiddleware:
+    """
+    ASGI middleware: per-request stage timings (X-Stage-Timings header)
+    and request counters/latency per route.
+
+    Args:
+        app: Wrapped ASGI app
+        registry: Where request metrics are recorded
+    """
+
+    HEADER = b"x-stage-timings"
+
+    def __init__(self, app, registry: MetricsRegistry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+        state = {"status": 500}
+        t0 = time.perf_counter()
+        self.registry._request_started()
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+                if timings:
+                    message = dict(message)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (self.HEADER, format_stage_timings(timings).encode("latin-1"))
+                    ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            _request_timings.reset(token)
+            # Route template (bounded label set), not the raw path
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            self.registry._request_finished(
+                route, scope.get("method", ""), state["status"], time.perf_counter() - t0
+            )
+
+
+# Process-wide registry used by the app
+metrics = MetricsRegistry()
@@ -0,0 +1,256 @@
+"""
+Whisper Model Pool
+==================
+Holds N loaded Whisper replicas and hands them out to transcription
+requests, so concurrent calls run in parallel instead of queueing behind
+one model (PyTorch releases the GIL during inference).
+
+- Loading is guarded by a lock: replicas are loaded exactly once, no matter
+  how many requests arrive while the pool is cold
+- warm_up() loads replicas in a background thread at startup; each replica
+  starts serving as soon as it is loaded
+- A failed load is retried by the next request once a backoff has passed
+  (retry_seconds, doubling per consecutive failure up to
+  max_retry_seconds); until then requests fail fast
+- Requests waiting for a free replica form a BOUNDED queue; past that bound
+  acquire() fails fast with PoolBusyError instead of piling up
+- acquire_many() lends a long call extra idle replicas for windowed
+  transcription, without making other requests wait
+- status() reports load state, queue depth and busy replicas for /health
+"""
+
+import logging
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class PoolBusyError(RuntimeError):
+    """Raised when the request queue is full or no replica frees up in time"""
+
+
+class ModelLoadError(RuntimeError):
+    """Raised while the replicas could not be loaded (retried after a backoff)"""
+
+
+def _load_whisper(model_size: str) -> Any:
+    import whisper
+
+    return whisper.load_model(model_size)
+
+
+class WhisperModelPool:
+    """
+    Pool of Whisper model replicas.
+
+    Args:
+        model_size: Whisper model to load (tiny/base/small/medium/large)
+        replicas: Number of model copies (each is a full model in memory)
+        max_waiting: Requests allowed to wait for a replica before rejecting
+        loader: Function model_size -> model (default: whisper.load_model)
+        retry_seconds: Wait after a failed load before a request retries it
+        max_retry_seconds: Cap of the doubling wait between retries
+    """
+
+    def __init__(
+        self,
+        model_size: str = "base",
+        replicas: int = 1,
+        max_waiting: int = 8,
+        loader: Optional[Callable[[str], Any]] = None,
+        retry_seconds: float = 30.0,
+        max_retry_seconds: float = 600.0,
+    ):
+        self.model_size = model_size
+        self.replicas = max(1, replicas)
+        self.max_waiting = max(0, max_waiting)
+        self._loader = loader or _load_whisper
+        self.retry_seconds = max(0.0, retry_seconds)
+        self.max_retry_seconds = max(self.retry_seconds, max_retry_seconds)
+
+        # Idle replicas; a request takes one out and puts it back when done
+        self._idle: "queue.Queue[Any]" = queue.Queue(maxsize=self.replicas)
+
+        self._lock = threading.Lock()
+        self._state = "cold"  # cold -> warming -> ready (or failed -> warming)
+        self._error: Optional[str] = None
+        self._failures = 0  # Consecutive failed loads
+        self._retry_at = 0.0  # time.monotonic() after which a failed load is retried
+        self._loaded = 0
+        self._busy = 0
+        self._waiting = 0
+        self._load_seconds: List[float] = []
+        self._warm_thread: Optional[threading.Thread] = None
+
+    # ==================
+    # LOADING
+    # ==================
+
+    def warm_up(self, background: bool = True):
+        """
+        Start loading every replica (only the first call has any effect,
+        unless loading failed and its retry backoff has passed).
+
+        Args:
+            background: Load in a daemon thread; otherwise block until done
+        """
+        with self._lock:
+            if self._state == "failed" and time.monotonic() >= self._retry_at:
+                logger.info(f"🔁 Retrying Whisper load (failed {self._failures} time(s))")
+                self._state = "cold"
+                self._error = None
+            if self._state != "cold":
+                return
+            self._state = "warming"
+            logger.info(f"⏳ Warming up {self.replicas} Whisper {self.model_size} replica(s)...")
+            if background:
+                self._warm_thread = threading.Thread(
+                    target=self._load_replicas, name="whisper-warmup", daemon=True
+                )
+                self._warm_thread.start()
+                return
+        self._load_replicas()
+
+    def _load_replicas(self):
+        for number in range(1, self.replicas + 1):
+            try:
+                t0 = time.time()
+                model = self._loader(self.model_size)
+                elapsed = time.time() - t0
+            except Exception as e:
+                logger.error(f"Failed to load Whisper replica {number}: {str(e)}")
+                with self._lock:
+                    self._error = str(e)
+                    if self._loaded == 0:
+                        self._failures += 1
+                        delay = min(
+                            self.retry_seconds * 2 ** (self._failures - 1), self.max_retry_seconds
+                        )
+                        self._retry_at = time.monotonic() + delay
+                        self._state = "failed"
+                        logger.warning(f"⚠️ Whisper load will be retried in {delay:.0f}s")
+                        return
+                break
+
+            with self._lock:
+                self._loaded += 1
+                self._load_seconds.append(elapsed)
+            self._idle.put(model)  # Serves requests right away
+            logger.info(f"✅ Whisper replica {number}/{self.replicas} loaded in {elapsed:.1f}s")
+
+        with self._lock:
+            self._state = "ready"
+            self._failures = 0
+
+    # ==================
+    # REQUESTS
+    # ==================
+
+    @contextmanager
+    def acquire(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Borrow a replica for one transcription (loads the pool if still cold).
+
+        Raises:
+            PoolBusyError: The wait queue is full or timeout expired
+            ModelLoadError: The models could not be loaded (and the retry
+                            backoff has not passed yet)
+        """
+        self.warm_up()
+
+        with self._lock:
+            if self._state == "failed":
+                raise ModelLoadError(
+                    f"Whisper loading failed: {self._error} "
+                    f"(retrying in {self._retry_in():.0f}s)"
+                )
+            if self._idle.empty() and self._waiting >= self.max_waiting:
+                raise PoolBusyError(
+                    f"Transcription queue full ({self._waiting} waiting, {self._busy} busy)"
+                )
+            self._waiting += 1
+
+        try:
+            model = self._take(timeout)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+        with self._lock:
+            self._busy += 1
+        try:
+            yield model
+        finally:
+            with self._lock:
+                self._busy -= 1
+            self._idle.put(model)
+
+    @contextmanager
+    def acquire_many(self, count: int, timeout: Optional[float] = None) -> Iterator[List[Any]]:
+        """
+        Borrow one replica (queued exactly like acquire()) plus up to
+        count - 1 more that are idle right now, so one long call can be
+        split across replicas. Extra replicas are never waited for and are
+        only taken while no other request is waiting.
+        """
+        with self.acquire(timeout) as model:
+            extra = []
+            with self._lock:
+                while len(extra) < count - 1 and self._waiting == 0:
+                    try:
+                        extra.append(self._idle.get_nowait())
+                    except queue.Empty:
+                        break
+                self._busy += len(extra)
+            try:
+                yield [model] + extra
+            finally:
+                with self._lock:
+                    self._busy -= len(extra)
+                for replica in extra:
+                    self._idle.put(replica)
+
+    def _take(self, timeout: Optional[float]) -> Any:
+        """Wait for an idle replica, noticing if loading fails meanwhile"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = 1.0 if deadline is None else min(1.0, deadline - time.monotonic())
+            if wait <= 0:
+                raise PoolBusyError("Timed out waiting for a Whisper replica")
+            try:
+                return self._idle.get(timeout=wait)
+            except queue.Empty:
+                if self._state == "failed":
+                    raise ModelLoadError(f"Whisper loading failed: {self._error}")
+
+    # ==================
+    # MONITORING
+    # ==================
+
+    def _retry_in(self) -> float:
+        return max(0.0, self._retry_at - time.monotonic())
+
+    @property
+    def is_ready(self) -> bool:
+        return self._loaded > 0
+
+    def status(self) -> Dict:
+        """Snapshot of the pool for health checks"""
+        with self._lock:
+            return {
+                "state": self._state,
+                "model_size": self.model_size,
+                "replicas": self.replicas,
+                "loaded": self._loaded,
+                "busy": self._busy,
+                "idle": self._loaded - self._busy,
+                "queue_depth": self._waiting,
+                "max_queue": self.max_waiting,
+                "load_seconds": [round(s, 2) for s in self._load_seconds],
+                "error": self._error,
+                "retry_in_seconds": round(self._retry_in(), 1) if self._state == "failed" else None,
+            }
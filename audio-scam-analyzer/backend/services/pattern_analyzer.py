@@ -12,24 +12,24 @@ This is the "intelligence" layer - where we identify:
 
 Uses keyword matching + linguistic heuristics (no ML model needed for demo).
 Production version could use fine-tuned transformers.
+
+PatternStream runs the same detectors over a transcript that arrives one
+segment at a time (risk timeline, live calls), scanning each segment once.
 """
 
 import re
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Tuple, Set, Optional, Iterable
 import logging
 
 from utils.constants import (
-    URGENCY_KEYWORDS,
-    BANKING_KEYWORDS,
-    AUTHORITY_KEYWORDS,
-    FEAR_KEYWORDS,
     TRUST_KEYWORDS,
-    OTP_KEYWORDS,
     SAFE_INDICATORS,
     HINDI_INDICATORS,
     TAMIL_INDICATORS,
+    REQUEST_INDICATORS,
     EXPLANATION_TEMPLATES,
 )
+from services.lexicon import LexiconIndex
 
 logger = logging.getLogger(__name__)
 
@@ -67,75 +67,125 @@ class PatternAnalyzer:
     Organized by social engineering attack type.
     """
 
+    # Shared-lexicon categories read by the detectors (whole-word matches)
+    KEYWORD_CATEGORIES = (
+        "urgency",
+        "banking",
+        "authority",
+        "fear",
+        "otp",
+        *(f"hindi_{name}" for name in HINDI_INDICATORS),
+        *(f"tamil_{name}" for name in TAMIL_INDICATORS),
+    )
+
+    # Contextual cues matched against the text itself
+    AUTHORITY_CLAIM_PATTERNS = [
+        r"(this is|i['\s]*am|calling from|from the)\s+",
+        r"(official|representative of)",
+    ]
+    INFORMATION_REQUEST_PATTERNS = [
+        r"(can you|could you|would you)\s+(provide|share|tell|give).*(account|number|password|otp|card)",
+        r"(provide|share|tell|give).*(account number|card number|password|otp|pin)",
+        r"(verify|confirm)\s+(your|the)\s+(account|identity|password)",
+    ]
+
     def __init__(self):
         """Initialize pattern analyzer"""
         logger.info("PatternAnalyzer initialized")
 
-    def analyze_text(self, text: str, language: str = "en") -> List[PatternMatch]:
+    def analyze_text(
+        self, text: str, language: str = "en", index: Optional[LexiconIndex] = None
+    ) -> List[PatternMatch]:
         """
         Analyze transcribed text for scam patterns.
 
         Args:
             text: Transcribed call text
             language: Language code for multilingual detection
+            index: Shared LexiconIndex for this transcript (built if omitted)
 
         Returns:
             List of detected patterns with risk scores
         """
-        text_lower = text.lower()
-        patterns = []
+        index = index or LexiconIndex(text)
 
-        # 1. Check for OTP/credential requests (HIGHEST PRIORITY)
-        otp_match = self._detect_otp_request(text_lower)
-        if otp_match:
-            patterns.append(otp_match)
+        # Keyword hits for every category come from the shared one-pass index
+        hits = self.collect_hits(index)
+        patterns = self.detect(index.text_lower, language, hits)
 
-        # 2. Check for artificial urgency
-        urgency_match = self._detect_urgency(text_lower)
-        if urgency_match:
-            patterns.append(urgency_match)
+        logger.info(f"Pattern analysis complete: {len(patterns)} patterns detected")
+        return patterns
 
-        # 3. Check for authority impersonation
-        authority_match = self._detect_authority_impersonation(text_lower)
-        if authority_match:
-            patterns.append(authority_match)
+    def collect_hits(self, index: LexiconIndex) -> Dict[str, List[str]]:
+        """Keyword hits the detectors read, by category"""
+        hits = {category: index.words(category) for category in self.KEYWORD_CATEGORIES}
+        hits["request_indicators"] = index.substrings("request_indicators")
+        return hits
 
-        # 4. Check for fear-based language
-        fear_match = self._detect_fear_tactics(text_lower)
-        if fear_match:
-            patterns.append(fear_match)
+    def detect(
+        self,
+        text: str,
+        language: str,
+        hits: Dict[str, List[str]],
+        skip: Iterable[str] = (),
+    ) -> List[PatternMatch]:
+        """
+        Run the detectors on keyword hits.
 
-        # 5. Check for financial exploitation
-        finance_match = self._detect_financial_targeting(text_lower)
-        if finance_match:
-            patterns.append(finance_match)
+        Args:
+            text: Lowercased text (for the contextual cues, unless hits
+                  already carries "authority_claims"/"information_requests")
+            language: Language code for multilingual detection
+            hits: Keyword hits by category (see collect_hits)
+            skip: Single-pattern detectors not to run, by pattern name
+                  (PatternStream skips patterns that already fired)
 
-        # 6. Check for info requests (combined with other patterns)
-        info_match = self._detect_information_requests(text_lower)
-        if info_match:
-            patterns.append(info_match)
+        Returns:
+            List of detected patterns with risk scores
+        """
+        detectors = [
+            # 1. Check for OTP/credential requests (HIGHEST PRIORITY)
+            ("OTP/Credential Request", self._detect_otp_request),
+            # 2. Check for artificial urgency
+            ("Artificial Urgency", self._detect_urgency),
+            # 3. Check for authority impersonation
+            ("Authority Impersonation", self._detect_authority_impersonation),
+            # 4. Check for fear-based language
+            ("Fear-Based Pressure", self._detect_fear_tactics),
+            # 5. Check for financial exploitation
+            ("Financial Information Targeting", self._detect_financial_targeting),
+            # 6. Check for info requests (combined with other patterns)
+            ("Information Request", self._detect_information_requests),
+        ]
+        skip = set(skip)
+        patterns = []
+        for pattern_name, detector in detectors:
+            if pattern_name in skip:
+                continue
+            match = detector(text, hits)
+            if match:
+                patterns.append(match)
 
         # 7. Multilingual pattern detection
         if language != "en":
             multilingual_matches = self._detect_multilingual_patterns(
-                text_lower, language
+                text, language, hits
             )
             patterns.extend(multilingual_matches)
 
-        logger.info(f"Pattern analysis complete: {len(patterns)} patterns detected")
         return patterns
 
-    def _detect_otp_request(self, text: str) -> PatternMatch | None:
+    def _detect_otp_request(self, text: str, hits: Dict[str, List[str]]) -> PatternMatch | None:
         """
         🚨 CRITICAL: Detect OTP or credential requests.
         Legitimate institutions NEVER request OTPs via phone.
         This is an absolute red flag.
         """
-        keywords_found = self._find_keywords(text, OTP_KEYWORDS)
+        keywords_found = hits["otp"]
 
         if len(keywords_found) > 0:
             # Check if it's a request for the OTP (not just mention)
-            if self._is_request_pattern(text, keywords_found):
+            if self._is_request_pattern(text, keywords_found, hits["request_indicators"]):
                 logger.warning("🚨 OTP request detected!")
                 return PatternMatch(
                     pattern_name="OTP/Credential Request",
@@ -147,12 +197,12 @@ class PatternAnalyzer:
 
         return None
 
-    def _detect_urgency(self, text: str) -> PatternMatch | None:
+    def _detect_urgency(self, text: str, hits: Dict[str, List[str]]) -> PatternMatch | None:
         """
         Detect artificial urgency and time pressure.
         Scammers use urgency to prevent victims from thinking clearly.
         """
-        keywords_found = self._find_keywords(text, URGENCY_KEYWORDS)
+        keywords_found = hits["urgency"]
 
         if len(keywords_found) >= 2:  # Need multiple urgency markers
             logger.warning(f"⚠️ Urgency detected: {keywords_found}")
@@ -169,16 +219,18 @@ class PatternAnalyzer:
 
         return None
 
-    def _detect_authority_impersonation(self, text: str) -> PatternMatch | None:
+    def _detect_authority_impersonation(
+        self, text: str, hits: Dict[str, List[str]]
+    ) -> PatternMatch | None:
         """
         Detect impersonation of legitimate institutions.
         Scammers claim to be: banks, RBI, police, tax authorities, etc.
         """
-        authority_keywords = self._find_keywords(text, AUTHORITY_KEYWORDS)
+        authority_keywords = hits["authority"]
 
         if len(authority_keywords) > 0:
             # Check if it's a claim or statement (not just mention)
-            if self._is_authority_claim(text, authority_keywords):
+            if self._is_authority_claim(text, authority_keywords, hits.get("authority_claims")):
                 logger.warning(f"👤 Authority impersonation detected: {authority_keywords}")
                 authority = authority_keywords[0]
                 explanation = EXPLANATION_TEMPLATES["authority_fake"].format(
@@ -194,12 +246,12 @@ class PatternAnalyzer:
 
         return None
 
-    def _detect_fear_tactics(self, text: str) -> PatternMatch | None:
+    def _detect_fear_tactics(self, text: str, hits: Dict[str, List[str]]) -> PatternMatch | None:
         """
         Detect fear-based manipulation language.
         Scammers use threats: "your account will be closed", "you'll face legal action", etc.
         """
-        fear_keywords = self._find_keywords(text, FEAR_KEYWORDS)
+        fear_keywords = hits["fear"]
 
         if len(fear_keywords) >= 2:
             logger.warning(f"😨 Fear tactics detected: {fear_keywords}")
@@ -216,12 +268,14 @@ class PatternAnalyzer:
 
         return None
 
-    def _detect_financial_targeting(self, text: str) -> PatternMatch | None:
+    def _detect_financial_targeting(
+        self, text: str, hits: Dict[str, List[str]]
+    ) -> PatternMatch | None:
         """
         Detect targeting of financial information or money.
         Multiple banking keywords = exploitation attempt.
         """
-        banking_keywords = self._find_keywords(text, BANKING_KEYWORDS)
+        banking_keywords = hits["banking"]
 
         if len(banking_keywords) >= 3:
             logger.warning(f"💰 Financial targeting detected: {banking_keywords}")
@@ -238,31 +292,37 @@ class PatternAnalyzer:
 
         return None
 
-    def _detect_information_requests(self, text: str) -> PatternMatch | None:
+    def _detect_information_requests(
+        self, text: str, hits: Optional[Dict[str, List[str]]] = None
+    ) -> PatternMatch | None:
         """
         Detect requests for sensitive personal or financial information.
-        """
-        request_phrases = [
-            r"(can you|could you|would you)\s+(provide|share|tell|give).*(account|number|password|otp|card)",
-            r"(provide|share|tell|give).*(account number|card number|password|otp|pin)",
-            r"(verify|confirm)\s+(your|the)\s+(account|identity|password)",
-        ]
 
-        for pattern in request_phrases:
-            if re.search(pattern, text, re.IGNORECASE):
-                logger.warning("Information request detected")
-                return PatternMatch(
-                    pattern_name="Information Request",
-                    matched_keywords=["account/password request"],
-                    risk_score=30,
-                    explanation="🔑 Request for sensitive account or personal information detected",
-                    confidence=0.85,
-                )
+        hits["information_requests"], when present, holds requests already
+        found (PatternStream); otherwise the text is checked directly.
+        """
+        requests = (hits or {}).get("information_requests")
+        if requests is None:
+            requests = [
+                pattern
+                for pattern in self.INFORMATION_REQUEST_PATTERNS
+                if re.search(pattern, text, re.IGNORECASE)
+            ][:1]
+
+        if requests:
+            logger.warning("Information request detected")
+            return PatternMatch(
+                pattern_name="Information Request",
+                matched_keywords=["account/password request"],
+                risk_score=30,
+                explanation="🔑 Request for sensitive account or personal information detected",
+                confidence=0.85,
+            )
 
         return None
 
     def _detect_multilingual_patterns(
-        self, text: str, language: str
+        self, text: str, language: str, hits: Dict[str, List[str]]
     ) -> List[PatternMatch]:
         """
         Detect patterns in non-English languages.
@@ -271,7 +331,7 @@ class PatternAnalyzer:
         matches = []
 
         if language == "hi":  # Hindi
-            hindi_urgency = self._find_keywords(text, HINDI_INDICATORS["urgency"])
+            hindi_urgency = hits["hindi_urgency"]
             if len(hindi_urgency) > 0:
                 matches.append(
                     PatternMatch(
@@ -285,7 +345,7 @@ class PatternAnalyzer:
         
         elif language == "ta":  # Tamil
             # 1. Tamil Urgency
-            tamil_urgency = self._find_keywords(text, TAMIL_INDICATORS["urgency"])
+            tamil_urgency = hits["tamil_urgency"]
             if len(tamil_urgency) >= 2:
                 matches.append(PatternMatch(
                     pattern_name="Tamil Urgency",
@@ -296,7 +356,7 @@ class PatternAnalyzer:
                 ))
             
             # 2. Tamil Banking/Financial
-            tamil_banking = self._find_keywords(text, TAMIL_INDICATORS["banking"])
+            tamil_banking = hits["tamil_banking"]
             if len(tamil_banking) >= 2:
                 matches.append(PatternMatch(
                     pattern_name="Tamil Financial Target",
@@ -307,7 +367,7 @@ class PatternAnalyzer:
                 ))
 
             # 3. Tamil OTP Request
-            tamil_otp = self._find_keywords(text, TAMIL_INDICATORS["otp"])
+            tamil_otp = hits["tamil_otp"]
             if len(tamil_otp) >= 1:
                 matches.append(PatternMatch(
                     pattern_name="Tamil OTP Request",
@@ -323,57 +383,43 @@ class PatternAnalyzer:
     # HELPER METHODS
     # ==================
 
-    def _find_keywords(self, text: str, keyword_list: List[str]) -> List[str]:
-        """
-        Find all keywords from a list that appear in text.
-        Returns unique keywords found (case-insensitive).
-        """
-        found = set()
-        for keyword in keyword_list:
-            # Use word boundary to avoid partial matches
-            pattern = r"\b" + re.escape(keyword) + r"\b"
-            if re.search(pattern, text, re.IGNORECASE):
-                found.add(keyword.lower())
-
-        return list(found)
-
-    def _is_request_pattern(self, text: str, keywords: List[str]) -> bool:
+    def _is_request_pattern(
+        self, text: str, keywords: List[str], request_words: Optional[List[str]] = None
+    ) -> bool:
         """
         Check if keywords are used in a REQUEST context.
         E.g., "tell me your OTP" vs "I received an OTP"
+
+        request_words are the REQUEST_INDICATORS already found by the
+        lexicon index; when omitted the text is checked directly.
         """
-        request_indicators = [
-            "tell",
-            "provide",
-            "share",
-            "give",
-            "send",
-            "confirm",
-            "verify",
-            "please",
-        ]
+        if request_words is not None:
+            return len(request_words) > 0
 
         # Look for request keywords near OTP keywords
         text_window = text  # Full text for hackathon (production: use context windows)
 
-        for req_word in request_indicators:
+        for req_word in REQUEST_INDICATORS:
             if req_word in text_window:
                 # Found request pattern
                 return True
 
         return False
 
-    def _is_authority_claim(self, text: str, authority_keywords: List[str]) -> bool:
+    def _is_authority_claim(
+        self, text: str, authority_keywords: List[str], claims: Optional[List[str]] = None
+    ) -> bool:
         """
         Check if the text contains a CLAIM of being an authority.
         E.g., "This is the bank calling" vs "I was contacting the bank"
+
+        claims are claim phrases already found (PatternStream); when omitted
+        the text is checked directly.
         """
-        claim_patterns = [
-            r"(this is|i['\s]*am|calling from|from the)\s+",
-            r"(official|representative of)",
-        ]
+        if claims is not None:
+            return len(claims) > 0
 
-        for pattern in claim_patterns:
+        for pattern in self.AUTHORITY_CLAIM_PATTERNS:
             if re.search(pattern, text, re.IGNORECASE):
                 return True
 
@@ -392,3 +438,119 @@ class PatternAnalyzer:
             summary_parts.append(f"• {pattern.pattern_name}: {pattern.explanation}")
 
         return "\n".join(summary_parts)
+
+
+class PatternStream:
+    """
+    Incremental PatternAnalyzer for a transcript that arrives segment by
+    segment (Whisper segments, live audio).
+
+    Each feed() scans only the new segment plus a short tail of the text
+    before it: keyword hits and contextual cues accumulate, and only
+    detectors whose pattern has not fired yet are re-run on the
+    accumulated hits. Total work stays linear in transcript length instead
+    of rescanning the growing prefix.
+
+    The tail makes the result independent of where segments are cut (the
+    stream reads like the segments joined by spaces): a multi-word keyword
+    ("act now") or a request phrase split across a boundary is still
+    found. Keyword hits that end inside the tail were counted with the
+    previous segment and are skipped. For "A.*B" requests the stream also
+    remembers whether A was seen in any earlier segment, so A and B may be
+    arbitrarily far apart, as they may be in the full transcript.
+
+    Args:
+        analyzer: PatternAnalyzer whose detectors are used
+        language: Language code for multilingual detection
+        carry_chars: Characters of earlier text kept as the tail (longer
+                     than any keyword or cue phrase)
+    """
+
+    CUE_CATEGORIES = ("authority_claims", "information_requests")
+
+    def __init__(
+        self,
+        analyzer: Optional[PatternAnalyzer] = None,
+        language: str = "en",
+        carry_chars: int = 200,
+    ):
+        self.analyzer = analyzer or PatternAnalyzer()
+        self.language = language
+        self.carry_chars = carry_chars
+
+        # category -> keywords found so far (dict keeps first-appearance order)
+        self._hits: Dict[str, Dict[str, None]] = {
+            category: {} for category in (
+                *PatternAnalyzer.KEYWORD_CATEGORIES,
+                "request_indicators",
+                "safe_indicators",
+                *self.CUE_CATEGORIES,
+            )
+        }
+        self._fired: Dict[str, PatternMatch] = {}
+        self._tail = ""
+        # "A.*B" request patterns split into (A, B), and whether A was seen
+        self._request_parts = [
+            pattern.split(".*", 1) for pattern in PatternAnalyzer.INFORMATION_REQUEST_PATTERNS
+        ]
+        self._request_heads_seen = [False] * len(self._request_parts)
+
+    @property
+    def patterns(self) -> List[PatternMatch]:
+        """Every pattern fired so far, in firing order"""
+        return list(self._fired.values())
+
+    @property
+    def safe_indicator_count(self) -> int:
+        return len(self._hits["safe_indicators"])
+
+    def feed(self, text: str) -> List[PatternMatch]:
+        """
+        Add the next segment of the transcript.
+
+        Returns:
+            Patterns that fired for the first time with this segment
+        """
+        # Keywords ending in the tail were found with the previous segment;
+        # hits that cross the boundary are new
+        index = LexiconIndex(f"{self._tail} {text}" if self._tail else text, known_prefix=len(self._tail))
+        found = self.analyzer.collect_hits(index)
+        found["safe_indicators"] = index.substrings("safe_indicators")
+
+        window = index.text_lower
+        segment = window[len(self._tail) + 1:] if self._tail else window
+        found["authority_claims"] = [
+            pattern for pattern in PatternAnalyzer.AUTHORITY_CLAIM_PATTERNS
+            if re.search(pattern, window, re.IGNORECASE)
+        ]
+        found["information_requests"] = self._information_requests(window, segment)
+        self._tail = window[-self.carry_chars:]
+
+        for category, keywords in found.items():
+            seen = self._hits[category]
+            for keyword in keywords:
+                seen.setdefault(keyword)
+
+        hits = {category: list(seen) for category, seen in self._hits.items()}
+        new = [
+            match
+            for match in self.analyzer.detect(window, self.language, hits, skip=self._fired)
+            if match.pattern_name not in self._fired
+        ]
+        for match in new:
+            self._fired[match.pattern_name] = match
+        return new
+
+    def _information_requests(self, window: str, segment: str) -> List[str]:
+        requests = []
+        for i, pattern in enumerate(PatternAnalyzer.INFORMATION_REQUEST_PATTERNS):
+            parts = self._request_parts[i]
+            if re.search(pattern, window, re.IGNORECASE) or (
+                len(parts) == 2
+                and self._request_heads_seen[i]
+                and re.search(parts[1], segment, re.IGNORECASE)
+            ):
+                requests.append(pattern)
+            if len(parts) == 2 and not self._request_heads_seen[i]:
+                self._request_heads_seen[i] = re.search(parts[0], window, re.IGNORECASE) is not None
+        return requests
@@ -0,0 +1,227 @@
+"""
+Analysis Pipeline (text stages)
+===============================
+Everything that happens AFTER transcription, in one place, so the live
+/analyze-call endpoint and re-scoring of cached transcripts produce
+identical results:
+
+1. PatternAnalyzer   -> detected patterns
+2. RiskScorer        -> risk score, explanation, timeline
+3. EmotionalToneAnalyzer / EntityExtractor / KnownScamDatabase
+4. Advanced bonus    -> combined final score
+5. AnalysisResponse
+
+/analyze-call runs these stages on its executors in parallel; rescore()
+runs them in sequence against a stored transcript (no audio, no Whisper).
+"""
+
+import logging
+from typing import Dict, List, Optional
+
+from models.schemas import AnalysisResponse, PatternMatch, RiskLevel
+from services.lexicon import LexiconIndex
+from services.risk_scorer import RiskAssessment
+
+logger = logging.getLogger(__name__)
+
+EMPTY_TRANSCRIPTION = "[Inaudible or no speech detected]"
+
+# Results used when an advanced analyzer fails (analysis continues without it)
+VOICE_FALLBACK = {"speaking_rate": 0, "voice_quality_score": 0, "stress_indicators": []}
+EMOTIONAL_FALLBACK = {"manipulation_risk": 0, "tactics_detected": []}
+ENTITY_FALLBACK = {"total_sensitive_items": 0, "entities": [], "information_extraction_risk": 0}
+SCAM_DB_FALLBACK = {"is_known_scam": False, "match_percentage": 0, "top_match": None, "all_matches": []}
+
+
+def fallback_risk_assessment() -> RiskAssessment:
+    """Neutral assessment used when risk scoring itself fails"""
+    return RiskAssessment(
+        risk_score=50,
+        risk_level="MEDIUM_RISK",
+        confidence=0.5,
+        primary_threat="Unable to complete full analysis",
+        explanation="Risk assessment encountered an error but analysis is partial",
+        detected_threats=[],
+        safe_indicators_found=0,
+        pattern_synergy_bonus=0,
+    )
+
+
+def apply_advanced_bonus(
+    risk_assessment: RiskAssessment,
+    voice_analysis: Dict,
+    emotional_analysis: Dict,
+    entity_analysis: Dict,
+    scam_comparison: Dict,
+) -> int:
+    """
+    Combine the advanced analyzers into the final score (in place).
+
+    Returns:
+        Bonus points added
+    """
+    advanced_risk_bonus = 0
+    if entity_analysis["information_extraction_risk"] > 50:
+        advanced_risk_bonus += 10
+    if emotional_analysis["manipulation_risk"] > 50:
+        advanced_risk_bonus += 10
+    if scam_comparison["is_known_scam"]:
+        advanced_risk_bonus += 15
+    if voice_analysis.get("speaking_rate", 0) > 0.7:
+        advanced_risk_bonus += 5
+
+    # Apply bonus (cap total at 100)
+    enhanced_risk_score = min(risk_assessment.risk_score + advanced_risk_bonus, 100)
+
+    if advanced_risk_bonus > 0:
+        risk_assessment.risk_score = enhanced_risk_score
+        # Update risk level if score crossed threshold
+        if enhanced_risk_score >= 85 and risk_assessment.risk_level != "CRITICAL_SCAM":
+            risk_assessment.risk_level = "CRITICAL_SCAM"
+
+    return advanced_risk_bonus
+
+
+def build_response(
+    transcription: str,
+    language: str,
+    duration: float,
+    pattern_dicts: List[Dict],
+    risk_assessment: RiskAssessment,
+    timeline: List[Dict],
+    voice_analysis: Optional[Dict],
+    emotional_analysis: Optional[Dict],
+    entity_analysis: Optional[Dict],
+    scam_comparison: Optional[Dict],
+) -> AnalysisResponse:
+    """Assemble the API response from the stage results"""
+    # Convert risk level to enum (SAFE - cannot crash)
+    risk_level_enum = RiskLevel.__members__.get(
+        str(risk_assessment.risk_level).upper(),
+        RiskLevel.LIKELY_SAFE
+    )
+
+    return AnalysisResponse(
+        success=True,
+        transcription=transcription,
+        risk_score=risk_assessment.risk_score,
+        risk_level=risk_level_enum,
+        detected_patterns=[
+            PatternMatch(
+                pattern_name=p["pattern_name"],
+                keywords=p["keywords"],
+                confidence=p["confidence"],
+                risk_contribution=p["risk_contribution"],
+                explanation=p["explanation"],
+            )
+            for p in pattern_dicts
+        ],
+        primary_threat=risk_assessment.primary_threat,
+        explanation=risk_assessment.explanation,
+        risk_timeline=timeline,
+        call_duration_seconds=duration,
+        language_detected=language,
+        confidence=risk_assessment.confidence,
+        voice_analysis=voice_analysis,
+        emotional_analysis=emotional_analysis,
+        entity_analysis=entity_analysis,
+        known_scam_match=scam_comparison,
+    )
+
+
+class TextAnalysisPipeline:
+    """
+    The text-only analyzers bundled together for re-scoring.
+
+    Args:
+        pattern_analyzer, risk_scorer, emotional_analyzer, entity_extractor,
+        scam_database: The (shared) service instances to run
+    """
+
+    def __init__(self, pattern_analyzer, risk_scorer, emotional_analyzer, entity_extractor, scam_database):
+        self.pattern_analyzer = pattern_analyzer
+        self.risk_scorer = risk_scorer
+        self.emotional_analyzer = emotional_analyzer
+        self.entity_extractor = entity_extractor
+        self.scam_database = scam_database
+
+    def rescore(
+        self,
+        transcription: str,
+        language: str,
+        duration: float,
+        voice_analysis: Optional[Dict] = None,
+        segments: Optional[List[Dict]] = None,
+    ) -> AnalysisResponse:
+        """
+        Run every text stage on an existing transcript.
+
+        Args:
+            transcription: Stored Whisper text
+            language: Detected language of the transcript
+            duration: Call length in seconds
+            voice_analysis: Stored voice features, if any (feeds the bonus)
+            segments: Stored Whisper segment timings (for the risk timeline)
+
+        Returns:
+            AnalysisResponse, as /analyze-call would return it today
+        """
+        transcription = transcription or EMPTY_TRANSCRIPTION
+        index = LexiconIndex(transcription)
+
+        try:
+            pattern_matches = self.pattern_analyzer.analyze_text(transcription, language, index)
+        except Exception as e:
+            logger.error(f"❌ Pattern analysis failed: {str(e)}", exc_info=True)
+            pattern_matches = []
+        pattern_dicts = [p.to_dict() for p in pattern_matches]
+
+        try:
+            risk_assessment = self.risk_scorer.calculate_risk(
+                pattern_dicts, transcription, duration, index
+            )
+        except Exception as e:
+            logger.error(f"❌ Risk scoring failed: {str(e)}", exc_info=True)
+            risk_assessment = fallback_risk_assessment()
+
+        try:
+            timeline = self.risk_scorer.build_risk_timeline(
+                transcription, segments, language, duration, self.pattern_analyzer
+            )
+        except Exception as e:
+            logger.error(f"⚠️ Timeline generation failed: {str(e)}")
+            timeline = []
+
+        emotional_analysis = self._run(
+            "Emotional analysis", EMOTIONAL_FALLBACK,
+            self.emotional_analyzer.analyze_tone, transcription, index,
+        )
+        entity_analysis = self._run(
+            "Entity extraction", ENTITY_FALLBACK,
+            self.entity_extractor.extract_entities, transcription, index,
+        )
+        scam_comparison = self._run(
+            "Scam database comparison", SCAM_DB_FALLBACK,
+            self.scam_database.compare_call_with_campaigns, transcription, index,
+        )
+
+        apply_advanced_bonus(
+            risk_assessment,
+            voice_analysis or VOICE_FALLBACK,
+            emotional_analysis,
+            entity_analysis,
+            scam_comparison,
+        )
+
+        return build_response(
+            transcription, language, duration, pattern_dicts, risk_assessment, timeline,
+            voice_analysis, emotional_analysis, entity_analysis, scam_comparison,
+        )
+
+    @staticmethod
+    def _run(label: str, fallback: Dict, func, *args) -> Dict:
+        try:
+            return func(*args)
+        except Exception as e:
+            logger.error(f"⚠️ {label} failed: {str(e)}")
+            return dict(fallback)
@@ -0,0 +1,404 @@
+"""
+Request Profiling
+=================
+Opt-in cProfile capture for single /analyze-call requests, for the odd call
+that is pathologically slow (very long transcript, unusual codec).
+
+- ProfilingMiddleware decides per request: an X-Profile-Token header that
+  matches the configured token, or a sampled fraction of traffic. A
+  profiled response carries an X-Profile-Id header.
+- While a request is profiled, every job it hands to a StagePool runs
+  under cProfile in the worker that executes it: thread or process alike.
+  Threads a job fans out to (Whisper windows) are covered via propagate().
+- Only one profiler runs per process at a time (from Python 3.12 cProfile
+  allows no more, and it then sees every thread anyway). A job that starts
+  while another holds the profiler runs unprofiled and is marked so in the
+  timeline; a profiler that cannot start or stop never fails the job.
+- The per-job stats are merged into one .prof file (pstats format, opens in
+  snakeviz / `python -m pstats`), plus a .json summary with the job
+  timeline, in a ring directory that keeps the newest PROFILE_MAX_FILES.
+
+Profiles hold function names and timings only, never audio or transcript
+text. When profiling is off the middleware is not installed at all; the
+remaining cost is one ContextVar lookup per pool job.
+"""
+
+import asyncio
+import cProfile
+import hmac
+import io
+import json
+import logging
+import pstats
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile-token"
+PROFILE_ID_RE = re.compile(r"^\d{8}T\d{6}-\d{6}-[0-9a-f]{8}$")
+# Responses whose body is produced while the pipeline still runs
+STREAMED_CONTENT_TYPES = (b"application/x-ndjson", b"text/event-stream")
+
+# Profile of the request being handled (None = not profiled)
+_active_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("active_profile", default=None)
+
+# Stats collected by the pool job running in this thread (see propagate())
+_local = threading.local()
+
+# One active profiler per process (see _start_profiler())
+_profiler_lock = threading.Lock()
+
+# From 3.12 cProfile is built on sys.monitoring: one profiler sees every
+# thread. Before that it only hooks the thread that enabled it.
+_PROFILER_SEES_ALL_THREADS = sys.version_info >= (3, 12)
+
+Stats = Dict[Tuple[str, int, str], Tuple]
+
+
+def current() -> Optional["RequestProfile"]:
+    """Profile of the current request, if it is being profiled"""
+    return _active_profile.get()
+
+
+# ==================
+# WORKER SIDE
+# ==================
+
+
+def _start_profiler(exclusive: bool = True) -> Optional[cProfile.Profile]:
+    """
+    A running profiler, or None when profiling is not possible right now.
+
+    Args:
+        exclusive: Take the process-wide profiler slot (False only for
+                   helper threads of a job that already holds it)
+    """
+    if exclusive and not _profiler_lock.acquire(blocking=False):
+        return None  # Another job of this process is being profiled
+    profile = cProfile.Profile()
+    try:
+        profile.enable()
+    except Exception as e:
+        # e.g. "Another profiling tool is already active" (debugger, coverage)
+        logger.warning(f"⚠️ Profiler not started: {str(e)}")
+        if exclusive:
+            _profiler_lock.release()
+        return None
+    return profile
+
+
+def _stop_profiler(profile: cProfile.Profile, collected: List[Stats], exclusive: bool = True):
+    """Stop a profiler from _start_profiler() and keep its stats"""
+    try:
+        profile.disable()
+        profile.create_stats()
+        collected.append(profile.stats)
+    except Exception as e:
+        logger.warning(f"⚠️ Profiler stats lost: {str(e)}")
+    finally:
+        if exclusive:
+            _profiler_lock.release()
+
+
+def profiled_call(func: Callable, *args) -> Tuple[Any, List[Stats]]:
+    """
+    Run func(*args) under cProfile. Module-level so process pools can
+    pickle it.
+
+    Returns:
+        Tuple of (result, raw stats of this thread and of any threads
+        the job fanned out to through propagate()). The stats are empty
+        when the profiler was busy and the job ran unprofiled.
+    """
+    collected: List[Stats] = []
+    profile = _start_profiler()
+    if profile is None:
+        return func(*args), collected
+
+    _local.collected = collected
+    try:
+        result = func(*args)
+    finally:
+        _local.collected = None
+        _stop_profiler(profile, collected)
+    return result, collected
+
+
+def propagate(func: Callable) -> Callable:
+    """
+    Wrap func before handing it to a helper thread: when the calling job
+    is profiled, the helper thread is profiled into the same request.
+    Returns func unchanged otherwise, and from Python 3.12, where the
+    job's profiler already sees the helper threads.
+    """
+    collected = getattr(_local, "collected", None)
+    if collected is None or _PROFILER_SEES_ALL_THREADS:
+        return func
+
+    def profiled(*args):
+        profile = _start_profiler(exclusive=False)
+        if profile is None:
+            return func(*args)
+        try:
+            return func(*args)
+        finally:
+            _stop_profiler(profile, collected, exclusive=False)
+
+    return profiled
+
+
+# ==================
+# EVENT-LOOP SIDE
+# ==================
+
+
+@dataclass
+class ProfiledJob:
+    """One pool job of a profiled request"""
+    pool: str
+    function: str
+    started: float  # Seconds since the request started
+    seconds: float  # Including the wait for a pool slot
+    profiled: bool = True  # False: the process's profiler was busy
+
+
+@dataclass
+class RequestProfile:
+    """Everything captured for one profiled request"""
+    profile_id: str
+    path: str
+    reason: str  # "header" or "sampled"
+    started_at: str
+    jobs: List[ProfiledJob] = field(default_factory=list)
+    stats: List[Stats] = field(default_factory=list)
+    status: Optional[int] = None
+    wall_seconds: float = 0.0
+    _t0: float = field(default_factory=time.perf_counter, repr=False)
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._t0
+
+    def add_job(self, pool: str, func: Callable, started: float, stats: List[Stats]):
+        name = getattr(func, "__qualname__", None) or getattr(func, "__name__", repr(func))
+        self.jobs.append(
+            ProfiledJob(pool, name, round(started, 4), round(self.elapsed() - started, 4), bool(stats))
+        )
+        self.stats.extend(stats)
+
+
+class _RawStats:
+    """Adapter so pstats.Stats can load raw stats dicts"""
+
+    def __init__(self, stats: Stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class ProfileStore:
+    """
+    Ring directory of request profiles.
+
+    Args:
+        directory: Where .prof/.json files are kept
+        max_profiles: Newest profiles kept; older ones are deleted
+        sample_rate: Fraction of requests profiled without a header (0-1)
+        token: Value of X-Profile-Token that turns profiling on for a
+               request (None = header trigger disabled)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_profiles: int = 50,
+        sample_rate: float = 0.0,
+        token: Optional[str] = None,
+    ):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_profiles = max(1, max_profiles)
+        self.sample_rate = min(max(sample_rate, 0.0), 1.0)
+        self.token = token
+        self._lock = threading.Lock()
+
+    def check_token(self, value: Optional[str]) -> bool:
+        """True if value is the configured profiling token"""
+        return bool(self.token and value) and hmac.compare_digest(value.encode(), self.token.encode())
+
+    def should_profile(self, token: Optional[str]) -> Optional[str]:
+        """Reason to profile this request ("header"/"sampled"), or None"""
+        if token is not None and self.check_token(token):
+            return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    def start(self, path: str, reason: str) -> RequestProfile:
+        now = datetime.now(timezone.utc)
+        return RequestProfile(
+            profile_id=f"{now:%Y%m%dT%H%M%S-%f}-{secrets.token_hex(4)}",  # Sorts by time
+            path=path,
+            reason=reason,
+            started_at=now.isoformat(),
+        )
+
+    def save(self, profile: RequestProfile):
+        """Write the merged .prof and the .json summary, then trim the ring"""
+        profile.wall_seconds = round(profile.elapsed(), 4)
+        summary = {
+            "profile_id": profile.profile_id,
+            "path": profile.path,
+            "reason": profile.reason,
+            "started_at": profile.started_at,
+            "status": profile.status,
+            "wall_seconds": profile.wall_seconds,
+            "jobs": [asdict(job) for job in profile.jobs],
+        }
+        base = self.directory / profile.profile_id
+        if profile.stats:
+            merged = pstats.Stats(*(_RawStats(s) for s in profile.stats))
+            merged.dump_stats(str(base.with_suffix(".prof")))
+            summary["top_functions"] = self._top_functions(merged)
+        base.with_suffix(".json").write_text(json.dumps(summary, indent=2))
+        logger.info(
+            f"🔬 Profile {profile.profile_id} saved ({profile.wall_seconds:.2f}s, {len(profile.jobs)} jobs)"
+        )
+        self._trim()
+
+    @staticmethod
+    def _top_functions(stats: pstats.Stats, limit: int = 15) -> List[Dict]:
+        """Functions with the most own time"""
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:limit]
+        return [
+            {
+                "function": pstats.func_std_string(func),
+                "calls": nc,
+                "own_seconds": round(tt, 4),
+                "cumulative_seconds": round(ct, 4),
+            }
+            for func, (cc, nc, tt, ct, callers) in rows
+        ]
+
+    def _trim(self):
+        with self._lock:
+            ids = sorted(p.stem for p in self.directory.glob("*.json"))
+            for profile_id in ids[:-self.max_profiles]:
+                for suffix in (".json", ".prof"):
+                    (self.directory / profile_id).with_suffix(suffix).unlink(missing_ok=True)
+
+    # ==================
+    # ADMIN ACCESS
+    # ==================
+
+    def list_profiles(self, limit: int = 50) -> List[Dict]:
+        """Summaries, newest first (without the per-function tables)"""
+        summaries = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True)[:limit]:
+            try:
+                summary = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue  # Trimmed or half-written meanwhile
+            summary.pop("top_functions", None)
+            summary["jobs"] = len(summary.get("jobs", []))
+            summaries.append(summary)
+        return summaries
+
+    def get_summary(self, profile_id: str) -> Optional[Dict]:
+        path = self._path(profile_id, ".json")
+        if not path:
+            return None
+        return json.loads(path.read_text())
+
+    def get_prof_path(self, profile_id: str) -> Optional[Path]:
+        return self._path(profile_id, ".prof")
+
+    def render_text(self, profile_id: str, sort: str = "cumulative", limit: int = 60) -> Optional[str]:
+        """pstats report of a profile, for reading without pstats tooling"""
+        path = self._path(profile_id, ".prof")
+        if not path:
+            return None
+        out = io.StringIO()
+        stats = pstats.Stats(str(path), stream=out)
+        stats.sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def _path(self, profile_id: str, suffix: str) -> Optional[Path]:
+        # IDs are generated here; anything else never reaches the filesystem
+        if not PROFILE_ID_RE.match(profile_id):
+            return None
+        path = (self.directory / profile_id).with_suffix(suffix)
+        return path if path.exists() else None
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that turns profiling on for selected requests.
+
+    Args:
+        app: Wrapped ASGI app
+        store: Where profiles are decided and saved
+        paths: Request paths that may be profiled
+    """
+
+    def __init__(self, app, store: ProfileStore, paths: Iterable[str] = ("/analyze-call",)):
+        self.app = app
+        self.store = store
+        self.paths = set(paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        token = dict(scope.get("headers") or []).get(PROFILE_HEADER)
+        reason = self.store.should_profile(token.decode("latin-1") if token else None)
+        if not reason:
+            await self.app(scope, receive, send)
+            return
+
+        profile = self.store.start(scope["path"], reason)
+        context_token = _active_profile.set(profile)
+        state = {"saved": False}
+        loop = asyncio.get_running_loop()
+
+        async def save():
+            if state["saved"]:
+                return
+            state["saved"] = True
+            try:
+                await loop.run_in_executor(None, self.store.save, profile)
+            except OSError as e:
+                # Profiling must never fail the request it observes
+                logger.warning(f"⚠️ Profile {profile.profile_id} not saved: {str(e)}")
+
+        async def profiled_send(message):
+            if message["type"] == "http.response.start":
+                # All pool jobs are done by now (except for streamed
+                # responses, saved when the stream ends); save first so
+                # the file exists as soon as the client sees the ID
+                profile.status = message["status"]
+                content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+                if not content_type.split(b";")[0].strip().startswith(STREAMED_CONTENT_TYPES):
+                    await save()
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile.profile_id.encode())
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, profiled_send)
+        finally:
+            _active_profile.reset(context_token)
+            await save()
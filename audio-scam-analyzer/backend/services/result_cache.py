@@ -0,0 +1,236 @@
+"""
+Analysis Result Cache
+=====================
+Remembers finished analyses so a resubmitted recording (retries, several
+reviewers opening the same case) is answered without decoding or
+transcribing it again.
+
+- Key: SHA-256 of the uploaded bytes (hashed while the upload streams in)
+  + requested language + model size
+- Memory tier: LRU bounded by entry count, entries expire after a TTL
+- Disk tier (optional): one JSON file per entry, same TTL, bounded count.
+  The entry count is tracked as files are written, so the directory is
+  only scanned every DISK_SWEEP_EVERY writes or when the tier overflows
+  (then trimmed to DISK_LOW_WATER of the limit, not to the limit itself)
+
+The disk tier does blocking file I/O: callers on an event loop run get()
+and put() in a thread.
+
+PRIVACY: Only the derived analysis (the AnalysisResponse fields) is
+stored - never the audio itself. The key is a one-way hash.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Writes between expiry sweeps of the disk tier
+DISK_SWEEP_EVERY = 256
+# An overflowing disk tier is trimmed to this fraction of disk_max_entries
+DISK_LOW_WATER = 0.9
+
+
+class ResultCache:
+    """
+    Two-tier LRU + TTL cache of analysis results.
+
+    Args:
+        max_entries: In-memory entries kept (0 disables the memory tier)
+        ttl_seconds: Lifetime of an entry in either tier
+        disk_dir: Directory for the on-disk tier (None = memory only)
+        disk_max_entries: Files kept on disk before the oldest are removed
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl_seconds: float = 3600.0,
+        disk_dir: Optional[Path] = None,
+        disk_max_entries: int = 10_000,
+    ):
+        self.max_entries = max(0, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_entries = disk_max_entries
+
+        # key -> (stored_at, result); most recently used last
+        self._memory: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0}
+
+        # Disk tier bookkeeping (guarded by _lock)
+        self._disk_entries = 0
+        self._writes_since_sweep = 0
+        self._sweeping = False
+        if self.disk_dir:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_entries = sum(1 for _ in self.disk_dir.glob("*.json"))
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 or self.disk_dir is not None
+
+    @staticmethod
+    def make_key(audio_hash: str, language: Optional[str], model_size: str) -> str:
+        """Cache key for an upload (language None = auto-detect)"""
+        return f"{audio_hash}-{language or 'auto'}-{model_size}"
+
+    # ==================
+    # LOOKUP / STORE
+    # ==================
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Stored result for key, or None (expired entries count as misses)"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                stored_at, result = entry
+                if now - stored_at <= self.ttl_seconds:
+                    self._memory.move_to_end(key)
+                    self._stats["hits"] += 1
+                    self._stats["memory_hits"] += 1
+                    return result
+                del self._memory[key]
+
+        result = self._disk_get(key, now)
+        with self._lock:
+            if result is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._stats["disk_hits"] += 1
+            self._memory_put(key, result, now)
+        return result
+
+    def put(self, key: str, result: Dict):
+        """Store a JSON-serializable analysis result"""
+        now = time.time()
+        with self._lock:
+            self._memory_put(key, result, now)
+        self._disk_put(key, result)
+
+    def _memory_put(self, key: str, result: Dict, stored_at: float):
+        if self.max_entries == 0:
+            return
+        self._memory[key] = (stored_at, result)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    # ==================
+    # DISK TIER
+    # ==================
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / f"{key}.json"
+
+    def _disk_get(self, key: str, now: float) -> Optional[Dict]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            if now - path.stat().st_mtime > self.ttl_seconds:
+                self._disk_remove(path)
+                return None
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️ Unreadable cache entry {path.name}: {str(e)}")
+            return None
+
+    def _disk_put(self, key: str, result: Dict):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            existed = path.exists()
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write cache entry: {str(e)}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            if not existed:
+                self._disk_entries += 1
+            self._writes_since_sweep += 1
+            sweep = not self._sweeping and (
+                self._disk_entries > self.disk_max_entries
+                or self._writes_since_sweep >= DISK_SWEEP_EVERY
+            )
+            if sweep:
+                self._sweeping = True
+                self._writes_since_sweep = 0
+        if sweep:
+            try:
+                self._disk_trim()
+            finally:
+                with self._lock:
+                    self._sweeping = False
+
+    def _disk_remove(self, path: Path):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            return
+        with self._lock:
+            self._disk_entries = max(0, self._disk_entries - 1)
+
+    def _disk_trim(self):
+        """
+        Drop expired files, then the oldest ones beyond DISK_LOW_WATER of
+        disk_max_entries (headroom, so the next writes do not scan again)
+        """
+        files = []
+        now = time.time()
+        for path in self.disk_dir.glob("*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except FileNotFoundError:
+                continue
+            if now - mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+            else:
+                files.append((mtime, path))
+
+        keep = self.disk_max_entries
+        if len(files) > self.disk_max_entries:
+            keep = int(self.disk_max_entries * DISK_LOW_WATER)
+        files.sort()
+        evicted = files[:max(0, len(files) - keep)]
+        for _, path in evicted:
+            path.unlink(missing_ok=True)
+        with self._lock:
+            self._stats["evictions"] += len(evicted)
+            self._disk_entries = len(files) - len(evicted)
+
+    # ==================
+    # MONITORING
+    # ==================
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "disk_tier": str(self.disk_dir) if self.disk_dir else None,
+                "disk_entries": self._disk_entries,
+            }
@@ -10,15 +10,19 @@ Risk Scoring Logic:
 2. Each detected pattern adds points (0-100 scale)
 3. Combinations of patterns multiply risk (synergy bonus)
 4. Safe indicators reduce risk (prevent false positives)
-5. Timeline shows how risk evolved over the call
+5. Timeline shows how risk evolved over the call (at real second offsets,
+   from Whisper segment timings)
 
 This layer is the "explainability" differentiator that wins hackathons.
 """
 
 import logging
-from typing import List, Dict, Tuple
+import re
+from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass
-from utils.constants import RISK_FACTORS, RISK_CLASSIFICATION
+from utils.constants import RISK_FACTORS, RISK_CLASSIFICATION, SAFE_INDICATORS
+from services.lexicon import LexiconIndex
+from services.pattern_analyzer import PatternAnalyzer, PatternMatch, PatternStream
 
 logger = logging.getLogger(__name__)
 
@@ -47,7 +51,11 @@ class RiskScorer:
         logger.info("RiskScorer initialized")
 
     def calculate_risk(
-        self, patterns: List[Dict], transcription: str, call_duration: float
+        self,
+        patterns: List[Dict],
+        transcription: str,
+        call_duration: float,
+        index: Optional[LexiconIndex] = None,
     ) -> RiskAssessment:
         """
         Calculate overall risk score from detected patterns.
@@ -56,6 +64,7 @@ class RiskScorer:
             patterns: List of PatternMatch dicts from PatternAnalyzer
             transcription: Full transcribed text
             call_duration: Duration in seconds
+            index: Shared LexiconIndex for this transcript (built if omitted)
 
         Returns:
             RiskAssessment with complete scoring rationale
@@ -89,7 +98,7 @@ class RiskScorer:
             )
 
         # 3. Check for safe indicators (reduces false positives)
-        safe_count = self._count_safe_indicators(transcription)
+        safe_count = self._count_safe_indicators(transcription, index)
         if safe_count > 0:
             # Each safe indicator reduces risk by 7 points
             safety_reduction = min(safe_count * 7, 30)  # Increased cap to 30
@@ -157,7 +166,7 @@ class RiskScorer:
         else:
             return 20
 
-    def _count_safe_indicators(self, text: str) -> int:
+    def _count_safe_indicators(self, text: str, index: Optional[LexiconIndex] = None) -> int:
         """
         Count indicators of legitimate communication.
         Helps prevent false positives.
@@ -167,16 +176,9 @@ class RiskScorer:
         - "Take your time"
         - "Optional"
         """
-        from utils.constants import SAFE_INDICATORS
-
-        count = 0
-        text_lower = text.lower()
+        index = index or LexiconIndex(text)
 
-        for indicator in SAFE_INDICATORS:
-            if indicator in text_lower:
-                count += 1
-
-        return count
+        return sum(1 for indicator in SAFE_INDICATORS if index.contains(indicator))
 
     def _get_risk_level(self, score: int) -> Tuple[str, str]:
         """
@@ -299,60 +301,132 @@ class RiskScorer:
         return min(0.99, max(0.30, confidence))
 
     def build_risk_timeline(
-        self, transcription: str, patterns: List[Dict]
+        self,
+        transcription: str,
+        segments: Optional[List[Dict]] = None,
+        language: str = "en",
+        duration: float = 0.0,
+        analyzer: Optional[PatternAnalyzer] = None,
     ) -> List[Dict]:
         """
         Create a timeline showing how risk evolved during the call.
-        Useful for understanding call progression.
 
-        For hackathon: Use rough segmentation.
-        Production: Use speech timing data from Whisper.
-        """
-        if not transcription:
-            return []
-
-        # Simple segmentation: divide into 3 parts
-        segments = self._segment_transcription(transcription, num_segments=3)
-        timeline = []
-
-        cumulative_risk = 0
-        for i, segment in enumerate(segments):
-            # Analyze this segment for patterns
-            segment_risk_increase = self._score_segment(segment, patterns)
-            cumulative_risk += segment_risk_increase
-
-            timeline.append({
-                "timestamp": (i + 1) * (len(transcription.split()) // 3),
-                "risk_score": min(100, cumulative_risk),
-                "reason": self._get_segment_reason(segment, i),
-            })
+        Segments are fed one at a time to a RiskTimelineBuilder, so the
+        whole call is scanned once. A checkpoint is emitted at the end of
+        every segment that changes the cumulative risk, naming the patterns
+        that fired there, plus a final checkpoint at the end of the call.
 
-        return timeline
-
-    def _segment_transcription(self, text: str, num_segments: int = 3) -> List[str]:
-        """Divide transcription into roughly equal parts"""
-        words = text.split()
-        segment_size = max(1, len(words) // num_segments)
-        segments = []
-
-        for i in range(num_segments):
-            start_idx = i * segment_size
-            end_idx = (i + 1) * segment_size if i < num_segments - 1 else len(words)
-            segments.append(" ".join(words[start_idx:end_idx]))
-
-        return segments
-
-    def _score_segment(self, segment: str, all_patterns: List[Dict]) -> int:
-        """Estimate risk for a text segment"""
-        # For hackathon: simple heuristic
-        # Production: re-run pattern analyzer on segment
-        return 15  # Simplified for demo
-
-    def _get_segment_reason(self, segment: str, segment_num: int) -> str:
-        """Generate reason for risk change in this segment"""
-        reasons = [
-            "Initial contact - caller identifies themselves",
-            "Problem description - urgency and pressure mounting",
-            "Request phase - asking for sensitive information",
+        Args:
+            transcription: Full transcribed text
+            segments: Whisper segments ({"start", "end", "text"}, seconds).
+                      Without them, sentences are spread over the call
+                      duration in proportion to their position in the text.
+            language: Language code for multilingual detection
+            duration: Call duration in seconds
+            analyzer: PatternAnalyzer to reuse (created if omitted)
+
+        Returns:
+            List of {"timestamp", "risk_score", "reason", "patterns"} dicts
+        """
+        if not segments:
+            if not transcription:
+                return []
+            segments = self._estimate_segments(transcription, duration)
+
+        builder = RiskTimelineBuilder(self, language, analyzer)
+        for segment in segments:
+            builder.add_segment(segment["end"], segment["text"])
+        return builder.finish(max(duration, segments[-1]["end"]))
+
+    @staticmethod
+    def _estimate_segments(text: str, duration: float) -> List[Dict]:
+        """Sentences with times interpolated from their character position"""
+        seconds_per_char = duration / len(text) if text else 0.0
+        return [
+            {
+                "start": round(match.start() * seconds_per_char, 2),
+                "end": round(match.end() * seconds_per_char, 2),
+                "text": match.group().strip(),
+            }
+            for match in re.finditer(r"[^.!?।]+[.!?।]*", text)
+            if match.group().strip()
         ]
-        return reasons[segment_num] if segment_num < len(reasons) else "Analysis phase"
+
+    def score_patterns(self, patterns: List[PatternMatch], safe_count: int) -> int:
+        """
+        Pattern part of calculate_risk (contributions, synergy bonus and
+        safe-indicator reduction) for a partial call.
+        """
+        score = sum(pattern.risk_score for pattern in patterns)
+        score += self._calculate_synergy_bonus(patterns)
+        if safe_count > 0:
+            score = max(0, score - min(safe_count * 7, 30))
+        return max(0, min(100, score))
+
+
+class RiskTimelineBuilder:
+    """
+    Cumulative risk of a call, updated one timed segment at a time.
+
+    Used for the finished-call timeline and for live calls; each segment is
+    scanned once by a PatternStream, so the cost is linear in call length.
+
+    Args:
+        scorer: RiskScorer providing the scoring rules
+        language: Language code for multilingual detection
+        analyzer: PatternAnalyzer to reuse (created if omitted)
+    """
+
+    def __init__(
+        self,
+        scorer: RiskScorer,
+        language: str = "en",
+        analyzer: Optional[PatternAnalyzer] = None,
+    ):
+        self.scorer = scorer
+        self.stream = PatternStream(analyzer, language)
+        self.risk_score = 0
+        self.checkpoints: List[Dict] = []
+
+    def add_segment(self, end: float, text: str) -> Optional[Dict]:
+        """
+        Feed the next segment (end = its end time in seconds).
+
+        Returns:
+            The new checkpoint, or None if the risk did not change
+        """
+        new_patterns = self.stream.feed(text)
+        score = self.scorer.score_patterns(
+            self.stream.patterns, self.stream.safe_indicator_count
+        )
+        if not new_patterns and score == self.risk_score:
+            return None
+
+        if new_patterns:
+            reason = " + ".join(
+                f"{pattern.pattern_name} ({', '.join(pattern.matched_keywords[:2])})"
+                for pattern in new_patterns
+            )
+        else:
+            reason = "Reassuring language lowered the risk"
+        checkpoint = {
+            "timestamp": round(float(end), 2),
+            "risk_score": score,
+            "reason": reason,
+            "patterns": [pattern.pattern_name for pattern in new_patterns],
+        }
+        self.risk_score = score
+        self.checkpoints.append(checkpoint)
+        return checkpoint
+
+    def finish(self, end: float) -> List[Dict]:
+        """Close the timeline with the end-of-call risk"""
+        end = round(float(end), 2)
+        if not self.checkpoints or self.checkpoints[-1]["timestamp"] < end:
+            self.checkpoints.append({
+                "timestamp": end,
+                "risk_score": self.risk_score,
+                "reason": "End of call",
+                "patterns": [],
+            })
+        return self.checkpoints
@@ -5,166 +5,190 @@ Maintains database of known scam patterns and compares incoming calls
 against them to detect if it matches known fraud campaigns.
 
 This provides IMMEDIATE recognition of known scams.
+
+The catalog itself is stored on disk (see campaign_store.py) and shared
+by all worker processes; edit data/scam_campaigns.json and rebuild the
+store to change it.
 """
 
 import logging
-from typing import Dict, List, Tuple
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Tuple, Optional, Set
 import json
 from datetime import datetime
 
+from services.campaign_store import CampaignStore
+from services.keyword_matcher import IncrementalKeywordMatcher
+from services.lexicon import LexiconIndex
+
 logger = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True)
+class CampaignIndex:
+    """
+    Snapshot of the in-memory campaign index. Never modified once
+    published: a reload builds a new one and swaps it in with a single
+    assignment, so a call being analyzed always sees a complete index.
+    """
+    keyword_index: Dict[str, Set[int]]  # term -> seq numbers of campaigns using it as a keyword
+    phrase_index: Dict[str, Set[int]]   # term -> seq numbers of campaigns using it as a phrase
+    # Every indexed keyword and phrase (substring semantics). A hashed
+    # matcher rather than a compiled regex: cheap to build and to extend
+    # for catalogs of 100k+ campaigns.
+    matcher: IncrementalKeywordMatcher
+    campaign_count: int
+    max_seq: int
+    store_version: Any
+
+
 class KnownScamDatabase:
-    """Database of known scam patterns and campaigns"""
+    """
+    Database of known scam patterns and campaigns.
 
-    def __init__(self):
+    Campaign records live in a shared file-backed CampaignStore; this
+    object only holds the term -> campaign inverted index and the compiled
+    matcher, and re-syncs them when the store changes on disk.
+
+    Args:
+        store: Campaign catalog (default: data/scam_campaigns.db)
+        reload_interval: Seconds between checks for store changes
+    """
+
+    def __init__(self, store: Optional[CampaignStore] = None, reload_interval: float = 2.0):
         """Initialize scam database"""
-        logger.info("KnownScamDatabase initialized")
-        
-        # Known scam campaigns (real-world patterns)
-        self.scam_campaigns = {
-            "bank_otp_scam": {
-                "name": "Bank OTP Phishing Scam",
-                "severity": "CRITICAL",
-                "description": "Scammer impersonates bank, asks for OTP",
-                "keywords": ["otp", "verification code", "confirm", "urgent", "bank"],
-                "common_phrases": [
-                    "your account has been compromised",
-                    "verify your identity",
-                    "we detected unusual activity",
-                    "share your otp",
-                    "for security purposes"
-                ],
-                "typical_targets": ["Any bank customer"],
-                "loss_average": "₹50,000 - ₹5,00,000",
-            },
-            "tax_authority_scam": {
-                "name": "Tax Authority Impersonation",
-                "severity": "CRITICAL",
-                "description": "Scammer claims to be from tax dept, threatens arrest",
-                "keywords": ["tax", "it", "income tax", "investigation", "arrest"],
-                "common_phrases": [
-                    "income tax investigation",
-                    "you are involved in illegal activity",
-                    "we will take action",
-                    "pay immediately",
-                    "this is your last warning"
-                ],
-                "typical_targets": ["Anyone with income"],
-                "loss_average": "₹1,00,000 - ₹10,00,000",
-            },
-            "police_impersonation": {
-                "name": "Police Authority Impersonation",
-                "severity": "CRITICAL",
-                "description": "Scammer claims to be police officer",
-                "keywords": ["police", "crime", "complaint", "arrest", "criminal"],
-                "common_phrases": [
-                    "we have a case against you",
-                    "you are involved in a crime",
-                    "your name has been found",
-                    "meet us immediately",
-                    "we need to register your details"
-                ],
-                "typical_targets": ["Anyone with criminal concerns"],
-                "loss_average": "₹50,000 - ₹5,00,000",
-            },
-            "loan_disbursement_scam": {
-                "name": "Fake Loan Disbursement",
-                "severity": "HIGH",
-                "description": "Scammer offers loan, asks for advance fees",
-                "keywords": ["loan", "disbursement", "approved", "processing", "fee"],
-                "common_phrases": [
-                    "your loan is approved",
-                    "process immediately",
-                    "processing fee required",
-                    "disburse to your account",
-                    "limited time offer"
-                ],
-                "typical_targets": ["Loan seekers"],
-                "loss_average": "₹10,000 - ₹50,000",
-            },
-            "amazon_refund_scam": {
-                "name": "E-commerce Refund Scam",
-                "severity": "HIGH",
-                "description": "Scammer claims to process refund, asks for details",
-                "keywords": ["amazon", "refund", "order", "return", "account"],
-                "common_phrases": [
-                    "we need to process your refund",
-                    "confirm your account details",
-                    "link your bank account",
-                    "update your payment method",
-                    "verify your identity"
-                ],
-                "typical_targets": ["Online shoppers"],
-                "loss_average": "₹20,000 - ₹2,00,000",
-            },
-            "tech_support_scam": {
-                "name": "Tech Support Scam",
-                "severity": "HIGH",
-                "description": "Scammer claims virus on device, asks to install software",
-                "keywords": ["virus", "malware", "security", "software", "install"],
-                "common_phrases": [
-                    "we detected a virus on your computer",
-                    "your device is compromised",
-                    "install this security software",
-                    "give us remote access",
-                    "your data is at risk"
-                ],
-                "typical_targets": ["Tech users"],
-                "loss_average": "₹30,000 - ₹3,00,000",
-            },
-            "insurance_claim_scam": {
-                "name": "Insurance Claim Scam",
-                "severity": "HIGH",
-                "description": "Scammer claims to help file insurance claim",
-                "keywords": ["insurance", "claim", "policy", "accident", "premium"],
-                "common_phrases": [
-                    "we need to verify your policy",
-                    "update your claim information",
-                    "deposit required for claim processing",
-                    "your claim is approved",
-                    "collect your settlement"
-                ],
-                "typical_targets": ["Insurance policyholders"],
-                "loss_average": "₹1,00,000 - ₹5,00,000",
-            },
-            "prize_money_scam": {
-                "name": "Prize/Lottery Scam",
-                "severity": "MEDIUM",
-                "description": "Scammer claims you won prize/lottery",
-                "keywords": ["prize", "lottery", "win", "congratulations", "reward"],
-                "common_phrases": [
-                    "congratulations you have won",
-                    "claim your prize",
-                    "tax or fees applicable",
-                    "process your winnings",
-                    "verify your details"
-                ],
-                "typical_targets": ["Anyone"],
-                "loss_average": "₹10,000 - ₹1,00,000",
-            }
-        }
+        self.store = store or CampaignStore()
+        self.reload_interval = reload_interval
+        self._reload_lock = threading.Lock()
+        self._last_check = time.monotonic()
+        self._index = self._build_index(self.store.iter_campaigns(), self.store.version())
+        logger.info(f"KnownScamDatabase initialized ({self._index.campaign_count} campaigns)")
+
+    # ==================
+    # IN-MEMORY INDEX
+    # ==================
+
+    @staticmethod
+    def _build_index(
+        campaigns: Iterable[Tuple[int, Dict]], store_version: Any, base: Optional[CampaignIndex] = None
+    ) -> CampaignIndex:
+        """
+        Index campaigns into a new snapshot: from scratch, or on top of
+        base (appends). base itself is left untouched - the term sets and
+        the matcher it shares are copied before they are extended.
+        """
+        if base:
+            keyword_index, phrase_index = dict(base.keyword_index), dict(base.phrase_index)
+            matcher = base.matcher.copy()
+            count, max_seq = base.campaign_count, base.max_seq
+        else:
+            keyword_index, phrase_index = {}, {}
+            matcher = IncrementalKeywordMatcher()
+            count, max_seq = 0, 0
+        # Terms whose campaign set was already copied for this snapshot
+        owned_keywords: Set[str] = set()
+        owned_phrases: Set[str] = set()
+
+        def add(inverted: Dict[str, Set[int]], owned: Set[str], term: str, seq: int):
+            if term not in owned:
+                inverted[term] = set(inverted.get(term, ()))
+                owned.add(term)
+            inverted[term].add(seq)
+            matcher.add(term)
 
-    def compare_call_with_campaigns(self, transcription: str) -> Dict:
+        for seq, campaign in campaigns:
+            count += 1
+            max_seq = max(max_seq, seq)
+            for keyword in campaign.get("keywords", []):
+                # Keywords are compared case-sensitively against lowercase text,
+                # so one containing capitals can never match
+                if keyword != keyword.lower():
+                    continue
+                add(keyword_index, owned_keywords, keyword, seq)
+            for phrase in campaign.get("common_phrases", []):
+                add(phrase_index, owned_phrases, phrase.lower(), seq)
+
+        return CampaignIndex(keyword_index, phrase_index, matcher, count, max_seq, store_version)
+
+    def _refresh(self, force: bool = False):
+        """
+        Hot reload: pick up campaigns added by any worker, or a rebuilt
+        store file, without restarting. Checked at most every reload_interval.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.reload_interval:
+            return
+
+        # Readers never take the lock: they use whichever snapshot is
+        # published, and a new one replaces it in one assignment
+        with self._reload_lock:
+            self._last_check = now
+            current = self._index
+            if self.store.reopen_if_replaced():
+                self._index = self._build_index(self.store.iter_campaigns(), self.store.version())
+                logger.info(f"🔄 Campaign index rebuilt ({self._index.campaign_count} campaigns)")
+                return
+
+            version = self.store.version()
+            if version == current.store_version:
+                return
+
+            # Appends (add_campaign) extend the index; anything else rebuilds it
+            added = list(self.store.iter_campaigns(after_seq=current.max_seq))
+            if current.campaign_count + len(added) != len(self.store):
+                self._index = self._build_index(self.store.iter_campaigns(), version)
+                logger.info(f"🔄 Campaign index rebuilt ({self._index.campaign_count} campaigns)")
+                return
+
+            self._index = self._build_index(added, version, base=current)
+            if added:
+                logger.info(f"🔄 Campaign index updated: +{len(added)} campaigns")
+
+    def compare_call_with_campaigns(
+        self, transcription: str, index: Optional[LexiconIndex] = None
+    ) -> Dict:
         """
         Compare transcribed call against known scam campaigns.
+
+        One pass over the transcript finds every catalog term; the inverted
+        index then yields only the campaigns with at least one hit, so cost
+        does not grow with the size of the catalog.
         
         Args:
             transcription: Transcribed call text
+            index: Shared LexiconIndex for this transcript (built if omitted)
             
         Returns:
             Dict with matching campaigns and confidence scores
         """
         
-        text_lower = transcription.lower()
+        self._refresh()
+        index = index or LexiconIndex(transcription)
+        snapshot = self._index  # One consistent index for this call
+        keyword_index, phrase_index = snapshot.keyword_index, snapshot.phrase_index
+        found = index.scan_terms(snapshot.matcher)
+
+        # Candidate campaigns: those sharing at least one term with the call
+        candidates: Set[int] = set()
+        for term in found:
+            candidates |= keyword_index.get(term, set())
+            candidates |= phrase_index.get(term, set())
+
+        # Only the candidate records are read from the store
+        records = self.store.get_many(candidates)
+
         matches = []
         
-        # Compare against each campaign
-        for campaign_id, campaign_info in self.scam_campaigns.items():
+        # Score candidates in catalog order (keeps tie order stable)
+        for seq in sorted(records):
+            campaign_info = records[seq]
+            campaign_id = campaign_info["id"]
+            matched_keywords = self._get_matched_keywords(found, campaign_info)
+            matched_phrases = self._get_matched_phrases(found, campaign_info)
             match_score = self._calculate_campaign_match_score(
-                text_lower,
-                campaign_info
+                campaign_info, len(matched_keywords), len(matched_phrases)
             )
             
             if match_score > 0:
@@ -176,8 +200,8 @@ class KnownScamDatabase:
                     "description": campaign_info["description"],
                     "typical_targets": campaign_info["typical_targets"],
                     "loss_average": campaign_info["loss_average"],
-                    "matched_keywords": self._get_matched_keywords(text_lower, campaign_info),
-                    "matched_phrases": self._get_matched_phrases(text_lower, campaign_info),
+                    "matched_keywords": matched_keywords,
+                    "matched_phrases": matched_phrases[:3],  # Top 3 phrases
                 })
         
         # Sort by confidence (highest first)
@@ -196,16 +220,16 @@ class KnownScamDatabase:
         
         return analysis
 
-    def _calculate_campaign_match_score(self, text: str, campaign: Dict) -> float:
+    def _calculate_campaign_match_score(
+        self, campaign: Dict, keyword_matches: int, phrase_matches: int
+    ) -> float:
         """Calculate how closely text matches a campaign"""
         
-        # Check keyword matches
-        keyword_matches = sum(1 for kw in campaign["keywords"] if kw in text)
-        keyword_score = (keyword_matches / len(campaign["keywords"])) if campaign["keywords"] else 0
+        keywords = campaign.get("keywords", [])
+        keyword_score = (keyword_matches / len(keywords)) if keywords else 0
         
-        # Check phrase matches
-        phrase_matches = sum(1 for phrase in campaign["common_phrases"] if phrase.lower() in text)
-        phrase_score = (phrase_matches / len(campaign["common_phrases"])) if campaign["common_phrases"] else 0
+        phrases = campaign.get("common_phrases", [])
+        phrase_score = (phrase_matches / len(phrases)) if phrases else 0
         
         # Weight phrases more heavily (they're more specific)
         overall_score = (keyword_score * 0.3 + phrase_score * 0.7)
@@ -213,38 +237,34 @@ class KnownScamDatabase:
         # Only return if significant match
         return float(overall_score) if overall_score > 0.2 else 0.0
 
-    def _get_matched_keywords(self, text: str, campaign: Dict) -> List[str]:
+    def _get_matched_keywords(self, found: Set[str], campaign: Dict) -> List[str]:
         """Get keywords that matched"""
-        matched = []
-        for keyword in campaign["keywords"]:
-            if keyword in text:
-                matched.append(keyword)
-        return matched
+        return [keyword for keyword in campaign.get("keywords", []) if keyword in found]
 
-    def _get_matched_phrases(self, text: str, campaign: Dict) -> List[str]:
+    def _get_matched_phrases(self, found: Set[str], campaign: Dict) -> List[str]:
         """Get common phrases that matched"""
-        matched = []
-        for phrase in campaign["common_phrases"]:
-            if phrase.lower() in text:
-                matched.append(phrase)
-        return matched[:3]  # Top 3 phrases
+        return [
+            phrase for phrase in campaign.get("common_phrases", [])
+            if phrase.lower() in found
+        ]
 
     def get_campaign_statistics(self) -> Dict:
         """Get statistics about known scam campaigns"""
+        severities = self.store.count_by_severity()
         return {
-            "total_campaigns": len(self.scam_campaigns),
-            "critical_severity": sum(1 for c in self.scam_campaigns.values() if c["severity"] == "CRITICAL"),
-            "high_severity": sum(1 for c in self.scam_campaigns.values() if c["severity"] == "HIGH"),
-            "medium_severity": sum(1 for c in self.scam_campaigns.values() if c["severity"] == "MEDIUM"),
-            "campaigns": list(self.scam_campaigns.keys()),
+            "total_campaigns": sum(severities.values()),
+            "critical_severity": severities.get("CRITICAL", 0),
+            "high_severity": severities.get("HIGH", 0),
+            "medium_severity": severities.get("MEDIUM", 0),
+            "campaigns": self.store.ids(),
         }
 
     def add_campaign(self, campaign_data: Dict) -> bool:
-        """Add new scam campaign to database"""
+        """Add new scam campaign to database (persisted, visible to all workers)"""
         try:
             campaign_id = campaign_data.get("id")
-            if campaign_id and campaign_id not in self.scam_campaigns:
-                self.scam_campaigns[campaign_id] = campaign_data
+            if campaign_id and self.store.add(campaign_data):
+                self._refresh(force=True)
                 logger.info(f"New campaign added: {campaign_id}")
                 return True
             return False
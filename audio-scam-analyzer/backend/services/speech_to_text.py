@@ -10,15 +10,130 @@ Whisper Advantages:
 - Good punctuation restoration
 - No external API required (runs locally)
 
+Models are served from a WhisperModelPool (see model_pool.py), so several
+transcriptions can run at once on separate model replicas.
+
+Long calls are transcribed in windows of at most window_seconds, cut at
+pauses found by the energy VAD (voice_analyzer.speech_segments). Windows
+run in parallel on whatever replicas are idle, Whisper never holds the
+mel spectrogram of more than one window per replica, and every segment
+keeps its real start/end time in the call.
+
+detect_language() runs Whisper's language identification on a single
+~30s mel window (where speech starts), so a wrong user-selected language
+is rejected in a fraction of a second, and the detected language is
+passed to the full transcription instead of being detected again.
+
+Batch jobs use detect_languages() (one forward pass over the stacked
+first windows of several calls) and transcribe_batch() (the windows of
+several calls share the borrowed replicas).
+
 PRIVACY: Audio is processed locally. No data sent to external services.
 """
 
-import whisper
 import logging
-from typing import Tuple, Optional
+import queue
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from io import BytesIO
+import soundfile as sf
+from typing import Any, Dict, List, Tuple, Optional, Union
+
+from services import profiling
+from services.audio_processor import DecodedAudio
+from services.model_pool import WhisperModelPool
+from services.voice_analyzer import frame_energy, speech_frame_mask, speech_segments
 
 logger = logging.getLogger(__name__)
 
+WHISPER_SAMPLE_RATE = 16000
+LANGUAGE_ID_SECONDS = 30.0  # One Whisper mel window
+VAD_HOP_LENGTH = 512
+VAD_FRAME_LENGTH = 2048
+
+
+def plan_windows(
+    samples: np.ndarray,
+    sr: int = WHISPER_SAMPLE_RATE,
+    max_seconds: float = 30.0,
+    min_pause_seconds: float = 0.3,
+    edge_seconds: float = 0.2,
+) -> List[Tuple[int, int]]:
+    """
+    Split a call into transcription windows of at most max_seconds.
+
+    Windows are built from the speech regions of the energy VAD, padded by
+    edge_seconds and cut in the middle of pauses, so words are not split.
+    Long silences between windows are skipped. Speech that runs past
+    max_seconds without a pause is cut at the quietest frame of its last
+    few seconds.
+
+    Returns:
+        List of (start_sample, end_sample) pairs in call order
+    """
+    total = len(samples)
+    max_len = int(max_seconds * sr)
+    if total <= max_len:
+        return [(0, total)]
+
+    energy = frame_energy(samples, frame_length=VAD_FRAME_LENGTH, hop_length=VAD_HOP_LENGTH)
+    regions = speech_segments(
+        speech_frame_mask(energy), sr, hop_length=VAD_HOP_LENGTH, min_pause_seconds=min_pause_seconds
+    )
+    if not regions:
+        regions = [(0.0, total / sr)]
+
+    # Region bounds in samples, padded but never past the middle of a pause
+    edge = int(edge_seconds * sr)
+    bounds = [(int(start * sr), min(int(end * sr), total)) for start, end in regions]
+    padded = []
+    for i, (start, end) in enumerate(bounds):
+        low = 0 if i == 0 else (bounds[i - 1][1] + start) // 2
+        high = total if i == len(bounds) - 1 else (end + bounds[i + 1][0]) // 2
+        padded.append((max(start - edge, low), min(end + edge, high)))
+
+    windows = []
+    window_start = window_end = None
+    for start, end in padded:
+        if window_start is not None and end - window_start <= max_len:
+            window_end = end
+            continue
+        if window_start is not None:
+            windows.append((window_start, window_end))
+        # Unbroken speech longer than a window: cut at a quiet frame
+        while end - start > max_len:
+            cut = _quietest_cut(energy, start + max_len - min(5 * sr, max_len // 2), start + max_len)
+            windows.append((start, cut))
+            start = cut
+        window_start, window_end = start, end
+    windows.append((window_start, window_end))
+    return windows
+
+
+def _quietest_cut(energy: np.ndarray, low: int, high: int) -> int:
+    """Sample offset of the lowest-energy VAD frame between low and high"""
+    first, last = low // VAD_HOP_LENGTH, max(low // VAD_HOP_LENGTH + 1, high // VAD_HOP_LENGTH)
+    frame = first + int(np.argmin(energy[first:last]))
+    return min(max(frame * VAD_HOP_LENGTH, low), high)
+
+
+@dataclass
+class Transcript:
+    """Whisper output kept for downstream analysis and the transcript cache"""
+    text: str
+    language: str
+    confidence: float
+    segments: List[Dict] = field(default_factory=list)  # {"start", "end", "text"} in seconds
+
+    def to_dict(self) -> Dict:
+        return {
+            "text": self.text,
+            "language": self.language,
+            "confidence": self.confidence,
+            "segments": self.segments,
+        }
+
 
 class SpeechToTextService:
     """
@@ -34,100 +149,284 @@ class SpeechToTextService:
     # large: 1550M parameters - best accuracy, slowest
     MODEL_SIZE = "base"  # Balanced for demo
 
-    def __init__(self, model_size: str = MODEL_SIZE):
+    def __init__(
+        self,
+        model_size: str = MODEL_SIZE,
+        pool: Optional[WhisperModelPool] = None,
+        window_seconds: Optional[float] = 30.0,
+    ):
         """
         Initialize Whisper service (lazy-loads model on first use).
         
         THIS IS NOW TRULY LAZY-LOADED:
         The model is NOT loaded in __init__() anymore.
-        It only loads when transcribe() is first called.
+        It loads when transcribe() is first called, or earlier if the
+        pool is warmed up at startup (pool.warm_up()).
         
         This cuts app startup from 30-60s to <500ms
 
         Args:
             model_size: Whisper model to use (tiny/base/small/medium/large)
+            pool: Replica pool to transcribe with (default: one replica)
+            window_seconds: Longest window for chunked transcription of long
+                            calls (None/0 = always one pass over the whole call)
         """
         self.model_size = model_size
-        self.model = None
-        self.model_loaded = False
-        logger.info(f"✅ SpeechToTextService initialized (model={model_size}, lazy-loaded)")
-
-    def _ensure_model_loaded(self):
-        """Lazily load Whisper model on first use (not during __init__)"""
-        if self.model_loaded:
-            return
-        
-        try:
-            logger.info(f"⏳ Loading Whisper {self.model_size} model for first time...")
-            import time
-            t0 = time.time()
-            self.model = whisper.load_model(self.model_size)
-            elapsed = time.time() - t0
-            self.model_loaded = True
-            logger.info(f"✅ Whisper {self.model_size} model loaded in {elapsed:.1f}s")
-        except Exception as e:
-            logger.error(f"Failed to load Whisper model: {str(e)}")
-            raise RuntimeError(f"Whisper loading failed: {str(e)}")
+        self.pool = pool or WhisperModelPool(model_size=model_size)
+        self.window_seconds = window_seconds or None
+        logger.info(
+            f"✅ SpeechToTextService initialized (model={model_size}, "
+            f"replicas={self.pool.replicas}, lazy-loaded)"
+        )
+
+    @property
+    def model_loaded(self) -> bool:
+        return self.pool.is_ready
+
+    def detect_language(self, audio: Union[DecodedAudio, bytes]) -> Tuple[str, float]:
+        """
+        Identify the spoken language from the first ~30s of speech only.
+
+        Args:
+            audio: DecodedAudio from AudioProcessor (or legacy WAV bytes)
+
+        Returns:
+            Tuple of (language_code, probability)
+        """
+        audio_array = self._as_float32_array(audio)
+        start, _ = plan_windows(audio_array, max_seconds=LANGUAGE_ID_SECONDS)[0]
+        with self.pool.acquire() as model:
+            return self._detect_language(model, audio_array, start)
 
     def transcribe(
-        self, audio_bytes: bytes, language: Optional[str] = None
+        self, audio: Union[DecodedAudio, bytes], language: Optional[str] = None
     ) -> Tuple[str, str, float]:
         """
         Transcribe audio to text.
-        
-        ⚡ MODEL LOADS ON FIRST CALL (not during app init)
 
         Args:
-            audio_bytes: Processed audio bytes
+            audio: DecodedAudio from AudioProcessor (or legacy WAV bytes)
             language: ISO-639-1 language code (None = auto-detect)
-                     Common codes: en, hi, ta, te, ml, kn, bn, gu
 
         Returns:
             Tuple of (transcription, detected_language, confidence)
         """
-        # Lazy-load model on first use
-        self._ensure_model_loaded()
+        transcript = self.transcribe_detailed(audio, language)
+        return transcript.text, transcript.language, transcript.confidence
+
+    def transcribe_detailed(
+        self, audio: Union[DecodedAudio, bytes], language: Optional[str] = None
+    ) -> Transcript:
+        """
+        Transcribe audio to text, keeping segment timings.
         
-        if not self.model:
-            raise RuntimeError("Model failed to load")
+        ⚡ MODEL LOADS ON FIRST CALL unless the pool was warmed up
 
-        try:
-            # Whisper expects audio file path or raw audio
-            # We'll use the FP32 audio conversion
-            import numpy as np
-            from io import BytesIO
-            import soundfile as sf
+        Args:
+            audio: DecodedAudio from AudioProcessor (used as-is, no re-decode).
+                   Raw WAV bytes are still accepted for older callers.
+            language: ISO-639-1 language code (None = auto-detect)
+                     Common codes: en, hi, ta, te, ml, kn, bn, gu
 
-            # Convert bytes back to audio array for Whisper
-            audio_buffer = BytesIO(audio_bytes)
-            audio_data, _ = sf.read(audio_buffer, always_2d=True)
-            audio_array = audio_data.squeeze().astype(np.float32)
+        Returns:
+            Transcript with text, detected language, confidence and segments
+        """
+        # Whisper takes the 16kHz float32 array directly
+        audio_array = self._as_float32_array(audio)
+        windows = self._plan(audio_array)
 
-            logger.info(f"Starting transcription (language: {language or 'auto-detect'})")
+        logger.info(
+            f"Starting transcription (language: {language or 'auto-detect'}, "
+            f"{len(windows)} window(s))"
+        )
 
-            # Call Whisper with optional language hint
-            result = self.model.transcribe(
-                audio_array,
-                language=language,  # None = auto-detect
-                verbose=False,  # Don't log whisper's debug info
-                fp16=False,  # Use full precision for accuracy
+        # Borrow replicas (loads the pool on first use; PoolBusyError if too
+        # many requests are already waiting). Extra idle replicas, if any,
+        # transcribe other windows in parallel.
+        with self.pool.acquire_many(len(windows)) as models:
+            if language is None and len(windows) > 1:
+                # Fix one language for every window before they run in parallel
+                language, _ = self._detect_language(models[0], audio_array, windows[0][0])
+            results = self._transcribe_windows(
+                models, [(audio_array[start:end], language) for start, end in windows]
             )
 
-            transcription = result.get("text", "").strip()
-            detected_language = result.get("language", "unknown")
-            confidence = 0.95  # Whisper doesn't provide confidence, estimate from model
+        return self._assemble(windows, results, language)
+
+    def detect_languages(self, audios: List[DecodedAudio]) -> List[Tuple[str, float]]:
+        """
+        Language ID for several calls in ONE Whisper forward pass: the
+        first ~30s mel window of each call is stacked into a single batch.
+
+        Returns:
+            (language_code, probability) per call, in input order
+        """
+        if not audios:
+            return []
+        arrays = [self._as_float32_array(audio) for audio in audios]
+        starts = [plan_windows(array, max_seconds=LANGUAGE_ID_SECONDS)[0][0] for array in arrays]
+        with self.pool.acquire() as model:
+            return self._detect_languages(model, arrays, starts)
+
+    def transcribe_batch(
+        self, audios: List[DecodedAudio], languages: List[Optional[str]]
+    ) -> List[Transcript]:
+        """
+        Transcribe several calls together (batch jobs).
+
+        The windows of every call form one work list that is spread over
+        the borrowed replicas, so short clips keep every replica busy
+        instead of each call waiting for its own turn.
 
-            logger.info(
-                f"✅ Transcription complete: {len(transcription)} chars, "
-                f"language: {detected_language}"
+        Args:
+            audios: Decoded calls
+            languages: Language per call (from detect_languages(); None = auto)
+
+        Returns:
+            Transcript per call, in input order
+        """
+        arrays = [self._as_float32_array(audio) for audio in audios]
+        plans = [self._plan(array) for array in arrays]
+        jobs = [
+            (array[start:end], language)
+            for array, plan, language in zip(arrays, plans, languages)
+            for start, end in plan
+        ]
+        logger.info(f"Starting batch transcription ({len(arrays)} calls, {len(jobs)} window(s))")
+
+        with self.pool.acquire_many(len(jobs)) as models:
+            results = self._transcribe_windows(models, jobs)
+
+        transcripts = []
+        for plan, language in zip(plans, languages):
+            transcripts.append(self._assemble(plan, results[:len(plan)], language))
+            results = results[len(plan):]
+        return transcripts
+
+    def _plan(self, audio_array: np.ndarray) -> List[Tuple[int, int]]:
+        if not self.window_seconds:
+            return [(0, len(audio_array))]
+        return plan_windows(audio_array, max_seconds=self.window_seconds)
+
+    def _assemble(
+        self, windows: List[Tuple[int, int]], results: List[Dict], language: Optional[str]
+    ) -> Transcript:
+        """Join per-window Whisper results into one call-time Transcript"""
+        detected_language = language or results[0].get("language", "unknown")
+        segments = []
+        for (start, _), result in zip(windows, results):
+            offset = start / WHISPER_SAMPLE_RATE
+            segments.extend(
+                {
+                    "start": round(offset + float(segment["start"]), 2),
+                    "end": round(offset + float(segment["end"]), 2),
+                    "text": segment["text"].strip(),
+                }
+                for segment in result.get("segments", [])
             )
+        transcription = " ".join(
+            text for text in (result.get("text", "").strip() for result in results) if text
+        )
+        confidence = 0.95  # Whisper doesn't provide confidence, estimate from model
+
+        logger.info(
+            f"✅ Transcription complete: {len(transcription)} chars, "
+            f"language: {detected_language}"
+        )
 
-            return transcription, detected_language, confidence
+        return Transcript(transcription, detected_language, confidence, segments)
 
+    def _transcribe_windows(
+        self, models: List[Any], jobs: List[Tuple[np.ndarray, Optional[str]]]
+    ) -> List[Dict]:
+        """Whisper result per (samples, language) window, in window order"""
+        if len(models) == 1 or len(jobs) == 1:
+            return [self._run_whisper(models[0], samples, language) for samples, language in jobs]
+
+        idle: "queue.Queue[Any]" = queue.Queue()
+        for model in models:
+            idle.put(model)
+
+        def run(job: Tuple[np.ndarray, Optional[str]]) -> Dict:
+            model = idle.get()
+            try:
+                return self._run_whisper(model, *job)
+            finally:
+                idle.put(model)
+
+        with ThreadPoolExecutor(max_workers=len(models), thread_name_prefix="whisper-window") as pool:
+            return list(pool.map(profiling.propagate(run), jobs))
+
+    @staticmethod
+    def _detect_language(model: Any, audio_array: np.ndarray, start: int = 0) -> Tuple[str, float]:
+        """Whisper language ID on the 30s mel window starting at sample start"""
+        import whisper
+
+        try:
+            window = whisper.pad_or_trim(
+                audio_array[start:start + int(LANGUAGE_ID_SECONDS * WHISPER_SAMPLE_RATE)]
+            )
+            mel = whisper.log_mel_spectrogram(window, n_mels=model.dims.n_mels).to(model.device)
+            _, probs = model.detect_language(mel)
+        except Exception as e:
+            logger.error(f"Language detection failed: {str(e)}")
+            raise RuntimeError(f"Failed to detect language: {str(e)}")
+
+        language = max(probs, key=probs.get)
+        logger.info(f"Detected language: {language} (p={probs[language]:.2f})")
+        return language, float(probs[language])
+
+    @staticmethod
+    def _detect_languages(
+        model: Any, arrays: List[np.ndarray], starts: List[int]
+    ) -> List[Tuple[str, float]]:
+        """Whisper language ID on a stacked batch of 30s mel windows"""
+        import torch
+        import whisper
+
+        try:
+            length = int(LANGUAGE_ID_SECONDS * WHISPER_SAMPLE_RATE)
+            mel = torch.stack([
+                whisper.log_mel_spectrogram(
+                    whisper.pad_or_trim(array[start:start + length]), n_mels=model.dims.n_mels
+                )
+                for array, start in zip(arrays, starts)
+            ]).to(model.device)
+            _, probs = model.detect_language(mel)
+        except Exception as e:
+            logger.error(f"Language detection failed: {str(e)}")
+            raise RuntimeError(f"Failed to detect language: {str(e)}")
+
+        detected = []
+        for call_probs in probs:
+            language = max(call_probs, key=call_probs.get)
+            detected.append((language, float(call_probs[language])))
+        logger.info(f"Detected languages for {len(detected)} calls in one pass")
+        return detected
+
+    @staticmethod
+    def _run_whisper(model: Any, samples: np.ndarray, language: Optional[str]) -> Dict:
+        try:
+            # Call Whisper with optional language hint
+            return model.transcribe(
+                samples,
+                language=language,  # None = auto-detect
+                verbose=False,  # Don't log whisper's debug info
+                fp16=False,  # Use full precision for accuracy
+            )
         except Exception as e:
             logger.error(f"Transcription failed: {str(e)}")
             raise RuntimeError(f"Failed to transcribe audio: {str(e)}")
 
+    @staticmethod
+    def _as_float32_array(audio: Union[DecodedAudio, bytes]) -> np.ndarray:
+        """Return mono float32 samples, decoding only for legacy byte input"""
+        if isinstance(audio, DecodedAudio):
+            return audio.samples
+
+        audio_data, _ = sf.read(BytesIO(audio), dtype="float32", always_2d=True)
+        return audio_data.mean(axis=1) if audio_data.shape[1] > 1 else audio_data[:, 0]
+
     @staticmethod
     def get_supported_languages() -> dict:
         """
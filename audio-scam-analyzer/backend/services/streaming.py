@@ -0,0 +1,95 @@
+"""
+Streamed Analysis Events
+========================
+Progressive responses for /analyze-call?stream=ndjson|sse: each stage
+result is sent the moment it exists instead of one JSON body at the end.
+
+- The analysis runs as a task that emit()s (event, data) pairs; the
+  response body yields them, encoded, in the order they happen
+- NDJSON: one {"event": ..., "data": {...}} object per line
+- SSE: "event: ...\\ndata: {...}\\n\\n" frames (for fetch()-based SSE
+  readers; EventSource itself cannot POST an upload)
+- A keep-alive (blank NDJSON line / SSE comment) goes out while a long
+  stage (Whisper) runs, so proxies do not close an idle connection
+- If the client disconnects, the analysis task is cancelled
+"""
+
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ?stream= value -> response media type
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+KEEPALIVE_SECONDS = 15.0
+
+
+def encode_event(stream_format: str, event: str, data: Dict) -> str:
+    """One event in the wire format of stream_format ("ndjson" or "sse")"""
+    payload = json.dumps(data, ensure_ascii=False)
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return json.dumps({"event": event, "data": data}, ensure_ascii=False) + "\n"
+
+
+class EventStream:
+    """
+    Events of one running analysis, read by the response body.
+
+    Args:
+        stream_format: "ndjson" or "sse"
+        keepalive_seconds: Idle time before a keep-alive is sent
+    """
+
+    def __init__(self, stream_format: str, keepalive_seconds: float = KEEPALIVE_SECONDS):
+        if stream_format not in STREAM_MEDIA_TYPES:
+            raise ValueError(f"Unknown stream format: {stream_format}")
+        self.stream_format = stream_format
+        self.media_type = STREAM_MEDIA_TYPES[stream_format]
+        self.keepalive_seconds = keepalive_seconds
+        self._queue: "asyncio.Queue[Optional[Tuple[str, Dict]]]" = asyncio.Queue()
+
+    def emit(self, event: str, data: Dict):
+        """Queue an event (never blocks; called from the analysis task)"""
+        self._queue.put_nowait((event, data))
+
+    async def body(self, work: Callable[[], Awaitable]) -> AsyncIterator[str]:
+        """
+        Run work() as a task and yield its events until it finishes.
+
+        Args:
+            work: Coroutine function doing the analysis; it reports
+                  everything, errors included, through emit()
+        """
+        task = asyncio.get_running_loop().create_task(self._run(work))
+        keepalive = ": keep-alive\n\n" if self.stream_format == "sse" else "\n"
+        try:
+            while True:
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), self.keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield keepalive
+                    continue
+                if item is None:
+                    break
+                yield encode_event(self.stream_format, *item)
+        finally:
+            if not task.done():
+                # Client went away mid-analysis
+                task.cancel()
+
+    async def _run(self, work: Callable[[], Awaitable]):
+        try:
+            await work()
+        except Exception as e:
+            # work() reports its own errors; this is a bug, not a bad request
+            logger.error(f"❌ Streamed analysis failed: {str(e)}", exc_info=True)
+            self.emit("error", {"status_code": 500, "detail": f"Analysis error: {str(e)[:200]}"})
+        finally:
+            self._queue.put_nowait(None)
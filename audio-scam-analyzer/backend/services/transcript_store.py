@@ -0,0 +1,177 @@
+"""
+Transcript Store
+================
+Persistent cache of Whisper output, so tuning keyword lists or scoring
+weights only needs the text analyzers to be re-run - not Whisper.
+
+Each entry is keyed by (audio hash, Whisper model size) and holds the
+transcript text, detected language, segment timings, call duration and the
+voice-feature summary. See TextAnalysisPipeline.rescore().
+
+A requested language is not part of the key: it is only ever checked
+against the detected one (Whisper then runs with that same language), so
+it does not change the transcript. Callers re-check it on a hit.
+
+PRIVACY: Transcripts ARE call data. The store is opt-in
+(TRANSCRIPT_CACHE_DB) and never contains audio; only the one-way SHA-256
+of the upload identifies a recording.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from services.speech_to_text import Transcript
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transcripts (
+    audio_hash TEXT NOT NULL,
+    model_size TEXT NOT NULL,
+    text TEXT NOT NULL,
+    detected_language TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    segments TEXT NOT NULL,          -- JSON list of {start, end, text}
+    duration REAL NOT NULL,
+    voice_analysis TEXT,             -- JSON, filled in after voice analysis
+    created_at REAL NOT NULL,
+    PRIMARY KEY (audio_hash, model_size)
+);
+"""
+
+_LEGACY_COLUMNS = "audio_hash, model_size, text, detected_language, confidence, " \
+                  "segments, duration, voice_analysis, created_at"
+
+
+@dataclass
+class CachedTranscript:
+    """One stored Whisper result plus what re-scoring needs"""
+    audio_hash: str
+    model_size: str
+    transcript: Transcript
+    duration: float
+    voice_analysis: Optional[Dict]
+    created_at: float
+
+
+class TranscriptStore:
+    """
+    SQLite-backed transcript cache, safe to share between worker processes.
+
+    Args:
+        db_path: Database file (created if missing)
+    """
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), timeout=10.0, check_same_thread=False)
+        # WAL: several uvicorn workers and the CLI can read while one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._drop_language_key()
+        logger.info(f"📝 Transcript store ready: {self.db_path} ({len(self)} transcripts)")
+
+    def _drop_language_key(self):
+        """Stores created with a requested-language column: keep the newest entry per recording"""
+        with self._lock, self._conn:
+            # Write lock first, so only one of several starting workers migrates
+            self._conn.execute("BEGIN IMMEDIATE")
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(transcripts)")]
+            if "language" not in columns:
+                return
+            self._conn.execute("ALTER TABLE transcripts RENAME TO transcripts_by_language")
+            self._conn.execute(_SCHEMA)
+            self._conn.execute(
+                f"INSERT OR IGNORE INTO transcripts SELECT {_LEGACY_COLUMNS} "
+                "FROM transcripts_by_language ORDER BY created_at DESC"
+            )
+            self._conn.execute("DROP TABLE transcripts_by_language")
+        logger.info("📝 Transcript store migrated: entries no longer keyed by language")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM transcripts").fetchone()[0]
+
+    def __bool__(self) -> bool:
+        # Callers test `if transcript_store:` for "enabled"; without this an
+        # empty store would be falsy (via __len__) and never get filled
+        return True
+
+    def get(self, audio_hash: str, model_size: str) -> Optional[CachedTranscript]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM transcripts WHERE audio_hash = ? AND model_size = ?",
+                (audio_hash, model_size),
+            ).fetchone()
+        return self._from_row(row) if row else None
+
+    def put(
+        self,
+        audio_hash: str,
+        model_size: str,
+        transcript: Transcript,
+        duration: float,
+    ):
+        """Store (or replace) a transcript"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO transcripts VALUES (?, ?, ?, ?, ?, ?, ?, NULL, ?)",
+                (
+                    audio_hash,
+                    model_size,
+                    transcript.text,
+                    transcript.language,
+                    transcript.confidence,
+                    json.dumps(transcript.segments, ensure_ascii=False),
+                    duration,
+                    time.time(),
+                ),
+            )
+
+    def set_voice_analysis(self, audio_hash: str, model_size: str, voice_analysis: Dict):
+        """Attach voice features so re-scoring reproduces the combined score"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE transcripts SET voice_analysis = ? WHERE audio_hash = ? AND model_size = ?",
+                (json.dumps(voice_analysis, default=float), audio_hash, model_size),
+            )
+
+    def iter_transcripts(
+        self, audio_hashes: Optional[List[str]] = None, limit: Optional[int] = None
+    ) -> Iterator[CachedTranscript]:
+        """Stored transcripts, oldest first (optionally only some recordings)"""
+        query = "SELECT * FROM transcripts"
+        params: List = []
+        if audio_hashes:
+            query += f" WHERE audio_hash IN ({','.join('?' * len(audio_hashes))})"
+            params.extend(audio_hashes)
+        query += " ORDER BY created_at"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        for row in rows:
+            yield self._from_row(row)
+
+    @staticmethod
+    def _from_row(row) -> CachedTranscript:
+        (audio_hash, model_size, text, detected_language,
+         confidence, segments, duration, voice_analysis, created_at) = row
+        return CachedTranscript(
+            audio_hash=audio_hash,
+            model_size=model_size,
+            transcript=Transcript(text, detected_language, confidence, json.loads(segments)),
+            duration=duration,
+            voice_analysis=json.loads(voice_analysis) if voice_analysis else None,
+            created_at=created_at,
+        )
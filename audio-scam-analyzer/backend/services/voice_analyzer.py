@@ -13,12 +13,146 @@ Scammers tend to exhibit:
 
 import numpy as np
 import logging
-from typing import Dict, Tuple, List
+from io import BytesIO
+from functools import cached_property
+from typing import Dict, Tuple, List, Union
 import librosa
 
+from services.audio_processor import DecodedAudio
+
 logger = logging.getLogger(__name__)
 
 
+def frame_energy(y: np.ndarray, frame_length: int = 2048, hop_length: int = 512) -> np.ndarray:
+    """
+    Energy of every frame starting at each hop, without a Python loop.
+
+    Matches sum(y[i:i + frame_length] ** 2) for i in range(0, len(y), hop_length),
+    including the shorter frames at the tail, using one cumulative sum.
+    """
+    if len(y) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    cumulative = np.empty(len(y) + 1, dtype=np.float64)
+    cumulative[0] = 0.0
+    np.cumsum(np.square(y, dtype=np.float64), out=cumulative[1:])
+
+    starts = np.arange(0, len(y), hop_length)
+    ends = np.minimum(starts + frame_length, len(y))
+    # Clip tiny negative values left by floating point cancellation
+    return np.maximum(cumulative[ends] - cumulative[starts], 0.0)
+
+
+def speech_frame_mask(energy: np.ndarray, threshold_db: float = -40.0) -> np.ndarray:
+    """
+    Mark frames as speech when their energy is within threshold_db of the
+    loudest frame. Everything else is treated as silence/pause.
+    """
+    if energy.size == 0:
+        return np.zeros(0, dtype=bool)
+
+    peak = float(energy.max())
+    if peak <= 0:
+        return np.zeros(energy.shape, dtype=bool)
+
+    return energy > peak * (10.0 ** (threshold_db / 10.0))
+
+
+def speech_segments(
+    mask: np.ndarray,
+    sr: int,
+    hop_length: int = 512,
+    min_pause_seconds: float = 0.3,
+) -> List[Tuple[float, float]]:
+    """
+    Collapse a per-frame speech mask into (start, end) speech regions in
+    seconds. Pauses shorter than min_pause_seconds are bridged.
+    """
+    if mask.size == 0 or not mask.any():
+        return []
+
+    # Rising/falling edges of the mask give region boundaries
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    starts, ends = edges[0::2], edges[1::2]
+
+    frame_seconds = hop_length / sr
+    min_gap_frames = int(np.ceil(min_pause_seconds / frame_seconds))
+
+    segments = []
+    seg_start, seg_end = starts[0], ends[0]
+    for start, end in zip(starts[1:], ends[1:]):
+        if start - seg_end < min_gap_frames:
+            seg_end = end
+        else:
+            segments.append((float(seg_start * frame_seconds), float(seg_end * frame_seconds)))
+            seg_start, seg_end = start, end
+    segments.append((float(seg_start * frame_seconds), float(seg_end * frame_seconds)))
+
+    return segments
+
+
+class SpectralFeatures:
+    """
+    Per-call feature context for VoiceAnalyzer.
+
+    The magnitude STFT is computed once and every spectral feature
+    (mel, centroid, rolloff, flatness, MFCC) is derived from it on first
+    access, so no helper recomputes a spectrogram another one already built.
+    """
+
+    N_FFT = 2048
+    HOP_LENGTH = 512
+
+    def __init__(self, y: np.ndarray, sr: int):
+        self.y = y
+        self.sr = sr
+
+    @cached_property
+    def magnitude(self) -> np.ndarray:
+        """Magnitude STFT shared by all spectral features"""
+        return np.abs(librosa.stft(self.y, n_fft=self.N_FFT, hop_length=self.HOP_LENGTH))
+
+    @cached_property
+    def mel(self) -> np.ndarray:
+        """Mel power spectrogram"""
+        return librosa.feature.melspectrogram(
+            S=self.magnitude ** 2, sr=self.sr, n_fft=self.N_FFT, hop_length=self.HOP_LENGTH
+        )
+
+    @cached_property
+    def mel_db(self) -> np.ndarray:
+        """Mel spectrogram in dB relative to its peak"""
+        return librosa.power_to_db(self.mel, ref=np.max)
+
+    @cached_property
+    def centroid(self) -> np.ndarray:
+        return librosa.feature.spectral_centroid(S=self.magnitude, sr=self.sr)[0]
+
+    @cached_property
+    def rolloff(self) -> np.ndarray:
+        return librosa.feature.spectral_rolloff(S=self.magnitude, sr=self.sr)[0]
+
+    @cached_property
+    def flatness(self) -> np.ndarray:
+        return librosa.feature.spectral_flatness(S=self.magnitude)[0]
+
+    @cached_property
+    def mfcc(self) -> np.ndarray:
+        return librosa.feature.mfcc(S=librosa.power_to_db(self.mel), n_mfcc=13)
+
+    @cached_property
+    def energy(self) -> np.ndarray:
+        """Per-frame energy (same framing as the STFT hop)"""
+        return frame_energy(self.y, frame_length=self.N_FFT, hop_length=self.HOP_LENGTH)
+
+    @cached_property
+    def zero_crossing_rate(self) -> np.ndarray:
+        return librosa.feature.zero_crossing_rate(
+            self.y, frame_length=self.N_FFT, hop_length=self.HOP_LENGTH
+        )[0]
+
+
 class VoiceAnalyzer:
     """Analyzes voice characteristics from audio for scam indicators"""
 
@@ -26,47 +160,45 @@ class VoiceAnalyzer:
         """Initialize voice analyzer"""
         logger.info("VoiceAnalyzer initialized")
 
-    def analyze_audio_features(self, audio_data: bytes) -> Dict:
+    def analyze_audio_features(self, audio_data: Union[DecodedAudio, bytes]) -> Dict:
         """
         Analyze voice characteristics from audio data.
         
         Args:
-            audio_data: Audio file bytes
+            audio_data: DecodedAudio from AudioProcessor (read in place).
+                        Raw audio bytes are still accepted for older callers.
             
         Returns:
             Dict with voice analysis results
         """
         try:
-            from io import BytesIO
-            # Load audio from bytes buffer
-            audio_buffer = BytesIO(audio_data)
-            y, sr = librosa.load(audio_buffer, sr=None)
+            if isinstance(audio_data, DecodedAudio):
+                y, sr = audio_data.samples, audio_data.sample_rate
+            else:
+                y, sr = librosa.load(BytesIO(audio_data), sr=None)
             
             # Guard against zero-length or silence
             if len(y) < 100:
                 logger.warning("Audio too short for voice analysis")
                 return self._get_default_analysis()
 
-            # Extract features
-            mfcc = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=13)
-            spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
-            spectral_rolloff = librosa.feature.spectral_rolloff(y=y, sr=sr)[0]
-            zero_crossing_rate = librosa.feature.zero_crossing_rate(y)[0]
+            # One STFT per call; every helper reads from this context
+            features = SpectralFeatures(y, sr)
             
             # Calculate speaking rate (energy changes per second)
-            speaking_rate = self._calculate_speaking_rate(y, sr)
+            speaking_rate = self._calculate_speaking_rate(features)
             
             # Calculate pitch variation
-            pitch_variation = self._calculate_pitch_variation(y, sr)
+            pitch_variation = self._calculate_pitch_variation(features)
             
             # Detect silence/pauses
-            silence_ratio = self._calculate_silence_ratio(y, sr)
+            silence_ratio = self._calculate_silence_ratio(features)
             
             # Background noise detection
-            noise_level = self._detect_noise(y, sr)
+            noise_level = self._detect_noise(features)
             
             # Energy variation (stress indicator)
-            energy_variation = self._calculate_energy_variation(y)
+            energy_variation = self._calculate_energy_variation(features)
             
             # Confidence scoring based on voice features
             confidence_scores = self._calculate_voice_confidence(
@@ -79,9 +211,9 @@ class VoiceAnalyzer:
                 "silence_ratio": silence_ratio,
                 "noise_level": noise_level,
                 "energy_variation": energy_variation,
-                "spectral_centroid_mean": float(np.mean(spectral_centroid)),
-                "spectral_rolloff_mean": float(np.mean(spectral_rolloff)),
-                "zero_crossing_rate_mean": float(np.mean(zero_crossing_rate)),
+                "spectral_centroid_mean": float(np.mean(features.centroid)),
+                "spectral_rolloff_mean": float(np.mean(features.rolloff)),
+                "zero_crossing_rate_mean": float(np.mean(features.zero_crossing_rate)),
                 "voice_quality_score": confidence_scores["voice_quality"],
                 "authenticity_indicators": confidence_scores["authenticity"],
                 "risk_indicators": self._assess_risk_from_voice(
@@ -89,7 +221,8 @@ class VoiceAnalyzer:
                 ),
             }
             
-            logger.info(f"Voice analysis completed: {analysis}")
+            # Summary only; the full dict is returned to the caller
+            logger.debug(f"Voice analysis completed: speaking_rate={speaking_rate}, noise_level={noise_level}")
             return analysis
             
         except Exception as e:
@@ -115,17 +248,12 @@ class VoiceAnalyzer:
             "risk_indicators": ["Unable to analyze voice (audio issue)"]
         }
 
-    def _calculate_speaking_rate(self, y: np.ndarray, sr: int) -> float:
+    def _calculate_speaking_rate(self, features: SpectralFeatures) -> float:
         """
         Calculate words per minute equivalent from audio energy.
         Returns normalized speaking rate (0-1 scale where 1 = very fast)
         """
-        # Use RMS energy to detect speech segments
-        frame_length = 2048
-        hop_length = 512
-        
-        S = librosa.feature.melspectrogram(y=y, sr=sr, hop_length=hop_length)
-        S_db = librosa.power_to_db(S, ref=np.max)
+        S_db = features.mel_db
         
         # Count frames with significant energy (speech)
         speech_frames = np.sum(S_db > -40) / S_db.size
@@ -134,13 +262,12 @@ class VoiceAnalyzer:
         speaking_rate = min(speech_frames * 2, 1.0)
         return float(speaking_rate)
 
-    def _calculate_pitch_variation(self, y: np.ndarray, sr: int) -> float:
+    def _calculate_pitch_variation(self, features: SpectralFeatures) -> float:
         """
         Calculate pitch variation using spectral features.
         High variation = emotional intensity (scam indicator)
         """
-        # Extract spectral features
-        spectral_centroid = librosa.feature.spectral_centroid(y=y, sr=sr)[0]
+        spectral_centroid = features.centroid
         
         # Calculate coefficient of variation
         variation = np.std(spectral_centroid) / (np.mean(spectral_centroid) + 1e-6)
@@ -149,14 +276,13 @@ class VoiceAnalyzer:
         pitch_variation = min(variation / 2000, 1.0)
         return float(pitch_variation)
 
-    def _calculate_silence_ratio(self, y: np.ndarray, sr: int) -> float:
+    def _calculate_silence_ratio(self, features: SpectralFeatures) -> float:
         """
         Calculate percentage of silence/pauses in audio.
         High ratio = uncertainty (scam indicator)
         """
-        # Use energy threshold
-        S = librosa.feature.melspectrogram(y=y, sr=sr)
-        S_db = librosa.power_to_db(S, ref=np.max)
+        # Use energy threshold on the shared mel spectrogram
+        S_db = features.mel_db
         
         # Frames below threshold are silence
         silence_frames = np.sum(S_db < -40)
@@ -164,32 +290,25 @@ class VoiceAnalyzer:
         
         return float(min(silence_ratio, 1.0))
 
-    def _detect_noise(self, y: np.ndarray, sr: int) -> float:
+    def _detect_noise(self, features: SpectralFeatures) -> float:
         """
         Detect background noise (call center indicator).
         Returns noise level 0-1 where 1 = very noisy
         """
         # Use spectral flatness to detect noise
-        spectral_flatness = librosa.feature.spectral_flatness(y=y)[0]
+        spectral_flatness = features.flatness
         
         # Average flatness (higher = more noise-like)
         noise_level = np.mean(spectral_flatness)
         
         return float(min(noise_level * 2, 1.0))
 
-    def _calculate_energy_variation(self, y: np.ndarray) -> float:
+    def _calculate_energy_variation(self, features: SpectralFeatures) -> float:
         """
         Calculate energy variation (stress indicator).
         Returns 0-1 where 1 = highly stressed/emotional
         """
-        # Calculate frame energy
-        frame_length = 2048
-        hop_length = 512
-        
-        energy = np.array([
-            np.sum(y[i:i + frame_length] ** 2)
-            for i in range(0, len(y), hop_length)
-        ])
+        energy = features.energy
         
         if len(energy) == 0:
             return 0.0
@@ -196,6 +196,89 @@ SAFE_INDICATORS = [
     "at your convenience",
 ]
 
+# =================
+# REQUEST CONTEXT (OTP asked for vs merely mentioned)
+# =================
+
+REQUEST_INDICATORS = [
+    "tell",
+    "provide",
+    "share",
+    "give",
+    "send",
+    "confirm",
+    "verify",
+    "please",
+]
+
+# =================
+# EMOTIONAL TONE KEYWORDS (EmotionalToneAnalyzer)
+# =================
+
+# Matched as whole words
+EMOTION_KEYWORDS = {
+    "urgency": [
+        "immediately", "right now", "urgent", "emergency", "asap",
+        "quickly", "fast", "rush", "hurry", "now", "quickly",
+        "don't delay", "without delay", "instantly", "immediately"
+    ],
+    "fear": [
+        "danger", "risk", "threat", "problem", "issue", "worry",
+        "concerned", "afraid", "scared", "terrible", "horrible",
+        "disastrous", "blocked", "frozen", "account suspended",
+        "fraud alert", "unauthorized", "compromised", "hacked"
+    ],
+    "authority": [
+        "police", "fbi", "tax", "government", "official",
+        "representative", "authority", "director", "manager",
+        "agent", "officer", "department", "agency", "investigation"
+    ],
+    "flattery": [
+        "trust", "friend", "help", "support", "care", "protect",
+        "ensure", "secure", "safe", "verified", "legitimate",
+        "professional", "experienced", "reliable"
+    ],
+    "urgency_phrases": [
+        "act now", "limited time", "deadline", "time sensitive",
+        "expires", "expiring", "valid until", "before",
+        "hurry", "last chance", "final notice"
+    ]
+}
+
+# Psychological tactic cues (matched as substrings)
+TACTIC_KEYWORDS = {
+    "authority_appeal": ["said", "told me", "reported", "confirmed", "verified",
+                         "official", "department", "government"],
+    "fear_appeal": ["danger", "risk", "threat", "problem", "fraud", "blocked",
+                    "suspended", "frozen", "unauthorized", "hacked"],
+    "scarcity_appeal": ["limited", "only", "last", "expires", "deadline",
+                        "hurry", "immediately", "now", "don't wait"],
+    "social_proof": ["everyone", "many", "others", "others are", "like you",
+                     "similar situation", "most people"],
+    "false_urgency": ["immediately", "right now", "urgently", "asap",
+                      "don't delay", "act now", "time-sensitive"],
+    "reciprocity_appeal": ["help", "favor", "need", "assist", "support",
+                           "protect", "ensure", "secure"],
+}
+
+# =================
+# ENTITY EXTRACTION CUES (EntityExtractor)
+# =================
+
+ACCOUNT_TYPES = ["savings", "current", "checking", "credit", "debit", "loan"]
+
+# Literal words each extraction regex needs (one per group) before it can
+# possibly match. Lets the extractor skip regexes that cannot fire.
+ENTITY_TRIGGERS = {
+    "amount": [["rs", "₹", "$", "rupees", "dollars"]],
+    "share_otp": [["give", "share", "tell", "read", "provide"], ["otp"]],
+    "confirm_details": [["confirm", "verify", "say"], ["password", "pin", "cvv", "details"]],
+    "download_app": [["download", "install"], ["app", "application", "software"]],
+    "make_payment": [["transfer", "send", "pay"], ["money", "amount", "rupees"]],
+    "disable_security": [["disable", "turn off", "deactivate"], ["2fa", "security", "protection"]],
+    "click_link": [["click", "open", "visit"], ["link", "url", "website"]],
+}
+
 # =================
 # RESPONSE TEMPLATES (For explainability)
 # =================
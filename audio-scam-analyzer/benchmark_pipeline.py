@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+End-to-End Pipeline Benchmark
+Times every stage of /analyze-call on synthetic speech-like calls
+(generate_test_audio_v2.speech_like_call) of 10 s, 1 min and 10 min:
+
+    decode         AudioProcessor.process_audio
+    transcribe     SpeechToTextService.transcribe_detailed, language
+                   auto-detected as in /analyze-call without ?language
+                   (skipped without Whisper)
+    voice          VoiceAnalyzer.analyze_audio_features
+    lexicon        LexiconIndex (shared tokenization of the transcript)
+    patterns       PatternAnalyzer.analyze_text
+    emotions       EmotionalToneAnalyzer.analyze_tone
+    entities       EntityExtractor.extract_entities
+    known_scams    KnownScamDatabase.compare_call_with_campaigns
+    risk           RiskScorer.calculate_risk
+    timeline       RiskScorer.build_risk_timeline
+
+The synthetic audio has no words, so the text stages run on a scripted
+transcript sized to the call (about 2.5 words per second).
+
+Each call length runs in a fresh process, so its peak RSS is its own and
+not whatever an earlier, longer call left behind (ru_maxrss only grows).
+
+Reports p50/p95 per stage, calls/hour and peak RSS as JSON, and compares
+against a stored baseline (exit code 1 on a regression).
+
+Run from the audio-scam-analyzer directory:
+    python benchmark_pipeline.py --save-baseline benchmark_baseline.json
+    python benchmark_pipeline.py --baseline benchmark_baseline.json --output latest.json
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from generate_test_audio_v2 import speech_like_call  # noqa: E402
+from services.audio_processor import AudioProcessor  # noqa: E402
+from services.campaign_store import CampaignStore  # noqa: E402
+from services.emotional_analyzer import EmotionalToneAnalyzer  # noqa: E402
+from services.entity_extractor import EntityExtractor  # noqa: E402
+from services.lexicon import LexiconIndex  # noqa: E402
+from services.pattern_analyzer import PatternAnalyzer  # noqa: E402
+from services.risk_scorer import RiskScorer  # noqa: E402
+from services.scam_database import KnownScamDatabase  # noqa: E402
+from services.speech_to_text import SpeechToTextService  # noqa: E402
+from services.voice_analyzer import VoiceAnalyzer  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+DURATIONS = {"10s": 10, "1min": 60, "10min": 600}
+
+# Scripted call text: scam turns mixed with ordinary conversation
+SCRIPT = [
+    "Hello sir, this is calling from your bank security team.",
+    "We have detected suspicious activity on your account.",
+    "How are you doing today, is this a good time to talk?",
+    "Your account will be blocked immediately unless you verify it.",
+    "Please tell me the verification code and your debit card pin.",
+    "I understand, let me check the details for you.",
+    "You must act now or face legal action and a penalty.",
+    "Do not worry, this is the official fraud team and the transfer is safe.",
+]
+
+
+def scripted_transcript(duration_seconds, words_per_second=2.5):
+    """Transcript of roughly the length a real call of this duration has"""
+    target = int(duration_seconds * words_per_second)
+    words = []
+    i = 0
+    while len(words) < target:
+        words.extend(SCRIPT[i % len(SCRIPT)].split())
+        i += 1
+    return " ".join(words[:target])
+
+
+def scripted_segments(text, duration_seconds, words_per_segment=12):
+    """Evenly spaced Whisper-style segments for the timeline stage"""
+    words = text.split()
+    chunks = [words[i:i + words_per_segment] for i in range(0, len(words), words_per_segment)]
+    step = duration_seconds / max(len(chunks), 1)
+    return [
+        {"start": round(i * step, 2), "end": round((i + 1) * step, 2), "text": " ".join(chunk)}
+        for i, chunk in enumerate(chunks)
+    ]
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+            cwd=Path(__file__).parent, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+class PipelineBenchmark:
+    """The services of app.py, built once, with one timer per stage"""
+
+    def __init__(self, whisper_model=None):
+        self.audio_processor = AudioProcessor()
+        self.voice_analyzer = VoiceAnalyzer()
+        self.pattern_analyzer = PatternAnalyzer()
+        self.emotional_analyzer = EmotionalToneAnalyzer()
+        self.entity_extractor = EntityExtractor()
+        self.scam_database = KnownScamDatabase(CampaignStore(os.getenv("SCAM_DB_PATH")))
+        self.risk_scorer = RiskScorer()
+        self.speech = None
+        if whisper_model:
+            self.speech = SpeechToTextService(model_size=whisper_model)
+            # Model loading is not part of any request: load before timing
+            self.speech.pool.warm_up(background=False)
+            if not self.speech.pool.is_ready:
+                raise RuntimeError(f"Whisper failed to load: {self.speech.pool.status()['error']}")
+
+    def run_once(self, wav_bytes, transcript, segments, language="en"):
+        """
+        One call through every stage; returns {stage: seconds}
+
+        language is the scripted transcript's, for the text stages; Whisper
+        detects the language itself, as /analyze-call does by default
+        """
+        timings = {}
+
+        def timed(stage, func, *args):
+            t0 = time.perf_counter()
+            result = func(*args)
+            timings[stage] = time.perf_counter() - t0
+            return result
+
+        decoded, duration = timed("decode", self.audio_processor.process_audio, wav_bytes, "call.wav")
+        if self.speech:
+            timed("transcribe", self.speech.transcribe_detailed, decoded, None)
+        timed("voice", self.voice_analyzer.analyze_audio_features, decoded)
+
+        index = timed("lexicon", LexiconIndex, transcript)
+        patterns = timed("patterns", self.pattern_analyzer.analyze_text, transcript, language, index)
+        timed("emotions", self.emotional_analyzer.analyze_tone, transcript, index)
+        timed("entities", self.entity_extractor.extract_entities, transcript, index)
+        timed("known_scams", self.scam_database.compare_call_with_campaigns, transcript, index)
+        pattern_dicts = [p.to_dict() for p in patterns]
+        timed("risk", self.risk_scorer.calculate_risk, pattern_dicts, transcript, duration, index)
+        timed(
+            "timeline", self.risk_scorer.build_risk_timeline,
+            transcript, segments, language, duration, self.pattern_analyzer,
+        )
+        return timings
+
+
+def benchmark_call(name, whisper_model, repeats, warmup):
+    """
+    Benchmark one call length. Runs in its own fresh process (see main),
+    so peak_rss_mb covers the services, the model and this call only.
+    """
+    logging.basicConfig(level=logging.ERROR)
+    bench = PipelineBenchmark(whisper_model)
+    seconds = DURATIONS[name]
+    buffer = io.BytesIO()
+    sf.write(buffer, speech_like_call(seconds), 16000, format="WAV", subtype="PCM_16")
+    wav_bytes = buffer.getvalue()
+    transcript = scripted_transcript(seconds)
+    segments = scripted_segments(transcript, seconds)
+
+    for _ in range(warmup):
+        bench.run_once(wav_bytes, transcript, segments)
+    runs = [bench.run_once(wav_bytes, transcript, segments) for _ in range(repeats)]
+    return summarize(runs, seconds)
+
+
+def summarize(runs, duration_seconds):
+    """p50/p95/mean per stage plus end-to-end throughput"""
+    stages = {}
+    for stage in runs[0]:
+        values = np.array([run[stage] for run in runs]) * 1000
+        stages[stage] = {
+            "p50_ms": round(float(np.percentile(values, 50)), 3),
+            "p95_ms": round(float(np.percentile(values, 95)), 3),
+            "mean_ms": round(float(values.mean()), 3),
+        }
+    totals = np.array([sum(run.values()) for run in runs])
+    total_p50 = float(np.percentile(totals, 50))
+    return {
+        "duration_seconds": duration_seconds,
+        "runs": len(runs),
+        "stages": stages,
+        "total_p50_ms": round(total_p50 * 1000, 3),
+        "total_p95_ms": round(float(np.percentile(totals, 95)) * 1000, 3),
+        "calls_per_hour": round(3600 / total_p50, 1),
+        "realtime_factor": round(duration_seconds / total_p50, 1),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare(current, baseline, tolerance, min_delta_ms):
+    """
+    Stages whose p50 got slower than baseline by more than tolerance
+    (and by more than min_delta_ms, to ignore timer noise).
+    """
+    regressions = []
+    print(f"\n{'call':<6} {'stage':<12} {'baseline p50 ms':>16} {'now p50 ms':>11} {'change':>8}", file=sys.stderr)
+    for name, result in current["results"].items():
+        base_result = baseline.get("results", {}).get(name)
+        if not base_result:
+            continue
+        for stage, numbers in result["stages"].items():
+            base = base_result["stages"].get(stage)
+            if not base:
+                continue
+            before, now = base["p50_ms"], numbers["p50_ms"]
+            change = (now - before) / before if before else 0.0
+            regressed = change > tolerance and now - before > min_delta_ms
+            flag = "  ❌" if regressed else ""
+            print(f"{name:<6} {stage:<12} {before:>16.2f} {now:>11.2f} {change:>+8.0%}{flag}", file=sys.stderr)
+            if regressed:
+                regressions.append({"call": name, "stage": stage, "baseline_p50_ms": before,
+                                    "p50_ms": now, "change": round(change, 3)})
+        base_rss, rss = base_result.get("peak_rss_mb"), result.get("peak_rss_mb")
+        if base_rss and rss and rss > base_rss * (1 + tolerance):
+            print(f"{name:<6} {'peak RSS':<12} {base_rss:>14.1f}MB {rss:>9.1f}MB {rss / base_rss - 1:>+8.0%}  ❌", file=sys.stderr)
+            regressions.append({"call": name, "stage": "peak_rss_mb", "baseline": base_rss, "now": rss})
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark")
+    parser.add_argument("--calls", nargs="+", choices=DURATIONS, default=list(DURATIONS),
+                        help="Call lengths to benchmark (default: all)")
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per call length")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs per call length")
+    parser.add_argument("--whisper-model", default="base",
+                        help="Whisper model for the transcribe stage ('none' to skip)")
+    parser.add_argument("--output", help="Write the results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="Compare against this results JSON")
+    parser.add_argument("--save-baseline", help="Also write the results as a new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed p50 slowdown before a stage counts as regressed (default 0.2)")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="Ignore slowdowns smaller than this (timer noise)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    whisper_model = None if args.whisper_model == "none" else args.whisper_model
+    if whisper_model:
+        try:
+            import whisper  # noqa: F401
+        except ImportError:
+            print("⚠️ openai-whisper not installed: skipping the transcribe stage", file=sys.stderr)
+            whisper_model = None
+
+    print("\n🚀 Pipeline Benchmark", file=sys.stderr)
+    if whisper_model:
+        print("   transcribe: language auto-detected, as /analyze-call without ?language", file=sys.stderr)
+
+    results = {}
+    for name in args.calls:
+        # A fresh process per call length: ru_maxrss is a process-lifetime
+        # peak, so a shared process would report the largest call so far
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+            results[name] = pool.submit(
+                benchmark_call, name, whisper_model, args.repeats, args.warmup
+            ).result()
+        print(
+            f"  {name:<6} p50 {results[name]['total_p50_ms']:>9.1f} ms | "
+            f"{results[name]['calls_per_hour']:>9,.0f} calls/h | "
+            f"{results[name]['realtime_factor']:>6.1f}x realtime | "
+            f"peak RSS {results[name]['peak_rss_mb']} MB",
+            file=sys.stderr,
+        )
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "whisper_model": whisper_model,
+            "transcribe_language": "auto" if whisper_model else None,
+            "repeats": args.repeats,
+            "peak_rss": "per call length, each in a fresh process",
+        },
+        "results": results,
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("whisper_model") != whisper_model:
+            print("⚠️ Baseline was recorded with a different Whisper setup", file=sys.stderr)
+        regressions = compare(report, baseline, args.tolerance, args.min_delta_ms)
+        report["regressions"] = regressions
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) against {args.baseline}", file=sys.stderr)
+            exit_code = 1
+        else:
+            print(f"\n✅ No regressions against {args.baseline}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+        print(f"📄 Results written to {args.output}", file=sys.stderr)
+    else:
+        print(output)
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(output + "\n", encoding="utf-8")
+        print(f"📌 Baseline saved to {args.save_baseline}", file=sys.stderr)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
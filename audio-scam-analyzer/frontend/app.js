@@ -120,6 +120,7 @@ async function analyzeCall() {
     resultsSection.style.display = 'none';
     errorSection.style.display = 'none';
     loadingText.textContent = '📥 Uploading audio file...';
+    analysisResult = null;
 
     try {
         // Create FormData with correct field name 'audio'
@@ -142,10 +143,11 @@ async function analyzeCall() {
         }
         console.log(`[INFO] Uploading to: ${API_BASE_URL}/analyze-call`);
 
-        // Call API with proper error handling
+        // Call API with proper error handling. Results are streamed (one
+        // NDJSON event per finished stage) so they can be shown as they arrive
         let response;
         try {
-            response = await fetch(`${API_BASE_URL}/analyze-call`, {
+            response = await fetch(`${API_BASE_URL}/analyze-call?stream=ndjson`, {
                 method: 'POST',
                 headers: {
                     'X-API-KEY': API_KEY,  // Add API key for authentication
@@ -161,6 +163,11 @@ async function analyzeCall() {
 
         let responseData;
         const contentType = response.headers.get("content-type");
+        if (response.ok && contentType && contentType.indexOf("application/x-ndjson") !== -1) {
+            loadingText.textContent = '🗣️ Transcribing audio...';
+            await readAnalysisStream(response);
+            return;
+        }
         if (contentType && contentType.indexOf("application/json") !== -1) {
             try {
                 responseData = await response.json();
@@ -180,32 +187,9 @@ async function analyzeCall() {
             // Parse backend error message
             let errorMsg = responseData.error || responseData.detail || responseData.message || `API error: ${response.status}`;
 
-            // Ensure error message is a string
-            if (typeof errorMsg === 'object') {
-                errorMsg = JSON.stringify(errorMsg);
-            }
-
             console.error(`[ERROR] Backend error (${response.status}):`, errorMsg);
 
-            // Make error messages more user-friendly
-            if (errorMsg.includes('Empty audio file')) {
-                errorMsg = '❌ The audio file is empty. Please upload a valid audio file.';
-            } else if (errorMsg.includes('unsupported') || errorMsg.includes('Unsupported')) {
-                errorMsg = '❌ Audio format issue. Try uploading a different format.';
-            } else if (errorMsg.includes('no clear speech') || errorMsg.includes('no clear')) {
-                errorMsg = '❌ Could not hear clear speech in the audio. Please upload a call recording.';
-            } else if (errorMsg.includes('File is empty')) {
-                errorMsg = '❌ File is empty or corrupt. Please upload a valid audio file.';
-            } else if (errorMsg.includes('Invalid or missing API key')) {
-                errorMsg = '❌ Authentication error: Invalid API key.';
-            } else {
-                // Prepend error code if not already formatted
-                if (!errorMsg.startsWith('❌')) {
-                    errorMsg = `❌ Error: ${errorMsg}`;
-                }
-            }
-
-            throw new Error(errorMsg);
+            throw new Error(friendlyErrorMessage(errorMsg));
         }
 
         loadingText.textContent = '🔍 Analyzing for scam patterns...';
@@ -225,19 +209,144 @@ async function analyzeCall() {
     }
 }
 
+function friendlyErrorMessage(errorMsg) {
+    // Ensure error message is a string
+    if (typeof errorMsg === 'object') {
+        errorMsg = JSON.stringify(errorMsg);
+    }
+
+    // Make error messages more user-friendly
+    if (errorMsg.includes('Empty audio file')) {
+        errorMsg = '❌ The audio file is empty. Please upload a valid audio file.';
+    } else if (errorMsg.includes('unsupported') || errorMsg.includes('Unsupported')) {
+        errorMsg = '❌ Audio format issue. Try uploading a different format.';
+    } else if (errorMsg.includes('no clear speech') || errorMsg.includes('no clear')) {
+        errorMsg = '❌ Could not hear clear speech in the audio. Please upload a call recording.';
+    } else if (errorMsg.includes('File is empty')) {
+        errorMsg = '❌ File is empty or corrupt. Please upload a valid audio file.';
+    } else if (errorMsg.includes('Invalid or missing API key')) {
+        errorMsg = '❌ Authentication error: Invalid API key.';
+    } else {
+        // Prepend error code if not already formatted
+        if (!errorMsg.startsWith('❌')) {
+            errorMsg = `❌ Error: ${errorMsg}`;
+        }
+    }
+
+    return errorMsg;
+}
+
+// ============================================
+// STREAMED RESULTS
+// ============================================
+
+// Progress shown while the remaining stages run
+const STREAM_PROGRESS = {
+    transcript: '🔍 Analyzing for scam patterns...',
+    risk: '🔬 Running voice, emotion and entity analysis...',
+};
+
+async function readAnalysisStream(response) {
+    // One JSON event per line: {"event": ..., "data": {...}}
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const partial = {};
+    let buffer = '';
+    let finished = false;
+
+    while (!finished) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        const lines = buffer.split('\n');
+        buffer = lines.pop();  // Incomplete last line
+        for (const line of lines) {
+            if (!line.trim()) continue;  // Keep-alive
+            const { event, data } = JSON.parse(line);
+            console.log(`[DEBUG] Stream event: ${event}`);
+            finished = handleStreamEvent(event, data, partial);
+        }
+    }
+
+    if (!finished) {
+        throw new Error('❌ Connection lost before the analysis finished. Please try again.');
+    }
+}
+
+function handleStreamEvent(event, data, partial) {
+    if (event === 'error') {
+        throw new Error(friendlyErrorMessage(data.detail));
+    }
+    if (event === 'result') {
+        // Results are already in view if the 'risk' event showed them; a
+        // cached analysis arrives as a lone 'result' and still needs scrolling
+        const riskShown = analysisResult !== null;
+        analysisResult = data;
+        displayResults(!riskShown);
+        return true;
+    }
+
+    Object.assign(partial, data);
+    if (STREAM_PROGRESS[event]) {
+        loadingText.textContent = STREAM_PROGRESS[event];
+    }
+
+    switch (event) {
+        case 'transcript':
+            break;  // Shown together with the verdict
+        case 'risk':
+            // First useful result: show the verdict, fill in the rest as it arrives
+            analysisResult = partial;
+            ['knownScamsCard', 'voiceAnalysisCard', 'emotionalAnalysisCard', 'entityAnalysisCard']
+                .forEach(id => { document.getElementById(id).style.display = 'none'; });
+            document.getElementById('timelineChart').innerHTML = '<p>Building timeline...</p>';
+            errorSection.style.display = 'none';
+            resultsSection.style.display = 'block';
+            resultsSection.scrollIntoView({ behavior: 'smooth' });
+            displayRiskScore();
+            displayTranscription();
+            displayPatterns();
+            displayExplanation();
+            displayRecommendation();
+            document.getElementById('duration').textContent = `${partial.call_duration_seconds.toFixed(2)}s`;
+            document.getElementById('language').textContent = partial.language_detected || 'Unknown';
+            document.getElementById('confidence').textContent = `${(partial.confidence * 100).toFixed(1)}%`;
+            break;
+        case 'timeline':
+            displayTimeline();
+            break;
+        case 'voice_analysis':
+            displayVoiceAnalysis();
+            break;
+        case 'emotional_analysis':
+            displayEmotionalAnalysis();
+            break;
+        case 'entity_analysis':
+            displayEntityAnalysis();
+            break;
+        case 'known_scam_match':
+            displayKnownScamMatch();
+            break;
+    }
+    return false;
+}
+
 // ============================================
 // RESULTS DISPLAY
 // ============================================
 
-async function displayResults() {
+async function displayResults(scroll = true) {
     if (!analysisResult) return;
 
     // Hide error and show results
     errorSection.style.display = 'none';
     resultsSection.style.display = 'block';
 
-    // Scroll to results
-    resultsSection.scrollIntoView({ behavior: 'smooth' });
+    // Scroll to results (already in view when streamed)
+    if (scroll) {
+        resultsSection.scrollIntoView({ behavior: 'smooth' });
+    }
 
     // Display risk score
     displayRiskScore();
@@ -1,18 +1,129 @@
-import wave
+#!/usr/bin/env python3
+"""
+Test Audio Generator
+Writes test_call.wav (1 second of silence) by default, or synthetic
+speech-like calls for benchmarking:
+
+    python generate_test_audio_v2.py
+    python generate_test_audio_v2.py --speech 10 60 600 --out-dir bench_audio
+
+The speech-like signal is not words, but it has the structure the
+pipeline reacts to: voiced syllables (pitch-varying pulse train shaped by
+vowel formants) with consonant noise bursts, grouped into phrases
+separated by pauses, over a low noise floor. VAD, windowing, pitch and
+energy features therefore behave as they would on a real call.
+"""
+import argparse
 import struct
+import wave
+from pathlib import Path
+
+import numpy as np
+from scipy.signal import lfilter
+
+# (F1, F2) in Hz for a few vowels
+VOWEL_FORMANTS = [(730, 1090), (270, 2290), (530, 1840), (570, 840), (300, 870), (660, 1720)]
+
+
+def write_silence(path="test_call.wav", sample_rate=44100, duration=1.0):
+    """Create a 1-second silence WAV file"""
+    num_frames = int(duration * sample_rate)
+
+    with wave.open(str(path), 'w') as wav_file:
+        wav_file.setnchannels(1)  # Mono
+        wav_file.setsampwidth(2)  # 2 bytes per sample (16-bit)
+        wav_file.setframerate(sample_rate)
+
+        # Write silence (0)
+        data = struct.pack('<' + ('h' * num_frames), *([0] * num_frames))
+        wav_file.writeframes(data)
+
+
+def _resonator(signal, frequency, bandwidth, sample_rate):
+    """Two-pole resonance at frequency (one formant)"""
+    r = np.exp(-np.pi * bandwidth / sample_rate)
+    theta = 2 * np.pi * frequency / sample_rate
+    return lfilter([1 - r], [1, -2 * r * np.cos(theta), r * r], signal)
+
+
+def speech_like_call(duration_seconds, sample_rate=16000, seed=0):
+    """
+    Synthetic speech-like call audio.
+
+    Args:
+        duration_seconds: Length of the call
+        sample_rate: Output sample rate
+        seed: Same seed, same signal
+
+    Returns:
+        Mono float32 samples, peak 0.5
+    """
+    rng = np.random.default_rng(seed)
+    total = int(duration_seconds * sample_rate)
+    out = np.zeros(total, dtype=np.float32)
+    speaker_f0 = rng.uniform(100, 220)
+
+    pos = int(rng.uniform(0.2, 0.5) * sample_rate)
+    while pos < total:
+        # One phrase: a few syllables, then a pause
+        for _ in range(rng.integers(3, 13)):
+            length = int(rng.uniform(0.12, 0.3) * sample_rate)
+            if pos + length > total:
+                break
+            t = np.arange(length) / sample_rate
+
+            # Voiced part: pulse train with a gliding pitch, shaped by two formants
+            f0 = speaker_f0 * rng.uniform(0.85, 1.2) * (1 + 0.08 * np.sin(2 * np.pi * rng.uniform(2, 5) * t))
+            phase = np.cumsum(f0) / sample_rate
+            pulses = 2 * (phase % 1.0) - 1
+            f1, f2 = VOWEL_FORMANTS[rng.integers(len(VOWEL_FORMANTS))]
+            voiced = _resonator(pulses, f1, 90, sample_rate) + 0.5 * _resonator(pulses, f2, 120, sample_rate)
+            syllable = voiced * np.hanning(length)
+
+            # Consonant: short noise burst at the start of some syllables
+            if rng.random() < 0.5:
+                burst = int(0.04 * sample_rate)
+                syllable[:burst] += 0.3 * np.std(syllable) * rng.standard_normal(burst) * np.hanning(burst)
+
+            out[pos:pos + length] += syllable * rng.uniform(0.6, 1.0)
+            pos += length + int(rng.uniform(0.01, 0.06) * sample_rate)
+        pos += int(rng.uniform(0.25, 0.9) * sample_rate)
+
+    out /= max(float(np.abs(out).max()), 1e-9)
+    out += 0.003 * rng.standard_normal(total).astype(np.float32)  # ~ -50 dB noise floor
+    return (0.5 * out / max(float(np.abs(out).max()), 1e-9)).astype(np.float32)
+
+
+def write_wav(path, samples, sample_rate=16000):
+    """Write float samples as a 16-bit mono WAV file"""
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2')
+    with wave.open(str(path), 'w') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm.tobytes())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate test audio")
+    parser.add_argument("--speech", nargs="+", type=float, metavar="SECONDS",
+                        help="Write speech-like calls of these durations instead of silence")
+    parser.add_argument("--out-dir", default=".", help="Directory for speech-like calls")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not args.speech:
+        write_silence()
+        print("Created test_call.wav")
+        return
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for seconds in args.speech:
+        path = out_dir / f"speech_{seconds:g}s.wav"
+        write_wav(path, speech_like_call(seconds, seed=args.seed))
+        print(f"Created {path}")
+
 
-# Create a 1-second silence WAV file
-sample_rate = 44100
-duration = 1.0
-num_frames = int(duration * sample_rate)
-
-with wave.open('test_call.wav', 'w') as wav_file:
-    wav_file.setnchannels(1)  # Mono
-    wav_file.setsampwidth(2)  # 2 bytes per sample (16-bit)
-    wav_file.setframerate(sample_rate)
-    
-    # Write silence (0)
-    data = struct.pack('<' + ('h' * num_frames), *([0] * num_frames))
-    wav_file.writeframes(data)
-
-print("Created test_call.wav")
+if __name__ == "__main__":
+    main()
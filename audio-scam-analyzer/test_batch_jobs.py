@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+BatchJobStore claim / release / recover
+Files are claimed by exactly one runner, even across processes sharing the
+database; an interrupted batch only releases its own files; a file that
+keeps breaking its batch is retried alone and marked failed after
+max_attempts; recover() (startup only) re-queues every job.
+
+Run from the audio-scam-analyzer directory:
+    python -m pytest test_batch_jobs.py
+    python test_batch_jobs.py
+"""
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from services.batch_jobs import BatchJobStore  # noqa: E402
+
+
+def _store(tmp: str) -> BatchJobStore:
+    return BatchJobStore(Path(tmp) / "batch_jobs.db")
+
+
+def _queue(store: BatchJobStore, job_id: str, count: int):
+    store.create_job(job_id, [(f"c{i}.wav", f"/calls/c{i}.wav", None) for i in range(count)], None, "manifest")
+
+
+def _statuses(store: BatchJobStore, job_id: str):
+    return {row["index"]: (row["status"], row["error"]) for row in store.results(job_id, limit=500)[0]}
+
+
+def test_claims_are_exclusive_across_connections():
+    with tempfile.TemporaryDirectory() as tmp:
+        _queue(_store(tmp), "job", 200)
+        # One store per "process": each has its own connection and lock
+        stores = [_store(tmp) for _ in range(4)]
+        claimed = [[] for _ in stores]
+
+        def claim_all(store, out):
+            while True:
+                items = store.claim_items("job", 3)
+                if not items:
+                    return
+                out.extend(item.index for item in items)
+
+        threads = [threading.Thread(target=claim_all, args=pair) for pair in zip(stores, claimed)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        indexes = [index for out in claimed for index in out]
+        assert sorted(indexes) == list(range(200))
+
+
+def test_release_is_scoped_to_the_batch():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp)
+        _queue(store, "a", 4)
+        _queue(store, "b", 4)
+        batch = store.claim_items("a", 2)
+        other = store.claim_items("b", 2)
+        store.complete_item("a", batch[0].index, "hash", {}, 1.0)
+
+        assert store.release_items("a", [item.index for item in batch], "boom", max_attempts=3) == (1, 0)
+        assert [status for status, _ in _statuses(store, "a").values()] == ["done", "queued", "queued", "queued"]
+        # Job b's batch is still in flight
+        assert [_statuses(store, "b")[item.index][0] for item in other] == ["running", "running"]
+
+        # Startup: every job's in-flight files are queued again
+        assert store.recover() == 2
+        assert store.get_job("b").counts == {"queued": 4}
+
+
+def test_bad_file_is_retried_alone_then_failed():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp)
+        _queue(store, "job", 4)
+
+        first = store.claim_items("job", 4)
+        assert len(first) == 4
+        store.release_items("job", [item.index for item in first], "boom", max_attempts=2)
+
+        # Retried files come back one per batch
+        retry = store.claim_items("job", 4)
+        assert [item.index for item in retry] == [0]
+        store.release_items("job", [0], "boom", max_attempts=2)
+        status, error = _statuses(store, "job")[0]
+        assert status == "failed" and error == "Gave up after 2 attempts: boom"
+
+        assert [item.index for item in store.claim_items("job", 4)] == [1]
+
+
+def test_load_error_does_not_count_an_attempt():
+    with tempfile.TemporaryDirectory() as tmp:
+        store = _store(tmp)
+        _queue(store, "job", 4)
+
+        for _ in range(5):
+            batch = store.claim_items("job", 4)
+            assert len(batch) == 4
+            assert store.release_items("job", [item.index for item in batch], "not loaded") == (4, 0)
+        assert store.get_job("job").counts == {"queued": 4}
+
+
+if __name__ == "__main__":
+    test_claims_are_exclusive_across_connections()
+    test_release_is_scoped_to_the_batch()
+    test_bad_file_is_retried_alone_then_failed()
+    test_load_error_does_not_count_an_attempt()
+    print("✅ Batch files are claimed once, released per batch and given up after max_attempts")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+AnalysisExecutors admission
+The Whisper stage pool admits its replicas plus WHISPER_MAX_QUEUE jobs;
+the next request is rejected with PoolBusyError (HTTP 503) instead of
+parking its decoded audio in front of Whisper.
+
+Run from the audio-scam-analyzer directory:
+    python -m pytest test_executors.py
+    python test_executors.py
+"""
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from services.executors import AnalysisExecutors  # noqa: E402
+from services.model_pool import PoolBusyError  # noqa: E402
+
+
+def test_whisper_queue_is_bounded():
+    async def scenario():
+        executors = AnalysisExecutors(cpu_workers=0, whisper_workers=1, whisper_queue=2)
+        release = threading.Event()
+        try:
+            # 1 running + 2 queued fill the pool
+            admitted = [
+                asyncio.ensure_future(executors.whisper.run(release.wait, reject_when_full=True))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0.05)
+            status = executors.whisper.status()
+            assert status["running"] + status["waiting"] == status["max_pending"] == 3
+
+            try:
+                await executors.whisper.run(release.wait, reject_when_full=True)
+            except PoolBusyError:
+                pass
+            else:
+                raise AssertionError("a 4th Whisper job was admitted past the queue bound")
+            assert executors.whisper.status()["rejected"] == 1
+
+            release.set()
+            assert await asyncio.gather(*admitted) == [True, True, True]
+            # Room again once the queue drains
+            assert await executors.whisper.run(release.wait, reject_when_full=True)
+        finally:
+            release.set()
+            executors.shutdown()
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_whisper_queue_is_bounded()
+    print("✅ Whisper stage pool rejects jobs past replicas + WHISPER_MAX_QUEUE")
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Upload ingestion
+UploadSizeLimitMiddleware answers oversized uploads with a single 413,
+whether the Content-Length gives them away or the body only turns out too
+large while streaming; spool_upload() hashes the upload and spools large
+ones to a private file.
+
+Run from the audio-scam-analyzer directory:
+    python -m pytest test_ingestion.py
+    python test_ingestion.py
+"""
+import hashlib
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from fastapi import FastAPI, File, HTTPException, UploadFile  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from services.ingestion import UploadSizeLimitMiddleware, UploadTooLargeError, spool_upload  # noqa: E402
+
+MAX_BYTES = 1024 * 1024
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(UploadSizeLimitMiddleware, max_upload_bytes=MAX_BYTES)
+
+    @app.post("/analyze-call")
+    async def analyze_call(audio: UploadFile = File(...)):
+        try:
+            spooled = await spool_upload(audio, MAX_BYTES, memory_limit=64 * 1024)
+        except UploadTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        with spooled:
+            return {"size": spooled.size, "sha256": spooled.sha256, "on_disk": spooled.path is not None,
+                    "mode": oct(os.stat(spooled.path).st_mode & 0o777) if spooled.path else None}
+
+    @app.post("/other")
+    async def other(audio: UploadFile = File(...)):
+        return {"size": len(await audio.read())}
+
+    return TestClient(app)
+
+
+def _multipart(payload: bytes):
+    boundary = "testboundary"
+    head = (
+        f"--{boundary}\r\nContent-Disposition: form-data; name=\"audio\"; filename=\"call.wav\"\r\n"
+        "Content-Type: audio/wav\r\n\r\n"
+    ).encode()
+    return head + payload + f"\r\n--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
+
+
+def test_upload_within_limit_is_spooled_and_hashed():
+    payload = os.urandom(200 * 1024)
+    response = _client().post("/analyze-call", files={"audio": ("call.wav", payload, "audio/wav")})
+    assert response.status_code == 200
+    assert response.json() == {"size": len(payload), "sha256": hashlib.sha256(payload).hexdigest(),
+                               "on_disk": True, "mode": "0o600"}
+
+
+def test_content_length_over_limit_is_rejected_up_front():
+    payload = b"\0" * (MAX_BYTES + 128 * 1024)
+    response = _client().post("/analyze-call", files={"audio": ("call.wav", payload, "audio/wav")})
+    assert response.status_code == 413
+    assert response.json() == {"success": False, "error": "File too large. Maximum 1MB allowed."}
+
+
+def test_streamed_body_over_limit_is_rejected():
+    # No Content-Length: the middleware counts the body as it arrives
+    body, content_type = _multipart(b"\0" * (MAX_BYTES + 128 * 1024))
+    chunks = (body[i:i + 16 * 1024] for i in range(0, len(body), 16 * 1024))
+    response = _client().post("/analyze-call", content=chunks, headers={"Content-Type": content_type})
+    assert response.status_code == 413
+    assert response.json()["success"] is False
+
+
+def test_other_paths_are_not_limited():
+    payload = b"\0" * (MAX_BYTES + 128 * 1024)
+    response = _client().post("/other", files={"audio": ("call.wav", payload, "audio/wav")})
+    assert response.status_code == 200 and response.json() == {"size": len(payload)}
+
+
+if __name__ == "__main__":
+    test_upload_within_limit_is_spooled_and_hashed()
+    test_content_length_over_limit_is_rejected_up_front()
+    test_streamed_body_over_limit_is_rejected()
+    test_other_paths_are_not_limited()
+    print("✅ Oversized uploads get HTTP 413, others are hashed and spooled")
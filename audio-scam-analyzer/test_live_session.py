@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+LiveCallSession windowing
+Utterances are cut into windows at the pause that ends them (with a short
+edge of audio around the speech), unbroken speech is split at
+max_window_seconds without losing or repeating audio, clicks are dropped,
+other sample rates are resampled to 16kHz, and transcript times are moved
+to call time.
+
+Run from the audio-scam-analyzer directory:
+    python -m pytest test_live_session.py
+    python test_live_session.py
+"""
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from services.live_session import FRAME, SAMPLE_RATE, LiveCallSession  # noqa: E402
+from services.risk_scorer import RiskScorer  # noqa: E402
+from services.speech_to_text import Transcript  # noqa: E402
+
+FRAME_SECONDS = FRAME / SAMPLE_RATE
+
+
+def _tone(seconds: float, rate: int = SAMPLE_RATE) -> np.ndarray:
+    t = np.arange(int(seconds * rate)) / rate
+    return 0.5 * np.sin(2 * np.pi * 220 * t)
+
+
+def _silence(seconds: float, rate: int = SAMPLE_RATE) -> np.ndarray:
+    return np.zeros(int(seconds * rate))
+
+
+def _pcm(samples: np.ndarray) -> bytes:
+    return (samples * 32767).astype("<i2").tobytes()
+
+
+def _stream(session: LiveCallSession, data: bytes, chunk: int = 3201):
+    # Odd chunk sizes split samples across frames
+    windows = []
+    for start in range(0, len(data), chunk):
+        windows.extend(session.push_pcm(data[start:start + chunk]))
+    return windows
+
+
+def test_utterances_are_cut_at_pauses():
+    session = LiveCallSession(RiskScorer(), language="en")
+    audio = np.concatenate([_silence(0.5), _tone(1.0), _silence(0.6), _tone(1.5), _silence(0.8)])
+
+    # Both utterances end in a pause, so neither waits for the end of the call
+    windows = _stream(session, _pcm(audio))
+    assert len(windows) == 2 and session.flush() == []
+
+    for window, (speech_start, speech_end) in zip(windows, [(0.5, 1.5), (2.1, 3.6)]):
+        assert speech_start - 0.2 - FRAME_SECONDS <= window.offset <= speech_start - 0.2 + FRAME_SECONDS
+        assert window.offset + window.duration >= speech_end
+        assert window.duration <= speech_end - speech_start + 0.4 + 2 * FRAME_SECONDS
+    assert windows[0].offset + windows[0].duration <= windows[1].offset
+
+
+def test_unbroken_speech_is_split_at_max_window():
+    session = LiveCallSession(RiskScorer(), language="en", max_window_seconds=8.0)
+    windows = _stream(session, _pcm(_tone(20.0))) + session.flush()
+
+    assert len(windows) == 3
+    assert all(window.duration <= 8.0 + FRAME_SECONDS for window in windows)
+    # Consecutive windows, no audio lost or sent twice
+    for previous, window in zip(windows, windows[1:]):
+        assert abs(previous.offset + previous.duration - window.offset) < 1e-6
+    assert windows[0].offset == 0.0
+    assert abs(sum(window.duration for window in windows) - 20.0) < 1e-6
+
+
+def test_clicks_are_dropped():
+    session = LiveCallSession(RiskScorer(), language="en")
+    audio = np.concatenate([_silence(1.0), _tone(0.1), _silence(1.0)])
+    assert _stream(session, _pcm(audio)) + session.flush() == []
+    assert abs(session.received_seconds - 2.1) < 1e-6
+
+
+def test_other_sample_rates_are_resampled():
+    session = LiveCallSession(RiskScorer(), sample_rate=8000, language="en")
+    audio = np.concatenate([_silence(0.5, 8000), _tone(1.0, 8000), _silence(1.0, 8000)])
+    windows = _stream(session, _pcm(audio)) + session.flush()
+
+    assert len(windows) == 1
+    window = windows[0]
+    assert window.offset <= 0.5 and window.offset + window.duration >= 1.5
+    assert window.duration == len(window.samples) / SAMPLE_RATE
+    assert abs(session.received_seconds - 2.5) < 1e-6
+
+
+def test_transcript_times_move_to_call_time():
+    session = LiveCallSession(RiskScorer())
+    audio = np.concatenate([_silence(2.0), _tone(1.0), _silence(0.6)])
+    (window,) = _stream(session, _pcm(audio))
+
+    update = session.add_transcript(window, Transcript(
+        "this is the bank, share your otp", "en", 0.9,
+        [{"start": 0.1, "end": 0.9, "text": "this is the bank, share your otp"}],
+    ))
+    # The first window fixes the language of a call started without one
+    assert session.language == "en"
+    assert update["segments"] == [{
+        "start": round(window.offset + 0.1, 2),
+        "end": round(window.offset + 0.9, 2),
+        "text": "this is the bank, share your otp",
+    }]
+    assert update["risk_score"] > 0
+    assert session.summary()["transcribed_seconds"] == round(window.duration, 2)
+
+
+if __name__ == "__main__":
+    test_utterances_are_cut_at_pauses()
+    test_unbroken_speech_is_split_at_max_window()
+    test_clicks_are_dropped()
+    test_other_sample_rates_are_resampled()
+    test_transcript_times_move_to_call_time()
+    print("✅ Live sessions cut windows at pauses and max_window_seconds")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+WhisperModelPool queueing and load retries
+Requests past max_waiting get PoolBusyError instead of piling up; a failed
+load fails requests fast with ModelLoadError until its backoff (doubling,
+capped at max_retry_seconds) has passed, then the next request retries it.
+
+Run from the audio-scam-analyzer directory:
+    python -m pytest test_model_pool.py
+    python test_model_pool.py
+"""
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from services.model_pool import ModelLoadError, PoolBusyError, WhisperModelPool  # noqa: E402
+
+
+def _wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_full_queue_rejects_with_pool_busy():
+    pool = WhisperModelPool(replicas=1, max_waiting=1, loader=lambda size: object())
+    pool.warm_up(background=False)
+    release = threading.Event()
+    served = []
+
+    def hold():
+        with pool.acquire() as model:
+            served.append(model)
+            release.wait()
+
+    holder = threading.Thread(target=hold)
+    holder.start()
+    _wait_for(lambda: pool.status()["busy"] == 1)
+    waiter = threading.Thread(target=hold)
+    waiter.start()
+    _wait_for(lambda: pool.status()["queue_depth"] == 1)
+
+    try:
+        with pool.acquire():
+            pass
+    except PoolBusyError:
+        pass
+    else:
+        raise AssertionError("a request was queued past max_waiting")
+
+    release.set()
+    holder.join()
+    waiter.join()
+    # The waiting request got the replica once it was free
+    assert len(served) == 2 and served[0] is served[1]
+    assert pool.status()["queue_depth"] == 0 and pool.status()["busy"] == 0
+
+
+def test_failed_load_is_retried_after_backoff():
+    attempts = {"count": 0}
+
+    def flaky_loader(size):
+        attempts["count"] += 1
+        if attempts["count"] <= 2:
+            raise OSError("out of memory")
+        return object()
+
+    pool = WhisperModelPool(replicas=1, loader=flaky_loader, retry_seconds=0.2, max_retry_seconds=0.3)
+    pool.warm_up(background=False)
+    status = pool.status()
+    assert status["state"] == "failed" and status["error"] == "out of memory"
+    assert 0.1 < status["retry_in_seconds"] <= 0.2
+
+    # Within the backoff: fail fast, no new load attempt
+    try:
+        with pool.acquire():
+            pass
+    except ModelLoadError as e:
+        assert "retrying in" in str(e)
+    else:
+        raise AssertionError("acquired a replica from a failed pool")
+    assert attempts["count"] == 1
+
+    # Backoff passed: the next load attempt fails again and doubles the
+    # wait, up to max_retry_seconds
+    time.sleep(0.25)
+    pool.warm_up(background=False)
+    assert attempts["count"] == 2
+    assert 0.2 < pool.status()["retry_in_seconds"] <= 0.3
+
+    # ...after which a request retries the load itself
+    time.sleep(0.35)
+    with pool.acquire() as model:
+        assert model is not None
+    status = pool.status()
+    assert attempts["count"] == 3
+    assert status["state"] == "ready" and status["loaded"] == 1 and status["retry_in_seconds"] is None
+
+
+if __name__ == "__main__":
+    test_full_queue_rejects_with_pool_busy()
+    test_failed_load_is_retried_after_backoff()
+    print("✅ Whisper pool rejects past max_waiting and retries failed loads after a backoff")
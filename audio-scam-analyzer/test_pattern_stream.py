@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+PatternStream vs PatternAnalyzer.analyze_text
+Feeding a transcript segment by segment must fire the same patterns as
+analyzing the whole text at once, wherever the segment boundaries fall
+(multi-word keywords such as "act now" may be split across segments).
+
+Run from the audio-scam-analyzer directory:
+    python -m pytest test_pattern_stream.py
+    python test_pattern_stream.py
+"""
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from services.pattern_analyzer import PatternAnalyzer, PatternStream  # noqa: E402
+
+CALLS = [
+    "Hello sir, this is calling from your bank security team. We have detected "
+    "suspicious activity and your account will be blocked immediately. You must "
+    "act now and verify within 24 hours or face legal action and a penalty. "
+    "Please tell me the verification code and your debit card pin right now.",
+    "Sir you must act now or your account is suspended. This is the income tax "
+    "department, there is an arrest warrant in your name. Share your credit card "
+    "number and the otp to settle the case within 24 hours.",
+    "Hi, this is the courier company. Your parcel is on hold, please confirm your "
+    "address and pay the customs fee today. Do not worry, this is the official "
+    "process and completely safe.",
+    "Good morning, I am calling from the police cyber cell. Your aadhaar card is "
+    "linked to money laundering. Do not disconnect the call, transfer the amount to "
+    "the safe account immediately or you will be arrested.",
+]
+
+ROUNDS = 150
+
+
+def stream_patterns(analyzer, segments):
+    stream = PatternStream(analyzer)
+    for segment in segments:
+        stream.feed(segment)
+    return sorted(match.pattern_name for match in stream.patterns)
+
+
+def random_segments(words, rng):
+    cuts = sorted(rng.sample(range(1, len(words)), rng.randint(1, min(12, len(words) - 1))))
+    bounds = [0, *cuts, len(words)]
+    return [" ".join(words[a:b]) for a, b in zip(bounds, bounds[1:])]
+
+
+def test_split_keyword():
+    analyzer = PatternAnalyzer()
+    segments = ["Sir you must act", "now or your account is suspended"]
+    expected = sorted(m.pattern_name for m in analyzer.analyze_text(" ".join(segments)))
+    assert expected == ["Artificial Urgency"]
+    assert stream_patterns(analyzer, segments) == expected
+
+
+def test_random_segmentations_match_full_text():
+    analyzer = PatternAnalyzer()
+    rng = random.Random(15)
+    for call in CALLS:
+        words = call.split()
+        expected = sorted(m.pattern_name for m in analyzer.analyze_text(" ".join(words)))
+        for _ in range(ROUNDS):
+            segments = random_segments(words, rng)
+            assert stream_patterns(analyzer, segments) == expected, segments
+
+
+if __name__ == "__main__":
+    test_split_keyword()
+    test_random_segmentations_match_full_text()
+    print(f"✅ PatternStream matches analyze_text over {ROUNDS * len(CALLS)} random segmentations")
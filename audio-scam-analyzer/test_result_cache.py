@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+ResultCache eviction
+The memory tier drops its least recently used entry past max_entries and
+treats entries older than the TTL as misses; the disk tier serves a new
+process, expires files the same way and, once it overflows, is trimmed
+(oldest first) to DISK_LOW_WATER of disk_max_entries.
+
+Run from the audio-scam-analyzer directory:
+    python -m pytest test_result_cache.py
+    python test_result_cache.py
+"""
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+
+from services.result_cache import DISK_LOW_WATER, ResultCache  # noqa: E402
+
+
+def test_memory_tier_is_lru():
+    cache = ResultCache(max_entries=2)
+    cache.put("a", {"risk_score": 1})
+    cache.put("b", {"risk_score": 2})
+    assert cache.get("a") == {"risk_score": 1}  # "b" is now least recently used
+    cache.put("c", {"risk_score": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"risk_score": 1} and cache.get("c") == {"risk_score": 3}
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["memory_entries"] == 2
+    assert stats["hits"] == 3 and stats["misses"] == 1
+
+
+def test_expired_entries_are_misses():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(max_entries=8, ttl_seconds=0.2, disk_dir=Path(tmp))
+        cache.put("a", {"risk_score": 1})
+        assert cache.get("a") == {"risk_score": 1}
+        time.sleep(0.3)
+        assert cache.get("a") is None
+        # The expired file is removed, not just skipped
+        assert not (Path(tmp) / "a.json").exists()
+        assert cache.stats()["memory_entries"] == 0 and cache.stats()["disk_entries"] == 0
+
+
+def test_disk_tier_survives_a_restart():
+    with tempfile.TemporaryDirectory() as tmp:
+        ResultCache(max_entries=8, disk_dir=Path(tmp)).put("a", {"risk_score": 1})
+
+        cache = ResultCache(max_entries=8, disk_dir=Path(tmp))
+        assert cache.stats()["disk_entries"] == 1
+        assert cache.get("a") == {"risk_score": 1}
+        assert cache.get("a") == {"risk_score": 1}
+        stats = cache.stats()
+        assert stats["disk_hits"] == 1 and stats["memory_hits"] == 1
+
+
+def test_overflowing_disk_tier_is_trimmed_oldest_first():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(max_entries=0, disk_dir=Path(tmp), disk_max_entries=10)
+        now = time.time()
+        for index in range(10):
+            cache.put(f"k{index}", {"index": index})
+            # Distinct ages, oldest first
+            os.utime(Path(tmp) / f"k{index}.json", (now - 100 + index, now - 100 + index))
+        assert cache.stats()["disk_entries"] == 10
+
+        cache.put("k10", {"index": 10})
+
+        keep = int(10 * DISK_LOW_WATER)
+        remaining = sorted(path.stem for path in Path(tmp).glob("*.json"))
+        assert len(remaining) == keep == cache.stats()["disk_entries"]
+        assert "k10" in remaining and "k0" not in remaining and "k1" not in remaining
+        assert cache.get("k0") is None and cache.get("k10") == {"index": 10}
+
+
+if __name__ == "__main__":
+    test_memory_tier_is_lru()
+    test_expired_entries_are_misses()
+    test_disk_tier_survives_a_restart()
+    test_overflowing_disk_tier_is_trimmed_oldest_first()
+    print("✅ Result cache evicts by LRU and TTL and trims its disk tier")